@@ -0,0 +1,74 @@
+"""
+Backfill or repair the chunk aggregates stored on recordings.
+
+Fills in missing chunk sizes from the files on disk, then recomputes
+chunk_count, total_duration_seconds, total_bytes and last_chunk_at for
+every recording from its chunks, one batch of recordings per transaction.
+Safe to run repeatedly and while the API is serving uploads.
+
+Usage:
+    python -m app.commands.backfill_recording_aggregates --batch-size 500
+"""
+import argparse
+import logging
+import os
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.repositories import MySQLRecordingRepository
+
+logger = logging.getLogger(__name__)
+
+
+def _file_size(path: str) -> Optional[int]:
+    """Size of a chunk file, or None if it no longer exists."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def backfill_recording_aggregates(db: Session, batch_size: int = 500) -> int:
+    """
+    Recompute the chunk aggregates of every recording.
+
+    Args:
+        db: Database session
+        batch_size: Number of recordings updated per transaction
+
+    Returns:
+        Number of recordings updated
+    """
+    recording_repo = MySQLRecordingRepository(db)
+    updated = 0
+    after_id = None
+
+    while True:
+        recording_ids = recording_repo.list_recording_ids(after_id, batch_size)
+        if not recording_ids:
+            return updated
+
+        for chunk in recording_repo.get_chunks_missing_size(recording_ids):
+            chunk.size_bytes = _file_size(chunk.audio_blob_path)
+        recording_repo.recompute_aggregates(recording_ids)
+
+        updated += len(recording_ids)
+        after_id = recording_ids[-1]
+        logger.info("Updated chunk aggregates of %d recordings", updated)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        backfill_recording_aggregates(db, args.batch_size)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
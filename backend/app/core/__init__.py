@@ -1,13 +1,15 @@
 """Core application modules."""
 from .config import settings
-from .database import get_db, Base, engine
-from .security import create_access_token, decode_access_token
+from .database import get_db, Base, engine, DatabaseSession
+from .security import create_access_token, decode_access_token, revoke_access_token
 
 __all__ = [
     "settings",
     "get_db",
+    "DatabaseSession",
     "Base",
     "engine",
     "create_access_token",
     "decode_access_token",
+    "revoke_access_token",
 ]
@@ -0,0 +1,117 @@
+"""Key-value cache backends."""
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Protocol, Tuple
+from .config import settings
+
+
+class CacheBackend(Protocol):
+    """Interface for caches holding serialized values with a TTL."""
+
+    async def get(self, key: str) -> Optional[str]:
+        """Get a value, or None if it is missing or expired."""
+        ...
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        """Store a value for ttl_seconds."""
+        ...
+
+    async def delete(self, key: str) -> None:
+        """Remove a value."""
+        ...
+
+
+class LocalCacheBackend:
+    """
+    In-process LRU cache with per-entry expiry.
+
+    Used as the per-worker cache and as an in-memory stand-in for the
+    shared backend in tests.
+    """
+
+    def __init__(self, max_size: int, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[str]:
+        """Get a value, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        """Store a value for ttl_seconds, evicting the least recently used entry when full."""
+        self._entries[key] = (self.clock() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        """Remove a value."""
+        self._entries.pop(key, None)
+
+
+class RedisCacheBackend:
+    """
+    Cache shared by all workers, stored in Redis.
+
+    Requires the optional "redis" package (pip install redis).
+    """
+
+    def __init__(self, url: str, key_prefix: str = "scribe:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise ImportError("The redis cache backend requires: pip install redis") from e
+
+        self.client = redis.from_url(url, decode_responses=True)
+        self.key_prefix = key_prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        """Get a value, or None if it is missing or expired."""
+        return await self.client.get(self.key_prefix + key)
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        """Store a value for ttl_seconds."""
+        await self.client.set(self.key_prefix + key, value, px=max(int(ttl_seconds * 1000), 1))
+
+    async def delete(self, key: str) -> None:
+        """Remove a value."""
+        await self.client.delete(self.key_prefix + key)
+
+
+def create_cache_backend(backend: str, max_size: int) -> Optional[CacheBackend]:
+    """
+    Create a cache backend by name.
+
+    Args:
+        backend: "local", "redis" or "none"
+        max_size: Entry limit for the local backend
+
+    Returns:
+        The backend, or None when caching is disabled
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if backend == "none":
+        return None
+    if backend == "local":
+        return LocalCacheBackend(max_size)
+    if backend == "redis":
+        if not settings.CACHE_REDIS_URL:
+            raise ValueError("CACHE_REDIS_URL is required for the redis cache backend")
+        return RedisCacheBackend(settings.CACHE_REDIS_URL)
+    raise ValueError(f"Unknown cache backend: {backend}")
@@ -1,6 +1,6 @@
 """Application configuration settings."""
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -15,17 +15,103 @@ class Settings(BaseSettings):
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_MINUTES: int = 1440
+    JWT_CACHE_MAX_SIZE: int = 10000  # Verified token payloads kept per worker, 0 disables
+    TOKEN_REVOCATION_BACKEND: str = "local"  # Logged-out tokens: "local" (per worker), "redis" (shared) or "none"
+    TOKEN_REVOCATION_MAX_SIZE: int = 10000  # Revocations kept per worker by the local backend
 
     # Database
     MYSQL_URL: str
+    DATABASE_BACKEND: str = "sync"  # "sync" (Session on a thread pool) or "async" (AsyncSession)
+    ASYNC_MYSQL_URL: Optional[str] = None  # Defaults to MYSQL_URL with the aiomysql/aiosqlite driver
+    DB_SLOW_QUERY_MS: float = 100.0
+    DB_REPEATED_QUERY_THRESHOLD: int = 2  # Flag identical statements run this often in one request
+    DB_QUERY_LOG: bool = True  # Log a db_stats line per request
+
+    # Caches
+    USER_CACHE_BACKEND: str = "local"  # "local" (per worker), "redis" (shared) or "none"
+    USER_CACHE_TTL_SECONDS: float = 60.0
+    USER_CACHE_MAX_SIZE: int = 10000
+    CACHE_REDIS_URL: Optional[str] = None  # Requires the optional "redis" package (pip install redis)
+    # Transcripts of audio segments keyed by a hash of their content, stored in the database
+    # behind an in-memory LRU front, so identical audio is only paid for once
+    TRANSCRIPTION_CACHE_ENABLED: bool = True
+    TRANSCRIPTION_CACHE_BACKEND: str = "local"  # Front of the database store: "local", "redis" or "none"
+    TRANSCRIPTION_CACHE_TTL_SECONDS: float = 3600.0
+    TRANSCRIPTION_CACHE_MAX_SIZE: int = 1000
+    TRANSCRIPTION_CACHE_RETENTION_DAYS: int = 30  # Older entries are deleted by the worker pools
+    TRANSCRIPTION_CACHE_PRUNE_INTERVAL_SECONDS: float = 3600.0  # How often a worker pool deletes them
+
+    # Recording events pushed to clients over GET /recordings/events
+    EVENT_BROKER_BACKEND: str = "local"  # "local" (per worker) or "redis" (shared, uses CACHE_REDIS_URL)
+    EVENT_SUBSCRIBER_QUEUE_SIZE: int = 100  # Events buffered per slow client before the oldest are dropped
+    EVENT_STREAM_KEEPALIVE_SECONDS: float = 15.0
 
     # LLM Provider
     LLM_PROVIDER: str = "requestyai"
     LLM_API_KEY: str
     LLM_API_URL: str
+    LLM_PROVIDER_VERSION: str = "1"  # Change when the provider's model changes, to stop reusing cached transcripts
+    LLM_HTTP_TIMEOUT_SECONDS: float = 300.0
+    LLM_HTTP_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    LLM_HTTP_MAX_CONNECTIONS: int = 10
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    LLM_HTTP2: bool = False  # Requires the optional "h2" package (pip install httpx[http2])
+    # More RequestYai-compatible endpoints, registered as providers by name:
+    # {"backup": {"url": "https://...", "api_key": "..."}}
+    LLM_ENDPOINTS: Dict[str, Dict[str, str]] = {}
+
+    # Routing across providers by recent latency and error rate
+    LLM_ROUTING_PROVIDERS: str = ""  # Comma-separated provider names; empty uses LLM_PROVIDER alone
+    LLM_ROUTING_WINDOW: int = 100  # Recent calls per provider used for p50/p95 and error rate
+    LLM_ROUTING_MAX_ERROR_RATE: float = 0.5  # Providers failing more often are tried last
+    LLM_HEDGE_DELAY_SECONDS: float = 0.0  # Also send a call still running after this delay to the next provider; 0 disables
+
+    # LLM provider resilience: AIMD concurrency limit, retries and circuit breaker
+    LLM_CONCURRENCY_INITIAL: int = 4
+    LLM_CONCURRENCY_MIN: int = 1
+    LLM_CONCURRENCY_MAX: int = 10  # Keep at or below LLM_HTTP_MAX_CONNECTIONS
+    LLM_RETRY_MAX_ATTEMPTS: int = 4
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 0.5  # Doubled on each further retry, with full jitter
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 30.0  # Longer Retry-After requests fail the call instead
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive failures that open the circuit
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0  # Open time before a probe call is let through
 
     # Audio Storage
     AUDIO_STORAGE_PATH: str
+    AUDIO_STREAM_BUFFER_BYTES: int = 256 * 1024
+    MAX_CHUNK_BYTES: int = 20 * 1024 * 1024
+    MAX_CHUNK_BATCH_SIZE: int = 50  # Chunks per POST /recordings/{id}/chunks/batch
+    STREAM_CHUNK_BYTES: int = 256 * 1024  # Size of the chunks cut from WS /recordings/{id}/stream
+    STREAM_MAX_PENDING_CHUNKS: int = 4  # Chunks buffered before the stream stops reading the socket
+    AUDIO_ASSEMBLE_ON_FINISH: bool = False  # Also write recording.webm when transcribing
+    AUDIO_IO_THREADS: int = 8
+    AUDIO_FSYNC_MODE: str = "none"  # "none", "always" or "batch"
+    AUDIO_FSYNC_BATCH_INTERVAL_MS: int = 20
+
+    # Transcription jobs
+    TRANSCRIPTION_WORKER_MODE: str = "inprocess"  # "inprocess" or "external"
+    TRANSCRIPTION_WORKER_CONCURRENCY: int = 2
+    TRANSCRIPTION_JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    TRANSCRIPTION_JOB_MAX_ATTEMPTS: int = 3
+    TRANSCRIPTION_JOB_LEASE_SECONDS: int = 900
+    TRANSCRIPTION_JOB_MAX_WAIT_SECONDS: float = 600.0  # Older queued jobs skip the fair-share order, oldest first
+
+    # Segmented transcription: long recordings are cut along chunk boundaries into segments
+    # ending at whichever limit is reached first, and the segments transcribed concurrently
+    TRANSCRIPTION_SEGMENT_SECONDS: float = 300.0
+    TRANSCRIPTION_SEGMENT_BYTES: int = 4 * 1024 * 1024  # Also bounds chunks uploaded without a duration
+    TRANSCRIPTION_SEGMENT_CONCURRENCY: int = 4  # Segments of one recording in flight at once
+
+    # Fair sharing of provider calls between users, per process: weighted fair queueing per user,
+    # smallest segments first
+    TRANSCRIPTION_SCHEDULER_MAX_CONCURRENCY: int = 8  # Provider calls in flight at once
+    TRANSCRIPTION_SCHEDULER_PER_USER_CONCURRENCY: int = 4  # Provider calls in flight at once for one user
+    TRANSCRIPTION_SCHEDULER_USER_WEIGHTS: Dict[str, float] = {}  # User ID to share weight, default 1
+
+    # Incremental transcription (transcribe chunks while the recording is in progress)
+    INCREMENTAL_TRANSCRIPTION: bool = False
+    INCREMENTAL_TRANSCRIPTION_WINDOW: int = 1  # Number of chunks transcribed together
 
     # Application
     APP_NAME: str = "Audio Transcription Service"
@@ -41,6 +127,12 @@ class Settings(BaseSettings):
         """Parse CORS origins into a list."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
+    @property
+    def llm_routing_providers_list(self) -> List[str]:
+        """Parse the routed provider names into a list, defaulting to LLM_PROVIDER."""
+        names = [name.strip() for name in self.LLM_ROUTING_PROVIDERS.split(",") if name.strip()]
+        return names or [self.LLM_PROVIDER]
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,15 +1,35 @@
 """Database connection and session management."""
+from typing import Callable, Optional, TypeVar, Union
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 from .config import settings
+from .query_stats import install_query_hooks
+
+T = TypeVar("T")
+
+# Session type handed to repositories, depending on DATABASE_BACKEND
+DatabaseSession = Union[Session, AsyncSession]
+
+# Async drivers used when ASYNC_MYSQL_URL is not set
+ASYNC_DRIVERS = {"mysql": "aiomysql", "sqlite": "aiosqlite"}
+
+# SQLite connections are used from the thread pool, not only the creating thread
+_connect_args = {"check_same_thread": False} if settings.MYSQL_URL.startswith("sqlite") else {}
+
+# Record per-request query statistics on every engine, sync and async
+install_query_hooks()
 
 # Create database engine
 engine = create_engine(
     settings.MYSQL_URL,
     pool_pre_ping=True,
     pool_recycle=3600,
-    echo=settings.DEBUG
+    echo=settings.DEBUG,
+    connect_args=_connect_args
 )
 
 # Create session factory
@@ -18,16 +38,93 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create base class for models
 Base = declarative_base()
 
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_database_url() -> str:
+    """
+    Get the URL for the async engine.
+
+    Returns:
+        ASYNC_MYSQL_URL, or MYSQL_URL with its driver swapped for an async one
+    """
+    if settings.ASYNC_MYSQL_URL:
+        return settings.ASYNC_MYSQL_URL
+
+    url = make_url(settings.MYSQL_URL)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if not driver:
+        raise ValueError(f"No async driver known for database URL: {url.drivername}")
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """
+    Get the AsyncSession factory, creating the async engine on first use.
+
+    Objects are not expired on commit, as attribute refreshes cannot run
+    implicitly outside the session's greenlet.
+    """
+    global _async_session_factory
+    if _async_session_factory is None:
+        async_engine = create_async_engine(
+            get_async_database_url(),
+            pool_pre_ping=True,
+            pool_recycle=3600,
+            echo=settings.DEBUG
+        )
+        _async_session_factory = async_sessionmaker(
+            bind=async_engine,
+            autoflush=False,
+            expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+def get_session_factory() -> Callable[[], DatabaseSession]:
+    """Get the session factory for the configured DATABASE_BACKEND."""
+    if settings.DATABASE_BACKEND == "async":
+        return get_async_session_factory()
+    return SessionLocal
+
+
+async def run_sync(db: DatabaseSession, fn: Callable[[Session], T]) -> T:
+    """
+    Run synchronous ORM code without blocking the event loop.
+
+    With an AsyncSession the code runs through ``AsyncSession.run_sync`` and
+    its queries are awaited on the async driver; a synchronous Session is
+    handed to the thread pool instead.
+
+    Args:
+        db: Database session
+        fn: Callable taking a synchronous Session
+
+    Returns:
+        The callable's result
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn)
+    return await run_in_threadpool(fn, db)
+
+
+async def close_session(db: DatabaseSession) -> None:
+    """Close a session of either backend."""
+    if isinstance(db, AsyncSession):
+        await db.close()
+    else:
+        await run_in_threadpool(db.close)
+
 
-def get_db():
+async def get_db():
     """
     Dependency to get database session.
 
     Yields:
-        Database session
+        Database session for the configured DATABASE_BACKEND
     """
-    db = SessionLocal()
+    db = get_session_factory()()
     try:
         yield db
     finally:
-        db.close()
+        await close_session(db)
@@ -0,0 +1,128 @@
+"""Publish/subscribe event brokers."""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, AsyncIterator, Dict, Protocol, Set
+from .config import settings
+
+
+class EventBroker(Protocol):
+    """Interface for brokers fanning serialized events out to channel subscribers."""
+
+    async def publish(self, channel: str, message: str) -> None:
+        """Send a message to the current subscribers of a channel."""
+        ...
+
+    def subscribe(self, channel: str) -> AsyncContextManager[AsyncIterator[str]]:
+        """
+        Subscribe to a channel, as an async context manager.
+
+        Usage:
+            async with broker.subscribe("user:123") as messages:
+                async for message in messages:
+                    ...
+        """
+        ...
+
+
+class LocalEventBroker:
+    """
+    In-process broker, delivering events published by the same worker.
+
+    Each subscriber gets a bounded queue; a subscriber that falls more than
+    max_queue_size events behind loses its oldest events rather than
+    holding up publishers.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def subscriber_count(self, channel: str) -> int:
+        """Number of open subscriptions to a channel."""
+        return len(self._subscribers.get(channel, ()))
+
+    async def publish(self, channel: str, message: str) -> None:
+        """Send a message to the current subscribers of a channel."""
+        for queue in self._subscribers.get(channel, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[AsyncIterator[str]]:
+        """Subscribe to a channel until the context exits."""
+        queue: asyncio.Queue = asyncio.Queue(self.max_queue_size)
+        self._subscribers.setdefault(channel, set()).add(queue)
+
+        async def messages() -> AsyncIterator[str]:
+            while True:
+                yield await queue.get()
+
+        try:
+            yield messages()
+        finally:
+            subscribers = self._subscribers[channel]
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[channel]
+
+
+class RedisEventBroker:
+    """
+    Broker shared by all workers, using Redis pub/sub.
+
+    Requires the optional "redis" package (pip install redis).
+    """
+
+    def __init__(self, url: str, channel_prefix: str = "scribe:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise ImportError("The redis event broker requires: pip install redis") from e
+
+        self.client = redis.from_url(url, decode_responses=True)
+        self.channel_prefix = channel_prefix
+
+    async def publish(self, channel: str, message: str) -> None:
+        """Send a message to the current subscribers of a channel, in any worker."""
+        await self.client.publish(self.channel_prefix + channel, message)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[AsyncIterator[str]]:
+        """Subscribe to a channel until the context exits."""
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel_prefix + channel)
+
+        async def messages() -> AsyncIterator[str]:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield message["data"]
+
+        try:
+            yield messages()
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.close()
+
+
+def create_event_broker(backend: str, max_queue_size: int = 100) -> EventBroker:
+    """
+    Create an event broker by name.
+
+    Args:
+        backend: "local" or "redis"
+        max_queue_size: Per-subscriber backlog for the local broker
+
+    Returns:
+        The broker
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if backend == "local":
+        return LocalEventBroker(max_queue_size)
+    if backend == "redis":
+        if not settings.CACHE_REDIS_URL:
+            raise ValueError("CACHE_REDIS_URL is required for the redis event broker")
+        return RedisEventBroker(settings.CACHE_REDIS_URL)
+    raise ValueError(f"Unknown event broker: {backend}")
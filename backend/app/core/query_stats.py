@@ -0,0 +1,206 @@
+"""Per-request database query statistics."""
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Longest statement text written to logs and assertion messages
+MAX_STATEMENT_LENGTH = 200
+
+
+def _shorten(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > MAX_STATEMENT_LENGTH:
+        return statement[:MAX_STATEMENT_LENGTH] + "..."
+    return statement
+
+
+class QueryStats:
+    """
+    Database round trips made while handling one request.
+
+    Only statement text and timings are kept; bound parameters may carry
+    patient data and are never recorded.
+    """
+
+    def __init__(self, slow_query_ms: Optional[float] = None):
+        self.slow_query_ms = slow_query_ms if slow_query_ms is not None else settings.DB_SLOW_QUERY_MS
+        self.count = 0
+        self.total_time = 0.0
+        self.statements: Counter = Counter()
+        self.slow_queries: List[Tuple[str, float]] = []
+
+    @property
+    def total_time_ms(self) -> float:
+        """Total time spent executing statements, in milliseconds."""
+        return self.total_time * 1000
+
+    def record(self, statement: str, duration: float) -> None:
+        """Record one executed statement and how long it took, in seconds."""
+        self.count += 1
+        self.total_time += duration
+        self.statements[statement] += 1
+        if duration * 1000 >= self.slow_query_ms:
+            self.slow_queries.append((statement, duration * 1000))
+
+    def repeated_queries(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Get statements that ran at least ``threshold`` times.
+
+        Identical statement text with different parameters is the usual
+        shape of an N+1 query or of a row being loaded twice.
+
+        Args:
+            threshold: Minimum number of executions, defaults to DB_REPEATED_QUERY_THRESHOLD
+
+        Returns:
+            (statement, count) pairs, most repeated first
+        """
+        threshold = threshold or settings.DB_REPEATED_QUERY_THRESHOLD
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+    def headers(self) -> List[Tuple[bytes, bytes]]:
+        """Response headers describing the statistics."""
+        return [
+            (b"x-db-query-count", str(self.count).encode()),
+            (b"x-db-time-ms", f"{self.total_time_ms:.1f}".encode()),
+            (b"x-db-slow-queries", str(len(self.slow_queries)).encode()),
+            (b"x-db-repeated-queries", str(len(self.repeated_queries())).encode()),
+        ]
+
+    def report(self) -> str:
+        """Human-readable list of the executed statements."""
+        lines = [f"{self.count} queries in {self.total_time_ms:.1f} ms"]
+        lines.extend(f"  {count}x {_shorten(statement)}" for statement, count in self.statements.most_common())
+        return "\n".join(lines)
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def get_query_stats() -> Optional[QueryStats]:
+    """Get the statistics being collected for the current request, if any."""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Collect statistics for the statements run in the current context.
+
+    The context is inherited by the thread pool and by AsyncSession
+    greenlets, so queries from either database backend are counted.
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def capture_engine_queries(engine: Engine) -> Iterator[QueryStats]:
+    """
+    Collect statistics for every statement run on an engine, from any context.
+
+    Args:
+        engine: Engine to listen on
+
+    Yields:
+        Statistics filled in while the block runs
+    """
+    stats = QueryStats()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats.record(statement, _elapsed(context))
+
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    try:
+        yield stats
+    finally:
+        event.remove(engine, "after_cursor_execute", after_cursor_execute)
+
+
+def _elapsed(context) -> float:
+    started = getattr(context, "_query_started_at", None)
+    return time.perf_counter() - started if started is not None else 0.0
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, _elapsed(context))
+
+
+def install_query_hooks() -> None:
+    """Time every statement on every engine and record it for the current request."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that collects query statistics for each HTTP request.
+
+    Every request gets a structured ``db_stats`` log line, plus warnings for
+    slow and repeated statements. In debug mode the statistics are also
+    returned as ``X-DB-*`` response headers.
+    """
+
+    def __init__(self, app, expose_headers: Optional[bool] = None):
+        self.app = app
+        self.expose_headers = settings.DEBUG if expose_headers is None else expose_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        with track_queries() as stats:
+            async def send_with_stats(message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    if self.expose_headers:
+                        message = {**message, "headers": [*message.get("headers", []), *stats.headers()]}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                self._log(scope, status_code, stats, time.perf_counter() - started)
+
+    @staticmethod
+    def _log(scope, status_code: int, stats: QueryStats, duration: float) -> None:
+        method = scope.get("method")
+        path = scope.get("path")
+        repeated = stats.repeated_queries()
+
+        if settings.DB_QUERY_LOG:
+            logger.info(
+                "db_stats method=%s path=%s status=%s queries=%d db_time_ms=%.1f "
+                "slow_queries=%d repeated_queries=%d duration_ms=%.1f",
+                method, path, status_code, stats.count, stats.total_time_ms,
+                len(stats.slow_queries), len(repeated), duration * 1000
+            )
+        for statement, elapsed_ms in stats.slow_queries:
+            logger.warning("Slow query on %s %s (%.1f ms): %s", method, path, elapsed_ms, _shorten(statement))
+        for statement, count in repeated:
+            logger.warning("Repeated query on %s %s (%dx): %s", method, path, count, _shorten(statement))
@@ -1,10 +1,111 @@
 """Security utilities for JWT token handling."""
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, Tuple
 from jose import jwt, JWTError
+from .cache import CacheBackend, create_cache_backend
 from .config import settings
 
 
+class TokenCache:
+    """
+    Bounded cache of verified JWT payloads.
+
+    Entries are keyed by a SHA-256 digest of the token, so raw tokens are
+    never held, and expire at the token's ``exp`` claim. The cache is per
+    process; revocations are kept in ``TokenRevocations``.
+    """
+
+    def __init__(self, max_size: int, clock: Callable[[], float] = time.time):
+        self.max_size = max_size
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._payloads: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Get the cached payload of a verified, unexpired token."""
+        key = self._digest(token)
+        entry = self._payloads.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, payload = entry
+        if expires_at <= self.clock():
+            del self._payloads[key]
+            self.misses += 1
+            return None
+
+        self._payloads.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def put(self, token: str, payload: dict) -> None:
+        """Cache the payload of a token that passed verification."""
+        expires_at = payload.get("exp")
+        if self.max_size <= 0 or not isinstance(expires_at, (int, float)):
+            return
+
+        self._payloads[self._digest(token)] = (float(expires_at), payload)
+        while len(self._payloads) > self.max_size:
+            self._payloads.popitem(last=False)
+
+    def evict(self, token: str) -> None:
+        """Drop a token's cached payload."""
+        self._payloads.pop(self._digest(token), None)
+
+
+class TokenRevocations:
+    """
+    Revoked tokens, rejected until they expire.
+
+    Revocations are stored in a cache backend keyed by a SHA-256 digest of
+    the token, with the time left until the token's verified ``exp`` as TTL.
+    With the redis backend every worker sees them; the local backend is a
+    per-worker LRU bounded by TOKEN_REVOCATION_MAX_SIZE.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], clock: Callable[[], float] = time.time):
+        self.backend = backend
+        self.clock = clock
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return f"revoked_token:{hashlib.sha256(token.encode()).hexdigest()}"
+
+    async def revoke(self, token: str, expires_at: float) -> None:
+        """
+        Reject a verified token until it expires.
+
+        Args:
+            token: JWT token string that passed verification
+            expires_at: The token's verified ``exp`` claim
+        """
+        ttl_seconds = expires_at - self.clock()
+        if self.backend is not None and ttl_seconds > 0:
+            await self.backend.set(self._key(token), "1", ttl_seconds)
+
+    async def is_revoked(self, token: str) -> bool:
+        """Check whether a token was revoked."""
+        return self.backend is not None and await self.backend.get(self._key(token)) is not None
+
+
+# Process-wide cache used by decode_access_token
+token_cache = TokenCache(settings.JWT_CACHE_MAX_SIZE)
+
+# Revocations checked by decode_access_token
+token_revocations = TokenRevocations(
+    create_cache_backend(settings.TOKEN_REVOCATION_BACKEND, settings.TOKEN_REVOCATION_MAX_SIZE)
+)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
@@ -27,18 +128,55 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> Optional[dict]:
+async def decode_access_token(token: str) -> Optional[dict]:
     """
     Decode and verify a JWT access token.
 
+    Payloads of tokens that were already verified are served from
+    ``token_cache`` until the token expires.
+
     Args:
         token: JWT token string to decode
 
     Returns:
-        Decoded token payload or None if invalid
+        Decoded token payload or None if invalid or revoked
     """
+    if await token_revocations.is_revoked(token):
+        return None
+
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
-        return payload
     except JWTError:
         return None
+
+    token_cache.put(token, payload)
+    return payload
+
+
+async def revoke_access_token(token: str) -> bool:
+    """
+    Revoke a JWT access token, e.g. on logout.
+
+    Only tokens that pass verification are revoked, and only until their
+    verified ``exp``, so forged tokens cannot fill the revocation store.
+
+    Args:
+        token: JWT token string to revoke
+
+    Returns:
+        True if the token was valid and is now revoked
+    """
+    payload = await decode_access_token(token)
+    if payload is None:
+        return False
+
+    expires_at = payload.get("exp")
+    if not isinstance(expires_at, (int, float)):
+        expires_at = time.time() + settings.JWT_EXPIRATION_MINUTES * 60
+    token_cache.evict(token)
+    await token_revocations.revoke(token, float(expires_at))
+    return True
@@ -1,8 +1,39 @@
 """LLM provider implementations."""
-from .interface import LLMProvider
+from .interface import LLMProvider, AudioStream
+from .segments import SegmentTranscriptionError, transcribe_segments
 from .requestyai_provider import RequestYaiProvider
+from .resilience import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    ProviderMetrics,
+    ProviderUnavailableError,
+    ResilientProvider,
+)
+from .routing import LatencyWindow, RoutingProvider
+from .registry import (
+    ProviderRegistry,
+    provider_registry,
+    get_llm_provider,
+    create_http_client,
+    register_endpoints,
+)
 
 __all__ = [
     "LLMProvider",
+    "AudioStream",
+    "SegmentTranscriptionError",
+    "transcribe_segments",
     "RequestYaiProvider",
+    "AdaptiveConcurrencyLimiter",
+    "CircuitBreaker",
+    "ProviderMetrics",
+    "ProviderUnavailableError",
+    "ResilientProvider",
+    "LatencyWindow",
+    "RoutingProvider",
+    "ProviderRegistry",
+    "provider_registry",
+    "get_llm_provider",
+    "create_http_client",
+    "register_endpoints",
 ]
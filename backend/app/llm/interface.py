@@ -1,5 +1,19 @@
 """LLM provider interface definition."""
-from typing import Protocol
+from typing import AsyncIterator, Protocol
+
+
+class AudioStream(Protocol):
+    """Re-iterable async source of audio bytes with a known total size."""
+
+    filename: str
+
+    async def get_size(self) -> int:
+        """Total size of the audio in bytes."""
+        ...
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        """Iterate over the audio bytes from the start."""
+        ...
 
 
 class LLMProvider(Protocol):
@@ -19,3 +33,18 @@ class LLMProvider(Protocol):
             Exception: If transcription fails
         """
         ...
+
+    def transcribe_stream(self, audio: AudioStream) -> str:
+        """
+        Transcribe streamed audio to text without materialising it as one file.
+
+        Args:
+            audio: Audio stream to upload
+
+        Returns:
+            Transcription text
+
+        Raises:
+            Exception: If transcription fails
+        """
+        ...
@@ -0,0 +1,219 @@
+"""Process-wide LLM provider registry backed by a shared HTTP connection pool."""
+import asyncio
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+import httpx
+from app.core.config import settings
+from app.llm.interface import LLMProvider
+from app.llm.requestyai_provider import RequestYaiProvider
+from app.llm.resilience import ResilientProvider
+from app.llm.routing import RoutingProvider
+
+ProviderFactory = Callable[[httpx.AsyncClient], LLMProvider]
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body stream that frees a request slot once it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for part in self._stream:
+            yield part
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+class _QueuedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that admits at most ``max_concurrency`` requests to the pool.
+
+    Excess requests wait in FIFO order on a semaphore instead of inside
+    httpcore's pool, whose scheduling cost grows with waiting requests times
+    open connections and whose hand-off order is not fair under load.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_concurrency: int):
+        self._transport = transport
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self._slots.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        if response.is_closed:
+            # Already fully read (e.g. by a mock transport), nothing holds the connection
+            self._slots.release()
+        else:
+            response.stream = _ReleasingStream(response.stream, self._slots.release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create the long-lived HTTP client shared by all LLM providers.
+
+    Returns:
+        AsyncClient configured from the LLM_HTTP_* settings
+    """
+    limits = httpx.Limits(
+        max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    timeout = httpx.Timeout(
+        settings.LLM_HTTP_TIMEOUT_SECONDS,
+        connect=settings.LLM_HTTP_CONNECT_TIMEOUT_SECONDS,
+    )
+    transport = _QueuedTransport(
+        httpx.AsyncHTTPTransport(limits=limits, http2=settings.LLM_HTTP2),
+        max_concurrency=settings.LLM_HTTP_MAX_CONNECTIONS,
+    )
+    return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+
+class ProviderRegistry:
+    """
+    Registry of LLM provider factories and their long-lived instances.
+
+    Providers are built once per process on top of a single pooled
+    ``httpx.AsyncClient``, so transcriptions reuse open TCP/TLS connections
+    instead of paying for a handshake on every call. Each provider is
+    wrapped in a ResilientProvider, so its concurrency limit and circuit
+    breaker also apply across the whole process. The FastAPI lifespan (or
+    the standalone worker) calls ``startup`` and ``shutdown``.
+
+    When LLM_ROUTING_PROVIDERS names several providers, the default provider
+    is a RoutingProvider over them.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, ProviderFactory] = {}
+        self._providers: Dict[str, ResilientProvider] = {}
+        self._router: Optional[RoutingProvider] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    def register(self, name: str, factory: ProviderFactory) -> None:
+        """Register a provider factory under a name used by LLM_PROVIDER."""
+        self._factories[name] = factory
+        self._providers.pop(name, None)
+        self._router = None
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """The shared HTTP client, created on first use if startup was not called."""
+        if self._http_client is None:
+            self._http_client = create_http_client()
+        return self._http_client
+
+    async def startup(self) -> None:
+        """Open the shared HTTP connection pool."""
+        if self._http_client is None:
+            self._http_client = create_http_client()
+
+    async def shutdown(self) -> None:
+        """Close the shared HTTP connection pool and drop cached providers."""
+        self._providers.clear()
+        self._router = None
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    def get_provider(self, name: Optional[str] = None) -> LLMProvider:
+        """
+        Get the process-wide instance of a provider.
+
+        Args:
+            name: Provider name, defaults to the LLM_ROUTING_PROVIDERS router
+                or settings.LLM_PROVIDER
+
+        Returns:
+            Resilient provider instance sharing the registry's HTTP client,
+            or the router when no name is given and several providers are routed
+
+        Raises:
+            ValueError: If no provider is registered under the name
+        """
+        if name is None and len(settings.llm_routing_providers_list) > 1:
+            return self.get_router()
+
+        name = name or settings.LLM_PROVIDER
+        if name not in self._providers:
+            factory = self._factories.get(name)
+            if factory is None:
+                raise ValueError(f"Unknown LLM provider: {name}")
+            self._providers[name] = ResilientProvider.from_settings(factory(self.http_client))
+        return self._providers[name]
+
+    def get_router(self) -> RoutingProvider:
+        """
+        Get the process-wide router over the LLM_ROUTING_PROVIDERS providers.
+
+        Raises:
+            ValueError: If a routed provider is not registered
+        """
+        if self._router is None:
+            hedge_delay = settings.LLM_HEDGE_DELAY_SECONDS
+            self._router = RoutingProvider(
+                {name: self.get_provider(name) for name in settings.llm_routing_providers_list},
+                window_size=settings.LLM_ROUTING_WINDOW,
+                max_error_rate=settings.LLM_ROUTING_MAX_ERROR_RATE,
+                hedge_delay_seconds=hedge_delay if hedge_delay > 0 else None
+            )
+        return self._router
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Call metrics of the providers used so far in this process, by name."""
+        return {name: provider.snapshot() for name, provider in self._providers.items()}
+
+    def routing_metrics(self) -> Optional[Dict[str, Any]]:
+        """Latency statistics and ranking of the router, or None if calls are not routed."""
+        return self._router.snapshot() if self._router is not None else None
+
+
+provider_registry = ProviderRegistry()
+provider_registry.register("requestyai", RequestYaiProvider)
+
+
+def register_endpoints(registry: ProviderRegistry, endpoints: Dict[str, Dict[str, str]]) -> None:
+    """
+    Register RequestYai-compatible endpoints as providers, e.g. from LLM_ENDPOINTS.
+
+    Each endpoint needs its own api_key: LLM_API_KEY belongs to the primary
+    provider and is never sent to another endpoint's url.
+
+    Raises:
+        ValueError: If an endpoint has no url or no api_key
+    """
+    for name, endpoint in endpoints.items():
+        if "url" not in endpoint:
+            raise ValueError(f"LLM endpoint {name!r} has no url")
+        if not endpoint.get("api_key"):
+            raise ValueError(f"LLM endpoint {name!r} has no api_key")
+        registry.register(
+            name, partial(RequestYaiProvider, api_url=endpoint["url"], api_key=endpoint["api_key"])
+        )
+
+
+register_endpoints(provider_registry, settings.LLM_ENDPOINTS)
+
+
+def get_llm_provider(name: Optional[str] = None) -> LLMProvider:
+    """Get the configured LLM provider from the process-wide registry."""
+    return provider_registry.get_provider(name)
@@ -1,14 +1,25 @@
 """RequestYai LLM provider implementation."""
+import uuid
+from typing import AsyncIterator, Optional
 import httpx
 from app.core.config import settings
+from app.llm.interface import AudioStream
 
 
 class RequestYaiProvider:
     """RequestYai implementation of the LLMProvider interface."""
 
-    def __init__(self):
-        self.api_url = settings.LLM_API_URL
-        self.api_key = settings.LLM_API_KEY
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        api_url: Optional[str] = None,
+        api_key: Optional[str] = None
+    ):
+        # Defaults to LLM_API_URL/LLM_API_KEY; other endpoints come from LLM_ENDPOINTS
+        self.api_url = api_url or settings.LLM_API_URL
+        self.api_key = api_key or settings.LLM_API_KEY
+        # Normally the shared, pooled client from the provider registry
+        self.http_client = http_client or httpx.AsyncClient(timeout=settings.LLM_HTTP_TIMEOUT_SECONDS)
 
     async def transcribe_audio(self, audio_path: str) -> str:
         """
@@ -24,25 +35,68 @@ class RequestYaiProvider:
             httpx.HTTPError: If the API request fails
             ValueError: If the response is invalid
         """
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            # Read the audio file
-            with open(audio_path, "rb") as audio_file:
-                files = {"audio": audio_file}
-                headers = {"Authorization": f"Bearer {self.api_key}"}
-
-                # Make the API request
-                response = await client.post(
-                    self.api_url,
-                    files=files,
-                    headers=headers
-                )
-
-                # Check for errors
-                response.raise_for_status()
-
-                # Parse the response
-                data = response.json()
-                if "transcription" not in data:
-                    raise ValueError("Invalid response from RequestYai API: missing 'transcription' field")
-
-                return data["transcription"]
+        # Read the audio file
+        with open(audio_path, "rb") as audio_file:
+            files = {"audio": audio_file}
+            headers = {"Authorization": f"Bearer {self.api_key}"}
+
+            # Make the API request over the pooled connection
+            response = await self.http_client.post(
+                self.api_url,
+                files=files,
+                headers=headers
+            )
+
+        return self._parse_response(response)
+
+    async def transcribe_stream(self, audio: AudioStream) -> str:
+        """
+        Transcribe streamed audio using RequestYai API.
+
+        The multipart body is generated on the fly around the audio stream,
+        so the upload starts with the first buffer and never needs the whole
+        recording on disk or in memory.
+
+        Args:
+            audio: Audio stream to upload
+
+        Returns:
+            Transcription text
+
+        Raises:
+            httpx.HTTPError: If the API request fails
+            ValueError: If the response is invalid
+        """
+        boundary = uuid.uuid4().hex
+        head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="audio"; filename="{audio.filename}"\r\n'
+            f"Content-Type: audio/webm\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{boundary}--\r\n".encode()
+
+        async def body() -> AsyncIterator[bytes]:
+            yield head
+            async for part in audio:
+                yield part
+            yield tail
+
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+            "Content-Length": str(len(head) + await audio.get_size() + len(tail)),
+        }
+        response = await self.http_client.post(self.api_url, content=body(), headers=headers)
+        return self._parse_response(response)
+
+    def _parse_response(self, response: httpx.Response) -> str:
+        """Check the API response and extract the transcription text."""
+        # Check for errors
+        response.raise_for_status()
+
+        # Parse the response
+        data = response.json()
+        if "transcription" not in data:
+            raise ValueError("Invalid response from RequestYai API: missing 'transcription' field")
+
+        return data["transcription"]
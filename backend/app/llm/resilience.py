@@ -0,0 +1,348 @@
+"""Resilience wrapper for LLM providers: adaptive concurrency, retries and a circuit breaker."""
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+import httpx
+from app.core.config import settings
+from app.llm.interface import AudioStream, LLMProvider
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Responses worth another attempt: the request itself was fine
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Responses telling the client to send less
+OVERLOAD_STATUS_CODES = frozenset({429, 503})
+
+
+class ProviderUnavailableError(Exception):
+    """Raised without calling the provider while its circuit breaker is open."""
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a provider call failing with this error may succeed when repeated."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
+
+
+def is_overload(error: Exception) -> bool:
+    """Whether an error signals that the provider is receiving too many requests."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in OVERLOAD_STATUS_CODES
+    return isinstance(error, httpx.TimeoutException)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Read the Retry-After header of a failed response.
+
+    Args:
+        error: Error raised by the provider call
+
+    Returns:
+        Seconds to wait, or None if the error carries no usable Retry-After
+    """
+    if not isinstance(error, httpx.HTTPStatusError):
+        return None
+    value = error.response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on the provider calls in flight.
+
+    Every successful call raises the limit by 1/limit, about one slot per
+    round of calls; an overload signal multiplies it by decrease_factor. A
+    decrease only applies to calls started after the previous one, so a
+    burst of failures from the same round halves the limit once, not once
+    per failure.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, decrease_factor: float = 0.5):
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, self.minimum)
+        self.decrease_factor = decrease_factor
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.in_flight = 0
+        self._decreased_at = 0.0
+        self._changed = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[float]:
+        """
+        Hold one of the limit's slots, waiting for one to free up.
+
+        Yields:
+            Monotonic time at which the slot was granted, for on_overload
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        try:
+            yield time.monotonic()
+        finally:
+            async with self._changed:
+                self.in_flight -= 1
+                self._changed.notify_all()
+
+    def on_success(self) -> None:
+        """Grow the limit after a successful call."""
+        self.limit = min(self.limit + 1 / self.limit, float(self.maximum))
+
+    def on_overload(self, started_at: float) -> None:
+        """Shrink the limit after an overload signal from a call granted its slot at started_at."""
+        if started_at < self._decreased_at:
+            return
+        self.limit = max(self.limit * self.decrease_factor, float(self.minimum))
+        self._decreased_at = time.monotonic()
+
+
+class CircuitBreaker:
+    """
+    Stops calling a provider that keeps failing.
+
+    After failure_threshold consecutive failures the circuit opens and
+    calls are rejected at once. Once reset_timeout_seconds have passed it
+    is half open: a single probe call is let through, closing the circuit
+    on success and opening it again on failure.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout_seconds: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.clock = clock
+        self.consecutive_failures = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open."""
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout_seconds:
+            self._state = self.HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def before_call(self) -> None:
+        """
+        Admit a call, or reject it while the circuit is open.
+
+        Raises:
+            ProviderUnavailableError: If the circuit is open, or half open with its probe in flight
+        """
+        state = self.state
+        if state == self.OPEN or (state == self.HALF_OPEN and self._probing):
+            raise ProviderUnavailableError("Transcription provider is unavailable, try again later")
+        if state == self.HALF_OPEN:
+            self._probing = True
+
+    def record_success(self) -> None:
+        """Record a call the provider answered."""
+        self.consecutive_failures = 0
+        self._state = self.CLOSED
+        self._probing = False
+
+    def abandon_call(self) -> None:
+        """Forget an admitted call that was cancelled, so a half-open circuit can probe again."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a call the provider failed."""
+        self.consecutive_failures += 1
+        if self._state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                logger.warning("Opening the transcription provider circuit after %s failures",
+                               self.consecutive_failures)
+            self._state = self.OPEN
+            self._opened_at = self.clock()
+            self._probing = False
+
+
+class ProviderMetrics:
+    """Counters describing the calls made through a ResilientProvider."""
+
+    def __init__(self):
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.total_latency = 0.0
+
+    def record_attempt(self, latency: float, error: Optional[Exception]) -> None:
+        """Record one request to the provider, how long it took and how it failed."""
+        self.total_latency += latency
+        if error is None:
+            self.successes += 1
+        else:
+            self.failures += 1
+            if isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429:
+                self.throttled += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The counters as a JSON-serializable dict."""
+        attempts = self.successes + self.failures
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+            "average_latency_ms": round(self.total_latency / attempts * 1000, 1) if attempts else None,
+        }
+
+
+class ResilientProvider:
+    """
+    LLMProvider wrapper adding adaptive concurrency, retries and a circuit breaker.
+
+    Each call waits for a slot of the AIMD limiter, then goes through the
+    circuit breaker to the wrapped provider. Transient failures (transport
+    errors, 408, 429 and 5xx responses) are retried with jittered
+    exponential backoff, waiting at least as long as a Retry-After header
+    asks and giving up when it asks for more than max_delay_seconds. The
+    slot is released while backing off. 429 and 503 responses and timeouts
+    shrink the concurrency limit; 429s do not count towards opening the
+    circuit, since a throttling provider is still up.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        limiter: AdaptiveConcurrencyLimiter,
+        breaker: CircuitBreaker,
+        max_attempts: int,
+        base_delay_seconds: float,
+        max_delay_seconds: float,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        self.provider = provider
+        self.limiter = limiter
+        self.breaker = breaker
+        self.max_attempts = max(max_attempts, 1)
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.metrics = ProviderMetrics()
+        self._sleep = sleep
+
+    @classmethod
+    def from_settings(cls, provider: LLMProvider) -> "ResilientProvider":
+        """Wrap a provider using the LLM_CONCURRENCY_*, LLM_RETRY_* and LLM_CIRCUIT_* settings."""
+        return cls(
+            provider,
+            AdaptiveConcurrencyLimiter(
+                settings.LLM_CONCURRENCY_INITIAL,
+                settings.LLM_CONCURRENCY_MIN,
+                settings.LLM_CONCURRENCY_MAX
+            ),
+            CircuitBreaker(settings.LLM_CIRCUIT_FAILURE_THRESHOLD, settings.LLM_CIRCUIT_RESET_SECONDS),
+            max_attempts=settings.LLM_RETRY_MAX_ATTEMPTS,
+            base_delay_seconds=settings.LLM_RETRY_BASE_DELAY_SECONDS,
+            max_delay_seconds=settings.LLM_RETRY_MAX_DELAY_SECONDS
+        )
+
+    async def transcribe_audio(self, audio_path: str) -> str:
+        """Transcribe an audio file through the wrapped provider."""
+        return await self._call(lambda: self.provider.transcribe_audio(audio_path))
+
+    async def transcribe_stream(self, audio: AudioStream) -> str:
+        """Transcribe streamed audio through the wrapped provider, replaying the stream on retries."""
+        return await self._call(lambda: self.provider.transcribe_stream(audio))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Metrics, limiter and circuit state as a JSON-serializable dict."""
+        return {
+            **self.metrics.snapshot(),
+            "in_flight": self.limiter.in_flight,
+            "concurrency_limit": round(self.limiter.limit, 2),
+            "circuit_state": self.breaker.state,
+        }
+
+    async def _call(self, call: Callable[[], Awaitable[T]]) -> T:
+        self.metrics.calls += 1
+        attempt = 1
+        while True:
+            async with self.limiter.slot() as started_at:
+                try:
+                    self.breaker.before_call()
+                except ProviderUnavailableError:
+                    self.metrics.rejected += 1
+                    raise
+
+                try:
+                    result = await call()
+                except asyncio.CancelledError:
+                    self.breaker.abandon_call()
+                    raise
+                except Exception as e:
+                    self.metrics.record_attempt(time.monotonic() - started_at, e)
+                    error = e
+                else:
+                    self.metrics.record_attempt(time.monotonic() - started_at, None)
+                    self.breaker.record_success()
+                    self.limiter.on_success()
+                    return result
+
+                throttled = isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429
+                if throttled or not is_retryable(error):
+                    # The provider answered: throttling is left to the limiter, and
+                    # other answers mean the request itself was at fault
+                    self.breaker.record_success()
+                else:
+                    self.breaker.record_failure()
+                if not is_retryable(error):
+                    raise error
+                if is_overload(error):
+                    self.limiter.on_overload(started_at)
+
+            delay = self._backoff(attempt, error)
+            if attempt >= self.max_attempts or delay is None:
+                raise error
+            logger.info("Transcription request failed (attempt %s/%s), retrying in %.2fs: %s",
+                        attempt, self.max_attempts, delay, error)
+            self.metrics.retries += 1
+            attempt += 1
+            await self._sleep(delay)
+
+    def _backoff(self, attempt: int, error: Exception) -> Optional[float]:
+        """Delay before the next attempt, or None if the provider asked to wait too long."""
+        delay = random.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (attempt - 1)))
+        retry_after = retry_after_seconds(error)
+        if retry_after is None:
+            return delay
+        if retry_after > self.max_delay_seconds:
+            return None
+        return max(delay, retry_after)
@@ -0,0 +1,189 @@
+"""Routing transcriptions across several providers by their recent latency and errors."""
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.llm.interface import AudioStream, LLMProvider
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyWindow:
+    """Rolling window of a provider's most recent call latencies and outcomes."""
+
+    def __init__(self, size: int):
+        self._samples: Deque[Tuple[float, bool]] = deque(maxlen=max(size, 1))
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency: float, succeeded: bool) -> None:
+        """Record one call, with its latency in seconds."""
+        self._samples.append((latency, succeeded))
+
+    def percentile(self, quantile: float) -> Optional[float]:
+        """Latency, in seconds, below which the given share of successful calls finished."""
+        latencies = sorted(latency for latency, succeeded in self._samples if succeeded)
+        if not latencies:
+            return None
+        return latencies[max(math.ceil(quantile * len(latencies)) - 1, 0)]
+
+    @property
+    def error_rate(self) -> float:
+        """Share of the calls in the window that failed."""
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, succeeded in self._samples if not succeeded) / len(self._samples)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The window's statistics as a JSON-serializable dict."""
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "samples": len(self._samples),
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "error_rate": round(self.error_rate, 3),
+        }
+
+
+class RoutingProvider:
+    """
+    LLMProvider spreading calls over several providers, fastest first.
+
+    Providers are ranked by the p95 latency of their recent successful
+    calls. Those failing more than max_error_rate of their recent calls, or
+    whose circuit breaker is open, rank last; those with fewer than
+    min_samples calls rank first, so a new or recovered provider gets
+    measured. A failed call fails over to the next provider in the ranking.
+
+    With hedge_delay_seconds, a call still running after that delay is also
+    sent to the next provider and the first successful answer wins; the
+    other request is cancelled.
+    """
+
+    def __init__(
+        self,
+        providers: Dict[str, LLMProvider],
+        window_size: int = 100,
+        max_error_rate: float = 0.5,
+        hedge_delay_seconds: Optional[float] = None,
+        min_samples: int = 5
+    ):
+        if not providers:
+            raise ValueError("RoutingProvider needs at least one provider")
+        self.providers = providers
+        self.max_error_rate = max_error_rate
+        self.hedge_delay_seconds = hedge_delay_seconds
+        self.min_samples = min_samples
+        self.windows = {name: LatencyWindow(window_size) for name in providers}
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def ranked(self) -> List[str]:
+        """Provider names in the order calls try them."""
+        def rank(name: str) -> Tuple[bool, bool, float]:
+            window = self.windows[name]
+            breaker = getattr(self.providers[name], "breaker", None)
+            unhealthy = (
+                (breaker is not None and breaker.state == breaker.OPEN)
+                or (len(window) >= self.min_samples and window.error_rate > self.max_error_rate)
+            )
+            measured = len(window) >= self.min_samples
+            return unhealthy, measured, window.percentile(0.95) or 0.0
+
+        return sorted(self.providers, key=rank)
+
+    async def transcribe_audio(self, audio_path: str) -> str:
+        """Transcribe an audio file with the best-ranked provider."""
+        _, transcription = await self._route(lambda provider: provider.transcribe_audio(audio_path))
+        return transcription
+
+    async def transcribe_stream(self, audio: AudioStream) -> str:
+        """Transcribe streamed audio with the best-ranked provider; hedged requests re-read the stream."""
+        _, transcription = await self.transcribe_stream_routed(audio)
+        return transcription
+
+    async def transcribe_stream_routed(self, audio: AudioStream) -> Tuple[str, str]:
+        """
+        Transcribe streamed audio, also telling which provider answered.
+
+        Returns:
+            Name of the provider whose transcript was used, and the transcript
+        """
+        return await self._route(lambda provider: provider.transcribe_stream(audio))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Ranking, per-provider latency statistics and hedging counters as a JSON-serializable dict."""
+        return {
+            "ranking": self.ranked(),
+            "providers": {name: window.snapshot() for name, window in self.windows.items()},
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
+
+    async def _timed(self, name: str, call: Callable[[LLMProvider], Awaitable[str]]) -> str:
+        """Make a call to one provider, recording its latency and outcome unless it is cancelled."""
+        started_at = time.monotonic()
+        try:
+            result = await call(self.providers[name])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.windows[name].record(time.monotonic() - started_at, False)
+            raise
+        self.windows[name].record(time.monotonic() - started_at, True)
+        return result
+
+    async def _route(self, call: Callable[[LLMProvider], Awaitable[str]]) -> Tuple[str, str]:
+        order = self.ranked()
+        in_flight: Dict[asyncio.Task, str] = {}
+        tried = 0
+        hedged = False
+        last_error: Optional[Exception] = None
+
+        def send_to_next() -> None:
+            name = order[tried + len(in_flight)]
+            in_flight[asyncio.ensure_future(self._timed(name, call))] = name
+
+        send_to_next()
+        try:
+            while in_flight:
+                can_hedge = (
+                    self.hedge_delay_seconds is not None
+                    and len(in_flight) == 1
+                    and tried + 1 < len(order)
+                )
+                done, _ = await asyncio.wait(
+                    in_flight,
+                    timeout=self.hedge_delay_seconds if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    self.hedges += 1
+                    hedged = True
+                    send_to_next()
+                    continue
+
+                for task in done:
+                    name = in_flight.pop(task)
+                    tried += 1
+                    if task.exception() is None:
+                        if hedged and name != order[0]:
+                            self.hedge_wins += 1
+                        return name, task.result()
+                    last_error = task.exception()
+                    logger.warning("Transcription with provider %s failed: %s", name, last_error)
+
+                if not in_flight and tried < len(order):
+                    # Fail over to the next provider
+                    send_to_next()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+        raise last_error
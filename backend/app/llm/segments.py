@@ -0,0 +1,64 @@
+"""Concurrent transcription of the segments of one recording."""
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+
+Segment = TypeVar("Segment")
+
+
+class SegmentTranscriptionError(Exception):
+    """
+    Raised when some segments could not be transcribed.
+
+    Carries the transcripts of the segments that succeeded, so callers can
+    keep them and retry only the failed ones.
+    """
+
+    def __init__(self, transcripts: List[Optional[str]], errors: Dict[int, Exception]):
+        first_index = min(errors)
+        super().__init__(
+            f"{len(errors)} of {len(transcripts)} segments failed, "
+            f"segment {first_index}: {errors[first_index]}"
+        )
+        self.transcripts = transcripts
+        self.errors = errors
+
+
+async def transcribe_segments(
+    transcribe: Callable[[Segment], Awaitable[str]],
+    segments: Sequence[Segment],
+    max_concurrency: int
+) -> List[str]:
+    """
+    Transcribe segments concurrently and return their transcripts in order.
+
+    At most max_concurrency segments are in flight, and a failed segment does
+    not stop the others. Retries are left to the provider, e.g.
+    ResilientProvider, and to the job that reruns only the failed segments.
+
+    Args:
+        transcribe: Transcribes one segment, e.g. a provider's transcribe_stream
+        segments: Consecutive segments of a recording, or anything transcribe accepts
+        max_concurrency: Most segments transcribed at once
+
+    Returns:
+        One transcript per segment, in segment order
+
+    Raises:
+        SegmentTranscriptionError: If a segment failed
+    """
+    slots = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def transcribe_segment(segment: Segment) -> str:
+        async with slots:
+            return await transcribe(segment)
+
+    results = await asyncio.gather(
+        *(transcribe_segment(segment) for segment in segments),
+        return_exceptions=True
+    )
+
+    errors = {index: result for index, result in enumerate(results) if isinstance(result, Exception)}
+    if errors:
+        transcripts = [None if index in errors else result for index, result in enumerate(results)]
+        raise SegmentTranscriptionError(transcripts, errors)
+    return list(results)
@@ -1,10 +1,29 @@
 """Database models."""
 from .user import User
-from .recording import Recording, RecordingChunk, RecordingStatus
+from .recording import (
+    Recording,
+    RecordingChunk,
+    RecordingStatus,
+    RecordingSummary,
+    ChunkUpload,
+    ChunkUploadResult,
+    ChunkManifest,
+    ChunkManifestEntry,
+)
+from .transcription_job import TranscriptionJob, TranscriptionJobStatus
+from .transcription_cache import TranscriptionCacheEntry
 
 __all__ = [
     "User",
     "Recording",
     "RecordingChunk",
     "RecordingStatus",
+    "RecordingSummary",
+    "ChunkUpload",
+    "ChunkUploadResult",
+    "ChunkManifest",
+    "ChunkManifestEntry",
+    "TranscriptionJob",
+    "TranscriptionJobStatus",
+    "TranscriptionCacheEntry",
 ]
@@ -2,7 +2,10 @@
 import uuid
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Integer, Float, Enum as SQLEnum
+from typing import Dict, List, NamedTuple, Optional
+from sqlalchemy import (
+    Column, String, DateTime, ForeignKey, Text, Integer, BigInteger, Float, Index, UniqueConstraint, Enum as SQLEnum
+)
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -11,13 +14,26 @@ class RecordingStatus(str, Enum):
     """Enum for recording status."""
     ACTIVE = "active"
     PAUSED = "paused"
+    TRANSCRIBING = "transcribing"
     ENDED = "ended"
+    FAILED = "failed"
+
+
+class ChunkUploadResult(str, Enum):
+    """Enum for the outcome of storing an uploaded chunk."""
+    CREATED = "created"
+    REPLACED = "replaced"
+    UNCHANGED = "unchanged"
 
 
 class Recording(Base):
     """Recording model for storing audio recording sessions."""
 
     __tablename__ = "recordings"
+    __table_args__ = (
+        # Serves the newest-first keyset pagination of a user's recordings
+        Index("ix_recordings_user_created_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
@@ -28,10 +44,18 @@ class Recording(Base):
     transcription_text = Column(Text, nullable=True)
     llm_provider = Column(String(50), default="requestyai", nullable=False)
     notes = Column(Text, nullable=True)  # For user notes on the recording session
+    # Chunk aggregates, kept current by add_chunk so lists never scan recording_chunks
+    chunk_count = Column(Integer, default=0, server_default="0", nullable=False)
+    total_duration_seconds = Column(Float, default=0.0, server_default="0", nullable=False)
+    total_bytes = Column(BigInteger, default=0, server_default="0", nullable=False)
+    last_chunk_at = Column(DateTime, nullable=True)
 
     # Relationships
     user = relationship("User", back_populates="recordings")
     chunks = relationship("RecordingChunk", back_populates="recording", cascade="all, delete-orphan")
+    transcription_jobs = relationship(
+        "TranscriptionJob", back_populates="recording", cascade="all, delete-orphan"
+    )
 
     def __repr__(self):
         return f"<Recording(id={self.id}, user_id={self.user_id}, status={self.status})>"
@@ -41,12 +65,23 @@ class RecordingChunk(Base):
     """RecordingChunk model for storing individual audio chunks."""
 
     __tablename__ = "recording_chunks"
+    __table_args__ = (
+        # One row per chunk position, so retried uploads update instead of duplicating
+        UniqueConstraint("recording_id", "chunk_index", name="uq_recording_chunks_recording_index"),
+        # Covers the upload manifest, so it is read from the index alone
+        Index("ix_recording_chunks_manifest", "recording_id", "chunk_index", "size_bytes", "content_hash"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     recording_id = Column(String(36), ForeignKey("recordings.id"), nullable=False, index=True)
     chunk_index = Column(Integer, nullable=False)
     audio_blob_path = Column(String(512), nullable=False)
     duration_seconds = Column(Float, nullable=True)
+    size_bytes = Column(BigInteger, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the chunk, hex encoded
+    # Partial transcript from incremental transcription. For a multi-chunk window the
+    # text is stored on the window's first chunk and the others hold an empty string.
+    transcription_text = Column(Text, nullable=True)
     uploaded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Relationships
@@ -54,3 +89,43 @@ class RecordingChunk(Base):
 
     def __repr__(self):
         return f"<RecordingChunk(id={self.id}, recording_id={self.recording_id}, chunk_index={self.chunk_index})>"
+
+
+class RecordingSummary(NamedTuple):
+    """Read-only projection of a Recording for lists, without its text columns."""
+    id: str
+    user_id: str
+    status: RecordingStatus
+    created_at: datetime
+    updated_at: datetime
+    transcription_preview: Optional[str]
+    transcription_truncated: bool
+    has_notes: bool
+    chunk_count: int
+    total_duration_seconds: float
+    total_bytes: int
+    last_chunk_at: Optional[datetime]
+
+
+class ChunkUpload(NamedTuple):
+    """A chunk written to storage and waiting to be recorded in the database."""
+    chunk_index: int
+    audio_blob_path: str
+    duration_seconds: Optional[float] = None
+    size_bytes: Optional[int] = None
+    content_hash: Optional[str] = None
+
+
+class ChunkManifestEntry(NamedTuple):
+    """A stored chunk as listed in a recording's upload manifest."""
+    chunk_index: int
+    size_bytes: Optional[int]
+    content_hash: Optional[str]
+
+
+class ChunkManifest(NamedTuple):
+    """What the server holds of a recording's chunks, for resuming an upload."""
+    chunks: List[ChunkManifestEntry]
+    partial_chunks: Dict[int, int]  # chunk_index -> bytes received of an interrupted upload
+    missing_chunk_indexes: List[int]
+    next_chunk_index: int
@@ -0,0 +1,21 @@
+"""Transcription cache model."""
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Text
+from app.core.database import Base
+
+
+class TranscriptionCacheEntry(Base):
+    """TranscriptionCacheEntry model for transcripts reused across identical audio."""
+
+    __tablename__ = "transcription_cache"
+
+    # SHA-256 over the provider, its version and the content hashes of the audio, hex encoded
+    cache_key = Column(String(64), primary_key=True)
+    llm_provider = Column(String(50), nullable=False)
+    # Recording whose audio was transcribed; its entries are deleted with it
+    recording_id = Column(String(36), nullable=True, index=True)
+    transcription_text = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<TranscriptionCacheEntry(cache_key={self.cache_key}, llm_provider={self.llm_provider})>"
@@ -0,0 +1,50 @@
+"""Transcription job model."""
+import uuid
+from datetime import datetime
+from enum import Enum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Integer, Enum as SQLEnum
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+
+class TranscriptionJobStatus(str, Enum):
+    """Enum for transcription job status."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class TranscriptionJob(Base):
+    """TranscriptionJob model for the persistent background transcription queue."""
+
+    __tablename__ = "transcription_jobs"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    recording_id = Column(String(36), ForeignKey("recordings.id"), nullable=False, index=True)
+    # Chunk window for incremental jobs; both are NULL for a full-recording job
+    first_chunk_index = Column(Integer, nullable=True)
+    last_chunk_index = Column(Integer, nullable=True)
+    status = Column(
+        SQLEnum(TranscriptionJobStatus),
+        default=TranscriptionJobStatus.QUEUED,
+        nullable=False,
+        index=True
+    )
+    attempts = Column(Integer, default=0, nullable=False)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # Relationships
+    recording = relationship("Recording", back_populates="transcription_jobs")
+
+    def __repr__(self):
+        return f"<TranscriptionJob(id={self.id}, recording_id={self.recording_id}, status={self.status})>"
+
+    @property
+    def is_segment_job(self) -> bool:
+        """Whether the job transcribes a chunk window rather than the whole recording."""
+        return self.first_chunk_index is not None
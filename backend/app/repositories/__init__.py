@@ -1,11 +1,43 @@
 """Repository implementations."""
-from .interfaces import UserRepository, RecordingRepository
+from .interfaces import (
+    UserRepository,
+    RecordingRepository,
+    TranscriptionJobRepository,
+    AsyncUserRepository,
+    AsyncRecordingRepository,
+    AsyncTranscriptionJobRepository,
+    TranscriptionCacheRepository,
+    AsyncTranscriptionCacheRepository,
+)
+from .exceptions import RecordingNotFoundError, RecordingAccessDeniedError
 from .user_repository import MySQLUserRepository
 from .recording_repository import MySQLRecordingRepository
+from .transcription_job_repository import MySQLTranscriptionJobRepository
+from .transcription_cache_repository import MySQLTranscriptionCacheRepository
+from .async_repositories import (
+    AsyncMySQLUserRepository,
+    AsyncMySQLRecordingRepository,
+    AsyncMySQLTranscriptionJobRepository,
+    AsyncMySQLTranscriptionCacheRepository,
+)
 
 __all__ = [
     "UserRepository",
     "RecordingRepository",
+    "TranscriptionJobRepository",
+    "AsyncUserRepository",
+    "AsyncRecordingRepository",
+    "AsyncTranscriptionJobRepository",
+    "TranscriptionCacheRepository",
+    "AsyncTranscriptionCacheRepository",
+    "RecordingNotFoundError",
+    "RecordingAccessDeniedError",
     "MySQLUserRepository",
     "MySQLRecordingRepository",
+    "MySQLTranscriptionJobRepository",
+    "AsyncMySQLUserRepository",
+    "AsyncMySQLRecordingRepository",
+    "AsyncMySQLTranscriptionJobRepository",
+    "MySQLTranscriptionCacheRepository",
+    "AsyncMySQLTranscriptionCacheRepository",
 ]
@@ -0,0 +1,281 @@
+"""Async repository implementations over either database backend."""
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+from sqlalchemy.orm import Session
+from app.core.database import DatabaseSession, run_sync
+from app.models import (
+    User,
+    Recording,
+    RecordingChunk,
+    RecordingSummary,
+    ChunkUpload,
+    ChunkUploadResult,
+    ChunkManifestEntry,
+    TranscriptionJob,
+)
+from .user_repository import MySQLUserRepository
+from .recording_repository import MySQLRecordingRepository, TRANSCRIPT_PREVIEW_LENGTH
+from .transcription_job_repository import MySQLTranscriptionJobRepository
+from .transcription_cache_repository import MySQLTranscriptionCacheRepository
+
+T = TypeVar("T")
+
+
+class _AsyncRepository:
+    """
+    Base for async repositories that reuse the synchronous query code.
+
+    With DATABASE_BACKEND=async the session is an AsyncSession and queries
+    are awaited on aiomysql/aiosqlite through ``AsyncSession.run_sync``;
+    with a synchronous Session they run on the thread pool.
+    """
+
+    repository_class: Callable[[Session], object]
+
+    def __init__(self, db: DatabaseSession):
+        self.db = db
+
+    async def _call(self, method: Callable[..., T], *args, **kwargs) -> T:
+        """Run a method of the synchronous repository on the session."""
+        return await run_sync(
+            self.db,
+            lambda session: method(self.repository_class(session), *args, **kwargs)
+        )
+
+
+class AsyncMySQLUserRepository(_AsyncRepository):
+    """Async implementation of UserRepository."""
+
+    repository_class = MySQLUserRepository
+
+    async def create_user(
+        self,
+        google_id: str,
+        email: str,
+        display_name: Optional[str] = None,
+        avatar_url: Optional[str] = None
+    ) -> User:
+        """Create a new user."""
+        return await self._call(MySQLUserRepository.create_user, google_id, email, display_name, avatar_url)
+
+    async def get_user_by_id(self, user_id: str) -> Optional[User]:
+        """Get user by ID."""
+        return await self._call(MySQLUserRepository.get_user_by_id, user_id)
+
+    async def get_user_by_google_id(self, google_id: str) -> Optional[User]:
+        """Get user by Google ID."""
+        return await self._call(MySQLUserRepository.get_user_by_google_id, google_id)
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        """Get user by email."""
+        return await self._call(MySQLUserRepository.get_user_by_email, email)
+
+    async def update_user(self, user_id: str, **kwargs) -> Optional[User]:
+        """Update user information."""
+        return await self._call(MySQLUserRepository.update_user, user_id, **kwargs)
+
+
+class AsyncMySQLRecordingRepository(_AsyncRepository):
+    """Async implementation of RecordingRepository."""
+
+    repository_class = MySQLRecordingRepository
+
+    async def create_recording(self, user_id: str) -> Recording:
+        """Create a new recording session."""
+        return await self._call(MySQLRecordingRepository.create_recording, user_id)
+
+    async def get_recording(self, recording_id: str) -> Optional[Recording]:
+        """Get recording by ID."""
+        return await self._call(MySQLRecordingRepository.get_recording, recording_id)
+
+    async def list_recordings(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Recording]:
+        """List a user's recordings newest first, optionally one keyset page after (created_at, id)."""
+        return await self._call(MySQLRecordingRepository.list_recordings, user_id, limit, after)
+
+    async def list_recording_summaries(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        preview_length: int = TRANSCRIPT_PREVIEW_LENGTH
+    ) -> List[RecordingSummary]:
+        """List summaries of a user's recordings with a transcript preview, paged like list_recordings."""
+        return await self._call(
+            MySQLRecordingRepository.list_recording_summaries,
+            user_id, limit, after, preview_length
+        )
+
+    async def add_chunk(
+        self,
+        recording_id: str,
+        chunk_index: int,
+        audio_blob_path: str,
+        duration_seconds: Optional[float] = None,
+        size_bytes: Optional[int] = None,
+        content_hash: Optional[str] = None
+    ) -> Tuple[RecordingChunk, ChunkUploadResult]:
+        """Add an audio chunk, or replace the chunk at its index unless the content hash matches."""
+        return await self._call(
+            MySQLRecordingRepository.add_chunk,
+            recording_id, chunk_index, audio_blob_path, duration_seconds, size_bytes, content_hash
+        )
+
+    async def add_chunks(
+        self,
+        recording_id: str,
+        uploads: List[ChunkUpload]
+    ) -> List[Tuple[RecordingChunk, ChunkUploadResult]]:
+        """Add or replace several chunks of a recording in one transaction."""
+        return await self._call(MySQLRecordingRepository.add_chunks, recording_id, uploads)
+
+    async def get_chunks_missing_size(self, recording_ids: List[str]) -> List[RecordingChunk]:
+        """Get the chunks of the given recordings whose size was never recorded."""
+        return await self._call(MySQLRecordingRepository.get_chunks_missing_size, recording_ids)
+
+    async def list_recording_ids(self, after_id: Optional[str] = None, limit: int = 500) -> List[str]:
+        """List recording IDs in ID order, one batch after after_id."""
+        return await self._call(MySQLRecordingRepository.list_recording_ids, after_id, limit)
+
+    async def recompute_aggregates(self, recording_ids: List[str]) -> None:
+        """Recompute the chunk aggregates of the given recordings from their chunks."""
+        await self._call(MySQLRecordingRepository.recompute_aggregates, recording_ids)
+
+    async def get_chunk_manifest(self, recording_id: str) -> List[ChunkManifestEntry]:
+        """List the index, size and hash of each stored chunk, ordered by chunk_index."""
+        return await self._call(MySQLRecordingRepository.get_chunk_manifest, recording_id)
+
+    async def get_chunks(self, recording_id: str) -> List[RecordingChunk]:
+        """Get all chunks for a recording, ordered by chunk_index."""
+        return await self._call(MySQLRecordingRepository.get_chunks, recording_id)
+
+    async def get_chunks_in_range(
+        self,
+        recording_id: str,
+        first_chunk_index: int,
+        last_chunk_index: int
+    ) -> List[RecordingChunk]:
+        """Get the chunks whose index falls in an inclusive range, ordered by chunk_index."""
+        return await self._call(
+            MySQLRecordingRepository.get_chunks_in_range,
+            recording_id, first_chunk_index, last_chunk_index
+        )
+
+    async def store_chunk_transcription(self, chunk_ids: List[str], transcription: str) -> None:
+        """Store a partial transcript on the first chunk and mark the rest as covered."""
+        await self._call(MySQLRecordingRepository.store_chunk_transcription, chunk_ids, transcription)
+
+    async def mark_paused(self, recording_id: str, user_id: Optional[str] = None) -> Optional[Recording]:
+        """Mark a recording as paused, scoped to its owner when user_id is given."""
+        return await self._call(MySQLRecordingRepository.mark_paused, recording_id, user_id)
+
+    async def mark_ended(
+        self,
+        recording_id: str,
+        full_audio_path: Optional[str] = None,
+        transcription: Optional[str] = None
+    ) -> Optional[Recording]:
+        """Mark a recording as ended and store the assembled audio path and transcription."""
+        return await self._call(
+            MySQLRecordingRepository.mark_ended,
+            recording_id, full_audio_path, transcription
+        )
+
+    async def mark_transcribing(self, recording_id: str) -> Optional[Recording]:
+        """Mark a recording as waiting for or undergoing transcription."""
+        return await self._call(MySQLRecordingRepository.mark_transcribing, recording_id)
+
+    async def mark_failed(self, recording_id: str) -> Optional[Recording]:
+        """Mark a recording whose transcription could not be completed."""
+        return await self._call(MySQLRecordingRepository.mark_failed, recording_id)
+
+    async def update_transcription(self, recording_id: str, transcription: str) -> Optional[Recording]:
+        """Update the transcription text for a recording."""
+        return await self._call(MySQLRecordingRepository.update_transcription, recording_id, transcription)
+
+    async def add_notes(self, recording_id: str, notes: str, user_id: Optional[str] = None) -> Optional[Recording]:
+        """Add or update notes for a recording, scoped to its owner when user_id is given."""
+        return await self._call(MySQLRecordingRepository.add_notes, recording_id, notes, user_id)
+
+    async def delete_recording(self, recording_id: str, user_id: Optional[str] = None) -> bool:
+        """Delete a recording, its chunks and its jobs, scoped to its owner when user_id is given."""
+        return await self._call(MySQLRecordingRepository.delete_recording, recording_id, user_id)
+
+
+class AsyncMySQLTranscriptionJobRepository(_AsyncRepository):
+    """Async implementation of TranscriptionJobRepository."""
+
+    repository_class = MySQLTranscriptionJobRepository
+
+    async def create_job(
+        self,
+        recording_id: str,
+        first_chunk_index: Optional[int] = None,
+        last_chunk_index: Optional[int] = None
+    ) -> TranscriptionJob:
+        """Enqueue a transcription job for a recording or for a window of its chunks."""
+        return await self._call(
+            MySQLTranscriptionJobRepository.create_job,
+            recording_id, first_chunk_index, last_chunk_index
+        )
+
+    async def get_job(self, job_id: str) -> Optional[TranscriptionJob]:
+        """Get job by ID."""
+        return await self._call(MySQLTranscriptionJobRepository.get_job, job_id)
+
+    async def get_active_job(self, recording_id: str) -> Optional[TranscriptionJob]:
+        """Get the queued or running full-recording job for a recording, if any."""
+        return await self._call(MySQLTranscriptionJobRepository.get_active_job, recording_id)
+
+    async def claim_next_job(self) -> Optional[TranscriptionJob]:
+        """Atomically claim the oldest queued job and mark it as running."""
+        return await self._call(MySQLTranscriptionJobRepository.claim_next_job)
+
+    async def mark_completed(self, job_id: str) -> Optional[TranscriptionJob]:
+        """Mark a job as completed."""
+        return await self._call(MySQLTranscriptionJobRepository.mark_completed, job_id)
+
+    async def mark_failed(self, job_id: str, error: str, retry: bool = False) -> Optional[TranscriptionJob]:
+        """Record a failed attempt, re-queueing the job when retry is True."""
+        return await self._call(MySQLTranscriptionJobRepository.mark_failed, job_id, error, retry)
+
+    async def release_job(self, job_id: str, error: str) -> Optional[TranscriptionJob]:
+        """Re-queue a job that could not be attempted, without spending one of its attempts."""
+        return await self._call(MySQLTranscriptionJobRepository.release_job, job_id, error)
+
+    async def requeue_stale_jobs(self, started_before: datetime) -> int:
+        """Re-queue running jobs whose worker started them before the given time."""
+        return await self._call(MySQLTranscriptionJobRepository.requeue_stale_jobs, started_before)
+
+
+class AsyncMySQLTranscriptionCacheRepository(_AsyncRepository):
+    """Async implementation of TranscriptionCacheRepository."""
+
+    repository_class = MySQLTranscriptionCacheRepository
+
+    async def get_transcriptions(self, cache_keys: List[str]) -> Dict[str, str]:
+        """Get the cached transcripts of the given keys, by key; missing keys are left out."""
+        return await self._call(MySQLTranscriptionCacheRepository.get_transcriptions, cache_keys)
+
+    async def store_transcriptions(
+        self,
+        llm_provider: str,
+        transcriptions: Dict[str, str],
+        recording_id: Optional[str] = None
+    ) -> None:
+        """Cache transcripts of a recording's audio by key, keeping entries that already exist."""
+        await self._call(
+            MySQLTranscriptionCacheRepository.store_transcriptions, llm_provider, transcriptions, recording_id
+        )
+
+    async def delete_recording_entries(self, recording_id: str) -> List[str]:
+        """Delete the entries cached from a recording's audio, returning their keys."""
+        return await self._call(MySQLTranscriptionCacheRepository.delete_recording_entries, recording_id)
+
+    async def delete_entries_before(self, created_before: datetime) -> int:
+        """Delete entries cached before the given time."""
+        return await self._call(MySQLTranscriptionCacheRepository.delete_entries_before, created_before)
@@ -0,0 +1,17 @@
+"""Errors raised by owner-scoped repository operations."""
+
+
+class RecordingNotFoundError(LookupError):
+    """Raised when a recording does not exist."""
+
+    def __init__(self, recording_id: str):
+        super().__init__(f"Recording {recording_id} not found")
+        self.recording_id = recording_id
+
+
+class RecordingAccessDeniedError(PermissionError):
+    """Raised when a recording belongs to another user."""
+
+    def __init__(self, recording_id: str):
+        super().__init__(f"Recording {recording_id} belongs to another user")
+        self.recording_id = recording_id
@@ -1,6 +1,16 @@
 """Repository interface definitions using Protocol."""
-from typing import Protocol, List, Optional
-from app.models import User, Recording, RecordingChunk
+from datetime import datetime
+from typing import Dict, Protocol, List, Optional, Tuple
+from app.models import (
+    User,
+    Recording,
+    RecordingChunk,
+    RecordingSummary,
+    ChunkUpload,
+    ChunkUploadResult,
+    ChunkManifestEntry,
+    TranscriptionJob,
+)
 
 
 class UserRepository(Protocol):
@@ -44,8 +54,23 @@ class RecordingRepository(Protocol):
         """Get recording by ID."""
         ...
 
-    def list_recordings(self, user_id: str) -> List[Recording]:
-        """List all recordings for a user."""
+    def list_recordings(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Recording]:
+        """List a user's recordings newest first, optionally one keyset page after (created_at, id)."""
+        ...
+
+    def list_recording_summaries(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        preview_length: int = 200
+    ) -> List[RecordingSummary]:
+        """List summaries of a user's recordings with a transcript preview, paged like list_recordings."""
         ...
 
     def add_chunk(
@@ -53,36 +78,362 @@ class RecordingRepository(Protocol):
         recording_id: str,
         chunk_index: int,
         audio_blob_path: str,
-        duration_seconds: Optional[float] = None
-    ) -> RecordingChunk:
-        """Add an audio chunk to a recording."""
+        duration_seconds: Optional[float] = None,
+        size_bytes: Optional[int] = None,
+        content_hash: Optional[str] = None
+    ) -> Tuple[RecordingChunk, ChunkUploadResult]:
+        """Add an audio chunk, or replace the chunk at its index unless the content hash matches."""
+        ...
+
+    def add_chunks(
+        self,
+        recording_id: str,
+        uploads: List[ChunkUpload]
+    ) -> List[Tuple[RecordingChunk, ChunkUploadResult]]:
+        """Add or replace several chunks of a recording in one transaction."""
+        ...
+
+    def get_chunks_missing_size(self, recording_ids: List[str]) -> List[RecordingChunk]:
+        """Get the chunks of the given recordings whose size was never recorded."""
+        ...
+
+    def list_recording_ids(self, after_id: Optional[str] = None, limit: int = 500) -> List[str]:
+        """List recording IDs in ID order, one batch after after_id."""
+        ...
+
+    def recompute_aggregates(self, recording_ids: List[str]) -> None:
+        """Recompute the chunk aggregates of the given recordings from their chunks."""
+        ...
+
+    def get_chunk_manifest(self, recording_id: str) -> List[ChunkManifestEntry]:
+        """List the index, size and hash of each stored chunk, ordered by chunk_index."""
         ...
 
     def get_chunks(self, recording_id: str) -> List[RecordingChunk]:
         """Get all chunks for a recording, ordered by chunk_index."""
         ...
 
-    def mark_paused(self, recording_id: str) -> Optional[Recording]:
-        """Mark a recording as paused."""
+    def get_chunks_in_range(
+        self,
+        recording_id: str,
+        first_chunk_index: int,
+        last_chunk_index: int
+    ) -> List[RecordingChunk]:
+        """Get the chunks whose index falls in an inclusive range, ordered by chunk_index."""
+        ...
+
+    def store_chunk_transcription(self, chunk_ids: List[str], transcription: str) -> None:
+        """Store a partial transcript on the first chunk and mark the rest as covered."""
+        ...
+
+    def mark_paused(self, recording_id: str, user_id: Optional[str] = None) -> Optional[Recording]:
+        """Mark a recording as paused, scoped to its owner when user_id is given."""
         ...
 
     def mark_ended(
         self,
         recording_id: str,
-        full_audio_path: str,
+        full_audio_path: Optional[str] = None,
         transcription: Optional[str] = None
     ) -> Optional[Recording]:
         """Mark a recording as ended and store the assembled audio path and transcription."""
         ...
 
+    def mark_transcribing(self, recording_id: str) -> Optional[Recording]:
+        """Mark a recording as waiting for or undergoing transcription."""
+        ...
+
+    def mark_failed(self, recording_id: str) -> Optional[Recording]:
+        """Mark a recording whose transcription could not be completed."""
+        ...
+
     def update_transcription(self, recording_id: str, transcription: str) -> Optional[Recording]:
         """Update the transcription text for a recording."""
         ...
 
-    def add_notes(self, recording_id: str, notes: str) -> Optional[Recording]:
-        """Add or update notes for a recording."""
+    def add_notes(self, recording_id: str, notes: str, user_id: Optional[str] = None) -> Optional[Recording]:
+        """Add or update notes for a recording, scoped to its owner when user_id is given."""
+        ...
+
+    def delete_recording(self, recording_id: str, user_id: Optional[str] = None) -> bool:
+        """Delete a recording, its chunks and its jobs, scoped to its owner when user_id is given."""
+        ...
+
+
+class TranscriptionJobRepository(Protocol):
+    """Interface for transcription job queue operations."""
+
+    def create_job(
+        self,
+        recording_id: str,
+        first_chunk_index: Optional[int] = None,
+        last_chunk_index: Optional[int] = None
+    ) -> TranscriptionJob:
+        """Enqueue a transcription job for a recording or for a window of its chunks."""
+        ...
+
+    def get_job(self, job_id: str) -> Optional[TranscriptionJob]:
+        """Get job by ID."""
+        ...
+
+    def get_active_job(self, recording_id: str) -> Optional[TranscriptionJob]:
+        """Get the queued or running full-recording job for a recording, if any."""
+        ...
+
+    def claim_next_job(self) -> Optional[TranscriptionJob]:
+        """Atomically claim the oldest queued job and mark it as running."""
+        ...
+
+    def mark_completed(self, job_id: str) -> Optional[TranscriptionJob]:
+        """Mark a job as completed."""
+        ...
+
+    def mark_failed(self, job_id: str, error: str, retry: bool = False) -> Optional[TranscriptionJob]:
+        """Record a failed attempt, re-queueing the job when retry is True."""
+        ...
+
+    def release_job(self, job_id: str, error: str) -> Optional[TranscriptionJob]:
+        """Re-queue a job that could not be attempted, without spending one of its attempts."""
+        ...
+
+    def requeue_stale_jobs(self, started_before: datetime) -> int:
+        """Re-queue running jobs whose worker started them before the given time."""
+        ...
+
+
+class TranscriptionCacheRepository(Protocol):
+    """Interface for transcription cache operations."""
+
+    def get_transcriptions(self, cache_keys: List[str]) -> Dict[str, str]:
+        """Get the cached transcripts of the given keys, by key; missing keys are left out."""
+        ...
+
+    def store_transcriptions(
+        self,
+        llm_provider: str,
+        transcriptions: Dict[str, str],
+        recording_id: Optional[str] = None
+    ) -> None:
+        """Cache transcripts of a recording's audio by key, keeping entries that already exist."""
+        ...
+
+    def delete_recording_entries(self, recording_id: str) -> List[str]:
+        """Delete the entries cached from a recording's audio, returning their keys."""
+        ...
+
+    def delete_entries_before(self, created_before: datetime) -> int:
+        """Delete entries cached before the given time."""
+        ...
+
+
+class AsyncUserRepository(Protocol):
+    """Interface for user repository operations that do not block the event loop."""
+
+    async def create_user(
+        self,
+        google_id: str,
+        email: str,
+        display_name: Optional[str] = None,
+        avatar_url: Optional[str] = None
+    ) -> User:
+        """Create a new user."""
+        ...
+
+    async def get_user_by_id(self, user_id: str) -> Optional[User]:
+        """Get user by ID."""
+        ...
+
+    async def get_user_by_google_id(self, google_id: str) -> Optional[User]:
+        """Get user by Google ID."""
+        ...
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        """Get user by email."""
+        ...
+
+    async def update_user(self, user_id: str, **kwargs) -> Optional[User]:
+        """Update user information."""
+        ...
+
+
+class AsyncRecordingRepository(Protocol):
+    """Interface for recording repository operations that do not block the event loop."""
+
+    async def create_recording(self, user_id: str) -> Recording:
+        """Create a new recording session."""
+        ...
+
+    async def get_recording(self, recording_id: str) -> Optional[Recording]:
+        """Get recording by ID."""
+        ...
+
+    async def list_recordings(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Recording]:
+        """List a user's recordings newest first, optionally one keyset page after (created_at, id)."""
+        ...
+
+    async def list_recording_summaries(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        preview_length: int = 200
+    ) -> List[RecordingSummary]:
+        """List summaries of a user's recordings with a transcript preview, paged like list_recordings."""
+        ...
+
+    async def add_chunk(
+        self,
+        recording_id: str,
+        chunk_index: int,
+        audio_blob_path: str,
+        duration_seconds: Optional[float] = None,
+        size_bytes: Optional[int] = None,
+        content_hash: Optional[str] = None
+    ) -> Tuple[RecordingChunk, ChunkUploadResult]:
+        """Add an audio chunk, or replace the chunk at its index unless the content hash matches."""
+        ...
+
+    async def add_chunks(
+        self,
+        recording_id: str,
+        uploads: List[ChunkUpload]
+    ) -> List[Tuple[RecordingChunk, ChunkUploadResult]]:
+        """Add or replace several chunks of a recording in one transaction."""
+        ...
+
+    async def get_chunks_missing_size(self, recording_ids: List[str]) -> List[RecordingChunk]:
+        """Get the chunks of the given recordings whose size was never recorded."""
+        ...
+
+    async def list_recording_ids(self, after_id: Optional[str] = None, limit: int = 500) -> List[str]:
+        """List recording IDs in ID order, one batch after after_id."""
+        ...
+
+    async def recompute_aggregates(self, recording_ids: List[str]) -> None:
+        """Recompute the chunk aggregates of the given recordings from their chunks."""
+        ...
+
+    async def get_chunk_manifest(self, recording_id: str) -> List[ChunkManifestEntry]:
+        """List the index, size and hash of each stored chunk, ordered by chunk_index."""
+        ...
+
+    async def get_chunks(self, recording_id: str) -> List[RecordingChunk]:
+        """Get all chunks for a recording, ordered by chunk_index."""
+        ...
+
+    async def get_chunks_in_range(
+        self,
+        recording_id: str,
+        first_chunk_index: int,
+        last_chunk_index: int
+    ) -> List[RecordingChunk]:
+        """Get the chunks whose index falls in an inclusive range, ordered by chunk_index."""
+        ...
+
+    async def store_chunk_transcription(self, chunk_ids: List[str], transcription: str) -> None:
+        """Store a partial transcript on the first chunk and mark the rest as covered."""
+        ...
+
+    async def mark_paused(self, recording_id: str, user_id: Optional[str] = None) -> Optional[Recording]:
+        """Mark a recording as paused, scoped to its owner when user_id is given."""
+        ...
+
+    async def mark_ended(
+        self,
+        recording_id: str,
+        full_audio_path: Optional[str] = None,
+        transcription: Optional[str] = None
+    ) -> Optional[Recording]:
+        """Mark a recording as ended and store the assembled audio path and transcription."""
+        ...
+
+    async def mark_transcribing(self, recording_id: str) -> Optional[Recording]:
+        """Mark a recording as waiting for or undergoing transcription."""
+        ...
+
+    async def mark_failed(self, recording_id: str) -> Optional[Recording]:
+        """Mark a recording whose transcription could not be completed."""
+        ...
+
+    async def update_transcription(self, recording_id: str, transcription: str) -> Optional[Recording]:
+        """Update the transcription text for a recording."""
+        ...
+
+    async def add_notes(self, recording_id: str, notes: str, user_id: Optional[str] = None) -> Optional[Recording]:
+        """Add or update notes for a recording, scoped to its owner when user_id is given."""
+        ...
+
+    async def delete_recording(self, recording_id: str, user_id: Optional[str] = None) -> bool:
+        """Delete a recording, its chunks and its jobs, scoped to its owner when user_id is given."""
+        ...
+
+
+class AsyncTranscriptionJobRepository(Protocol):
+    """Interface for transcription job queue operations that do not block the event loop."""
+
+    async def create_job(
+        self,
+        recording_id: str,
+        first_chunk_index: Optional[int] = None,
+        last_chunk_index: Optional[int] = None
+    ) -> TranscriptionJob:
+        """Enqueue a transcription job for a recording or for a window of its chunks."""
+        ...
+
+    async def get_job(self, job_id: str) -> Optional[TranscriptionJob]:
+        """Get job by ID."""
+        ...
+
+    async def get_active_job(self, recording_id: str) -> Optional[TranscriptionJob]:
+        """Get the queued or running full-recording job for a recording, if any."""
+        ...
+
+    async def claim_next_job(self) -> Optional[TranscriptionJob]:
+        """Atomically claim the oldest queued job and mark it as running."""
+        ...
+
+    async def mark_completed(self, job_id: str) -> Optional[TranscriptionJob]:
+        """Mark a job as completed."""
+        ...
+
+    async def mark_failed(self, job_id: str, error: str, retry: bool = False) -> Optional[TranscriptionJob]:
+        """Record a failed attempt, re-queueing the job when retry is True."""
+        ...
+
+    async def release_job(self, job_id: str, error: str) -> Optional[TranscriptionJob]:
+        """Re-queue a job that could not be attempted, without spending one of its attempts."""
+        ...
+
+    async def requeue_stale_jobs(self, started_before: datetime) -> int:
+        """Re-queue running jobs whose worker started them before the given time."""
+        ...
+
+
+class AsyncTranscriptionCacheRepository(Protocol):
+    """Interface for transcription cache operations that do not block the event loop."""
+
+    async def get_transcriptions(self, cache_keys: List[str]) -> Dict[str, str]:
+        """Get the cached transcripts of the given keys, by key; missing keys are left out."""
+        ...
+
+    async def store_transcriptions(
+        self,
+        llm_provider: str,
+        transcriptions: Dict[str, str],
+        recording_id: Optional[str] = None
+    ) -> None:
+        """Cache transcripts of a recording's audio by key, keeping entries that already exist."""
+        ...
+
+    async def delete_recording_entries(self, recording_id: str) -> List[str]:
+        """Delete the entries cached from a recording's audio, returning their keys."""
         ...
 
-    def delete_recording(self, recording_id: str) -> bool:
-        """Delete a recording and its chunks."""
+    async def delete_entries_before(self, created_before: datetime) -> int:
+        """Delete entries cached before the given time."""
         ...
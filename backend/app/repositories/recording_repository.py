@@ -1,7 +1,23 @@
 """MySQL implementation of RecordingRepository."""
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from app.models import Recording, RecordingChunk, RecordingStatus
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Query, Session
+from app.models import (
+    ChunkUpload,
+    ChunkUploadResult,
+    ChunkManifestEntry,
+    Recording,
+    RecordingChunk,
+    RecordingStatus,
+    RecordingSummary,
+    TranscriptionJob,
+)
+from .exceptions import RecordingNotFoundError, RecordingAccessDeniedError
+
+# Transcript characters returned by list_recording_summaries
+TRANSCRIPT_PREVIEW_LENGTH = 200
 
 
 class MySQLRecordingRepository:
@@ -22,33 +38,335 @@ class MySQLRecordingRepository:
         """Get recording by ID."""
         return self.db.query(Recording).filter(Recording.id == recording_id).first()
 
-    def list_recordings(self, user_id: str) -> List[Recording]:
-        """List all recordings for a user."""
-        return (
-            self.db.query(Recording)
-            .filter(Recording.user_id == user_id)
-            .order_by(Recording.created_at.desc())
-            .all()
-        )
+    def list_recordings(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Recording]:
+        """
+        List a user's recordings, newest first.
+
+        Pages are read by keyset on (created_at, id), which the composite
+        (user_id, created_at, id) index serves directly, so a page costs the
+        same however much history the user has.
+
+        Args:
+            user_id: ID of the user
+            limit: Maximum number of recordings, or None for all
+            after: (created_at, id) of the last recording of the previous page
+
+        Returns:
+            List of recordings
+        """
+        query = self.db.query(Recording).filter(Recording.user_id == user_id)
+        return self._keyset_page(query, limit, after).all()
+
+    def list_recording_summaries(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        preview_length: int = TRANSCRIPT_PREVIEW_LENGTH
+    ) -> List[RecordingSummary]:
+        """
+        List summaries of a user's recordings, newest first.
+
+        Only metadata and aggregate columns are selected. The transcript is
+        cut to a preview in SQL and notes are reduced to a flag, so neither
+        Text column is sent in full. Paging is the same as list_recordings.
+
+        Args:
+            user_id: ID of the user
+            limit: Maximum number of recordings, or None for all
+            after: (created_at, id) of the last recording of the previous page
+            preview_length: Maximum number of transcript characters to return
+
+        Returns:
+            List of recording summaries
+        """
+        query = self.db.query(
+            Recording.id,
+            Recording.user_id,
+            Recording.status,
+            Recording.created_at,
+            Recording.updated_at,
+            # One character more than the preview tells whether the text was cut
+            func.substr(Recording.transcription_text, 1, preview_length + 1),
+            and_(Recording.notes.isnot(None), Recording.notes != ""),
+            Recording.chunk_count,
+            Recording.total_duration_seconds,
+            Recording.total_bytes,
+            Recording.last_chunk_at
+        ).filter(Recording.user_id == user_id)
+
+        summaries = []
+        for row in self._keyset_page(query, limit, after):
+            recording_id, owner_id, status, created_at, updated_at, preview, has_notes, *aggregates = row
+            summaries.append(RecordingSummary(
+                recording_id,
+                owner_id,
+                status,
+                created_at,
+                updated_at,
+                preview[:preview_length] if preview is not None else None,
+                preview is not None and len(preview) > preview_length,
+                bool(has_notes),
+                *aggregates
+            ))
+        return summaries
+
+    @staticmethod
+    def _keyset_page(query: Query, limit: Optional[int], after: Optional[Tuple[datetime, str]]) -> Query:
+        """Restrict a recordings query to one newest-first page after (created_at, id)."""
+        if after:
+            created_at, recording_id = after
+            query = query.filter(
+                or_(
+                    Recording.created_at < created_at,
+                    and_(Recording.created_at == created_at, Recording.id < recording_id)
+                )
+            )
+
+        query = query.order_by(Recording.created_at.desc(), Recording.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query
 
     def add_chunk(
         self,
         recording_id: str,
         chunk_index: int,
         audio_blob_path: str,
-        duration_seconds: Optional[float] = None
-    ) -> RecordingChunk:
-        """Add an audio chunk to a recording."""
-        chunk = RecordingChunk(
-            recording_id=recording_id,
-            chunk_index=chunk_index,
-            audio_blob_path=audio_blob_path,
-            duration_seconds=duration_seconds
+        duration_seconds: Optional[float] = None,
+        size_bytes: Optional[int] = None,
+        content_hash: Optional[str] = None
+    ) -> Tuple[RecordingChunk, ChunkUploadResult]:
+        """
+        Add an audio chunk to a recording, or update the chunk at its index.
+
+        See add_chunks, which this calls with a single chunk.
+
+        Args:
+            recording_id: ID of the recording
+            chunk_index: Index of the chunk
+            audio_blob_path: Path to the stored chunk
+            duration_seconds: Duration of the chunk in seconds
+            size_bytes: Size of the stored chunk in bytes
+            content_hash: SHA-256 of the chunk, hex encoded
+
+        Returns:
+            The stored chunk and whether it was created, replaced or unchanged
+        """
+        upload = ChunkUpload(chunk_index, audio_blob_path, duration_seconds, size_bytes, content_hash)
+        return self.add_chunks(recording_id, [upload])[0]
+
+    def add_chunks(
+        self,
+        recording_id: str,
+        uploads: List[ChunkUpload]
+    ) -> List[Tuple[RecordingChunk, ChunkUploadResult]]:
+        """
+        Add audio chunks to a recording, or update the chunks at their indexes.
+
+        The chunks already stored at the indexes are looked up in one query.
+        A chunk with the same content hash is left untouched, a different one
+        replaces the stored row, dropping the partial transcript of the whole
+        window or segment it was transcribed with, and the rest are inserted
+        together, with the recording's aggregates adjusted by one UPDATE and
+        everything committed at once. A concurrent insert of one of the
+        indexes is caught by the unique key and the batch is retried once as
+        replacements. Chunks are returned detached, so reading them costs no
+        further round trips.
+
+        Args:
+            recording_id: ID of the recording
+            uploads: Chunks written to storage, with distinct indexes
+
+        Returns:
+            Each stored chunk, in upload order, with whether it was created,
+            replaced or unchanged
+        """
+        return self._store_chunks(recording_id, uploads, retry=True)
+
+    def _store_chunks(
+        self,
+        recording_id: str,
+        uploads: List[ChunkUpload],
+        retry: bool
+    ) -> List[Tuple[RecordingChunk, ChunkUploadResult]]:
+        uploaded_at = datetime.utcnow()
+        stored = self._get_chunks_at(recording_id, [upload.chunk_index for upload in uploads])
+        results = []
+        created, duration_delta, size_delta = 0, 0.0, 0
+        transcribed_replacements: Dict[int, str] = {}
+
+        for upload in uploads:
+            chunk = stored.get(upload.chunk_index)
+            if chunk is None:
+                chunk = RecordingChunk(recording_id=recording_id, uploaded_at=uploaded_at, **upload._asdict())
+                self.db.add(chunk)
+                created += 1
+                duration_delta += upload.duration_seconds or 0.0
+                size_delta += upload.size_bytes or 0
+                results.append((chunk, ChunkUploadResult.CREATED))
+            elif upload.content_hash is not None and chunk.content_hash == upload.content_hash:
+                results.append((chunk, ChunkUploadResult.UNCHANGED))
+            else:
+                duration_delta += (upload.duration_seconds or 0.0) - (chunk.duration_seconds or 0.0)
+                size_delta += (upload.size_bytes or 0) - (chunk.size_bytes or 0)
+                for name, value in upload._asdict().items():
+                    setattr(chunk, name, value)
+                chunk.uploaded_at = uploaded_at
+                # The partial transcript was made from the old audio
+                if chunk.transcription_text is not None:
+                    transcribed_replacements[chunk.chunk_index] = chunk.transcription_text
+                chunk.transcription_text = None
+                results.append((chunk, ChunkUploadResult.REPLACED))
+
+        if all(result == ChunkUploadResult.UNCHANGED for _, result in results):
+            return results
+
+        try:
+            self.db.flush()
+        except IntegrityError:
+            self.db.rollback()
+            if not retry:
+                raise
+            return self._store_chunks(recording_id, uploads, retry=False)
+
+        self._bump_aggregates(recording_id, created, duration_delta, size_delta, uploaded_at)
+        if transcribed_replacements:
+            self._clear_transcript_groups(recording_id, transcribed_replacements)
+        for chunk, _ in results:
+            self.db.expunge(chunk)
+        self.db.commit()
+        return results
+
+    def _clear_transcript_groups(self, recording_id: str, replaced: Dict[int, str]) -> None:
+        """
+        Drop the partial transcripts of the groups that replaced chunks were transcribed in.
+
+        store_chunk_transcription puts a group's transcript on its first chunk
+        and "" on the others, so a group is its first chunk followed by the
+        consecutive chunks holding "". A group whose transcript was itself
+        empty is taken for part of the one before it, which is then
+        transcribed again too rather than lost.
+
+        Args:
+            recording_id: ID of the recording
+            replaced: Index of each replaced chunk, with the transcript it held
+        """
+        texts = dict(
+            self.db.query(RecordingChunk.chunk_index, RecordingChunk.transcription_text)
+            .filter(RecordingChunk.recording_id == recording_id)
+        )
+        cleared = set()
+        for chunk_index, old_text in replaced.items():
+            first = chunk_index
+            if old_text == "":
+                # Not the first chunk of its group: walk back to the one holding the transcript
+                first -= 1
+                while texts.get(first) == "":
+                    first -= 1
+            last = chunk_index
+            while texts.get(last + 1) == "":
+                last += 1
+            cleared.update(range(first, last + 1))
+
+        self.db.query(RecordingChunk).filter(
+            RecordingChunk.recording_id == recording_id,
+            RecordingChunk.chunk_index.in_(cleared),
+            RecordingChunk.transcription_text.isnot(None)
+        ).update({RecordingChunk.transcription_text: None}, synchronize_session="evaluate")
+
+    def _get_chunks_at(self, recording_id: str, chunk_indexes: List[int]) -> Dict[int, RecordingChunk]:
+        """Get the chunks stored at the given indexes, keyed by index."""
+        chunks = (
+            self.db.query(RecordingChunk)
+            .filter(RecordingChunk.recording_id == recording_id, RecordingChunk.chunk_index.in_(chunk_indexes))
+            .populate_existing()
+        )
+        return {chunk.chunk_index: chunk for chunk in chunks}
+
+    def _bump_aggregates(
+        self,
+        recording_id: str,
+        chunk_delta: int,
+        duration_delta: float,
+        size_delta: int,
+        last_chunk_at: datetime
+    ) -> None:
+        """Adjust a recording's chunk aggregates in one UPDATE, so concurrent uploads cannot lose an increment."""
+        self.db.query(Recording).filter(Recording.id == recording_id).update(
+            {
+                Recording.chunk_count: Recording.chunk_count + chunk_delta,
+                Recording.total_duration_seconds: Recording.total_duration_seconds + duration_delta,
+                Recording.total_bytes: Recording.total_bytes + size_delta,
+                Recording.last_chunk_at: last_chunk_at,
+            },
+            synchronize_session="evaluate"
+        )
+
+    def get_chunks_missing_size(self, recording_ids: List[str]) -> List[RecordingChunk]:
+        """Get the chunks of the given recordings whose size was never recorded."""
+        return (
+            self.db.query(RecordingChunk)
+            .filter(RecordingChunk.recording_id.in_(recording_ids), RecordingChunk.size_bytes.is_(None))
+            .all()
+        )
+
+    def list_recording_ids(self, after_id: Optional[str] = None, limit: int = 500) -> List[str]:
+        """List recording IDs in ID order, one batch after after_id."""
+        query = self.db.query(Recording.id)
+        if after_id is not None:
+            query = query.filter(Recording.id > after_id)
+        return [recording_id for recording_id, in query.order_by(Recording.id).limit(limit)]
+
+    def recompute_aggregates(self, recording_ids: List[str]) -> None:
+        """
+        Recompute the chunk aggregates of the given recordings from their chunks.
+
+        Repairs recordings created before the aggregates existed or whose
+        chunks were changed outside add_chunk. Pending changes, such as sizes
+        filled in on chunks, are flushed first and committed with the update.
+
+        Args:
+            recording_ids: IDs of the recordings to repair
+        """
+        def chunk_aggregate(expression):
+            return (
+                select(expression)
+                .where(RecordingChunk.recording_id == Recording.id)
+                .correlate(Recording)
+                .scalar_subquery()
+            )
+
+        self.db.flush()
+        self.db.query(Recording).filter(Recording.id.in_(recording_ids)).update(
+            {
+                Recording.chunk_count: chunk_aggregate(func.count(RecordingChunk.id)),
+                Recording.total_duration_seconds: chunk_aggregate(
+                    func.coalesce(func.sum(RecordingChunk.duration_seconds), 0.0)
+                ),
+                Recording.total_bytes: chunk_aggregate(func.coalesce(func.sum(RecordingChunk.size_bytes), 0)),
+                Recording.last_chunk_at: chunk_aggregate(func.max(RecordingChunk.uploaded_at)),
+                # A repair is not a change to the recording
+                Recording.updated_at: Recording.updated_at,
+            },
+            synchronize_session=False
         )
-        self.db.add(chunk)
         self.db.commit()
-        self.db.refresh(chunk)
-        return chunk
+        self.db.expire_all()
+
+    def get_chunk_manifest(self, recording_id: str) -> List[ChunkManifestEntry]:
+        """List the index, size and hash of each stored chunk, ordered by chunk_index."""
+        rows = (
+            self.db.query(RecordingChunk.chunk_index, RecordingChunk.size_bytes, RecordingChunk.content_hash)
+            .filter(RecordingChunk.recording_id == recording_id)
+            .order_by(RecordingChunk.chunk_index)
+        )
+        return [ChunkManifestEntry(*row) for row in rows]
 
     def get_chunks(self, recording_id: str) -> List[RecordingChunk]:
         """Get all chunks for a recording, ordered by chunk_index."""
@@ -59,64 +377,168 @@ class MySQLRecordingRepository:
             .all()
         )
 
-    def mark_paused(self, recording_id: str) -> Optional[Recording]:
-        """Mark a recording as paused."""
-        recording = self.get_recording(recording_id)
-        if not recording:
+    def get_chunks_in_range(
+        self,
+        recording_id: str,
+        first_chunk_index: int,
+        last_chunk_index: int
+    ) -> List[RecordingChunk]:
+        """Get the chunks whose index falls in an inclusive range, ordered by chunk_index."""
+        return (
+            self.db.query(RecordingChunk)
+            .filter(
+                RecordingChunk.recording_id == recording_id,
+                RecordingChunk.chunk_index >= first_chunk_index,
+                RecordingChunk.chunk_index <= last_chunk_index
+            )
+            .order_by(RecordingChunk.chunk_index)
+            .all()
+        )
+
+    def store_chunk_transcription(self, chunk_ids: List[str], transcription: str) -> None:
+        """Store a partial transcript on the first chunk and mark the rest as covered."""
+        if not chunk_ids:
+            return
+
+        self.db.query(RecordingChunk).filter(RecordingChunk.id == chunk_ids[0]).update(
+            {RecordingChunk.transcription_text: transcription}, synchronize_session="evaluate"
+        )
+        if len(chunk_ids) > 1:
+            self.db.query(RecordingChunk).filter(RecordingChunk.id.in_(chunk_ids[1:])).update(
+                {RecordingChunk.transcription_text: ""}, synchronize_session="evaluate"
+            )
+        self.db.commit()
+
+    def _update_recording(
+        self,
+        recording_id: str,
+        values: Dict[Any, Any],
+        user_id: Optional[str] = None
+    ) -> Optional[Recording]:
+        """
+        Update one recording in a single UPDATE, scoped to its owner when user_id is given.
+
+        Where the database supports UPDATE ... RETURNING the updated row comes
+        back with the statement; otherwise (MySQL) it is read back by ID. The
+        ownership check adds a read only when nothing was updated. The
+        recording is returned detached, so the commit does not expire it and
+        reading it costs no further round trips.
+
+        Args:
+            recording_id: ID of the recording
+            values: Columns to set
+            user_id: ID of the user who must own the recording, or None
+
+        Returns:
+            Updated recording, or None if it does not exist and user_id is None
+
+        Raises:
+            RecordingNotFoundError: If user_id is given and the recording does not exist
+            RecordingAccessDeniedError: If user_id is given and the recording belongs to another user
+        """
+        statement = update(Recording).where(Recording.id == recording_id).values(values)
+        if user_id is not None:
+            statement = statement.where(Recording.user_id == user_id)
+
+        if self.db.get_bind().dialect.update_returning:
+            recording = self.db.scalars(
+                statement.returning(Recording),
+                execution_options={"populate_existing": True}
+            ).first()
+        else:
+            self.db.execute(statement, execution_options={"synchronize_session": False})
+            recording = (
+                self.db.query(Recording)
+                .filter(Recording.id == recording_id)
+                .populate_existing()
+                .first()
+            )
+            if recording is not None and user_id is not None and recording.user_id != user_id:
+                recording = None
+
+        if recording is None:
+            if user_id is not None:
+                self._raise_for_owner(recording_id)
             return None
 
-        recording.status = RecordingStatus.PAUSED
+        self.db.expunge(recording)
         self.db.commit()
-        self.db.refresh(recording)
         return recording
 
+    def _raise_for_owner(self, recording_id: str) -> None:
+        """Raise the error explaining why an owner-scoped statement matched no row."""
+        if self.db.query(Recording.id).filter(Recording.id == recording_id).first() is None:
+            raise RecordingNotFoundError(recording_id)
+        raise RecordingAccessDeniedError(recording_id)
+
+    def mark_paused(self, recording_id: str, user_id: Optional[str] = None) -> Optional[Recording]:
+        """Mark a recording as paused, scoped to its owner when user_id is given."""
+        return self._update_recording(recording_id, {Recording.status: RecordingStatus.PAUSED}, user_id)
+
     def mark_ended(
         self,
         recording_id: str,
-        full_audio_path: str,
+        full_audio_path: Optional[str] = None,
         transcription: Optional[str] = None
     ) -> Optional[Recording]:
         """Mark a recording as ended and store the assembled audio path and transcription."""
-        recording = self.get_recording(recording_id)
-        if not recording:
-            return None
-
-        recording.status = RecordingStatus.ENDED
-        recording.audio_file_path = full_audio_path
+        values = {Recording.status: RecordingStatus.ENDED}
+        if full_audio_path:
+            values[Recording.audio_file_path] = full_audio_path
         if transcription:
-            recording.transcription_text = transcription
-        self.db.commit()
-        self.db.refresh(recording)
-        return recording
+            values[Recording.transcription_text] = transcription
+        return self._update_recording(recording_id, values)
+
+    def mark_transcribing(self, recording_id: str) -> Optional[Recording]:
+        """Mark a recording as waiting for or undergoing transcription."""
+        return self._update_recording(recording_id, {Recording.status: RecordingStatus.TRANSCRIBING})
+
+    def mark_failed(self, recording_id: str) -> Optional[Recording]:
+        """Mark a recording whose transcription could not be completed."""
+        return self._update_recording(recording_id, {Recording.status: RecordingStatus.FAILED})
 
     def update_transcription(self, recording_id: str, transcription: str) -> Optional[Recording]:
         """Update the transcription text for a recording."""
-        recording = self.get_recording(recording_id)
-        if not recording:
-            return None
+        return self._update_recording(recording_id, {Recording.transcription_text: transcription})
 
-        recording.transcription_text = transcription
-        self.db.commit()
-        self.db.refresh(recording)
-        return recording
+    def add_notes(self, recording_id: str, notes: str, user_id: Optional[str] = None) -> Optional[Recording]:
+        """Add or update notes for a recording, scoped to its owner when user_id is given."""
+        return self._update_recording(recording_id, {Recording.notes: notes}, user_id)
 
-    def add_notes(self, recording_id: str, notes: str) -> Optional[Recording]:
-        """Add or update notes for a recording."""
-        recording = self.get_recording(recording_id)
-        if not recording:
-            return None
+    def delete_recording(self, recording_id: str, user_id: Optional[str] = None) -> bool:
+        """
+        Delete a recording, its chunks and its transcription jobs.
 
-        recording.notes = notes
-        self.db.commit()
-        self.db.refresh(recording)
-        return recording
+        Chunks and jobs are deleted through a subquery on the owned recording,
+        so the ownership check is part of each DELETE and nothing is loaded.
 
-    def delete_recording(self, recording_id: str) -> bool:
-        """Delete a recording and its chunks."""
-        recording = self.get_recording(recording_id)
-        if not recording:
-            return False
+        Args:
+            recording_id: ID of the recording
+            user_id: ID of the user who must own the recording, or None
 
-        self.db.delete(recording)
+        Returns:
+            True if the recording was deleted, False if it does not exist and user_id is None
+
+        Raises:
+            RecordingNotFoundError: If user_id is given and the recording does not exist
+            RecordingAccessDeniedError: If user_id is given and the recording belongs to another user
+        """
+        criteria = [Recording.id == recording_id]
+        if user_id is not None:
+            criteria.append(Recording.user_id == user_id)
+        owned = select(Recording.id).where(*criteria)
+
+        self.db.query(RecordingChunk).filter(RecordingChunk.recording_id.in_(owned)).delete(
+            synchronize_session=False
+        )
+        self.db.query(TranscriptionJob).filter(TranscriptionJob.recording_id.in_(owned)).delete(
+            synchronize_session=False
+        )
+        deleted = self.db.query(Recording).filter(*criteria).delete(synchronize_session=False)
         self.db.commit()
+
+        if not deleted:
+            if user_id is not None:
+                self._raise_for_owner(recording_id)
+            return False
         return True
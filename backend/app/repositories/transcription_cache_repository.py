@@ -0,0 +1,79 @@
+"""MySQL implementation of TranscriptionCacheRepository."""
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models import TranscriptionCacheEntry
+
+
+class MySQLTranscriptionCacheRepository:
+    """MySQL implementation of the TranscriptionCacheRepository interface."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_transcriptions(self, cache_keys: List[str]) -> Dict[str, str]:
+        """Get the cached transcripts of the given keys, by key; missing keys are left out."""
+        if not cache_keys:
+            return {}
+        rows = (
+            self.db.query(TranscriptionCacheEntry.cache_key, TranscriptionCacheEntry.transcription_text)
+            .filter(TranscriptionCacheEntry.cache_key.in_(cache_keys))
+        )
+        return {cache_key: transcription for cache_key, transcription in rows}
+
+    def store_transcriptions(
+        self,
+        llm_provider: str,
+        transcriptions: Dict[str, str],
+        recording_id: Optional[str] = None
+    ) -> None:
+        """Cache transcripts of a recording's audio by key, keeping entries that already exist."""
+        if not transcriptions:
+            return
+
+        existing = {
+            cache_key for cache_key, in
+            self.db.query(TranscriptionCacheEntry.cache_key)
+            .filter(TranscriptionCacheEntry.cache_key.in_(list(transcriptions)))
+        }
+        entries = [
+            TranscriptionCacheEntry(
+                cache_key=cache_key, llm_provider=llm_provider, transcription_text=text, recording_id=recording_id
+            )
+            for cache_key, text in transcriptions.items()
+            if cache_key not in existing
+        ]
+        if not entries:
+            return
+
+        self.db.add_all(entries)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # Another worker cached the same audio first, which is just as good
+            self.db.rollback()
+
+    def delete_recording_entries(self, recording_id: str) -> List[str]:
+        """Delete the entries cached from a recording's audio, returning their keys."""
+        cache_keys = [
+            cache_key for cache_key, in
+            self.db.query(TranscriptionCacheEntry.cache_key)
+            .filter(TranscriptionCacheEntry.recording_id == recording_id)
+        ]
+        if cache_keys:
+            self.db.query(TranscriptionCacheEntry).filter(
+                TranscriptionCacheEntry.cache_key.in_(cache_keys)
+            ).delete(synchronize_session=False)
+            self.db.commit()
+        return cache_keys
+
+    def delete_entries_before(self, created_before: datetime) -> int:
+        """Delete entries cached before the given time."""
+        deleted = (
+            self.db.query(TranscriptionCacheEntry)
+            .filter(TranscriptionCacheEntry.created_at < created_before)
+            .delete(synchronize_session=False)
+        )
+        self.db.commit()
+        return deleted
@@ -0,0 +1,207 @@
+"""MySQL implementation of TranscriptionJobRepository."""
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import case, exists, func, or_, select
+from sqlalchemy.orm import Session, aliased
+from app.core.config import settings
+from app.models import Recording, TranscriptionJob, TranscriptionJobStatus
+
+
+class MySQLTranscriptionJobRepository:
+    """MySQL implementation of the TranscriptionJobRepository interface."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_job(
+        self,
+        recording_id: str,
+        first_chunk_index: Optional[int] = None,
+        last_chunk_index: Optional[int] = None
+    ) -> TranscriptionJob:
+        """Enqueue a transcription job for a recording or for a window of its chunks."""
+        job = TranscriptionJob(
+            recording_id=recording_id,
+            status=TranscriptionJobStatus.QUEUED,
+            first_chunk_index=first_chunk_index,
+            last_chunk_index=last_chunk_index
+        )
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[TranscriptionJob]:
+        """Get job by ID."""
+        return self.db.query(TranscriptionJob).filter(TranscriptionJob.id == job_id).first()
+
+    def get_active_job(self, recording_id: str) -> Optional[TranscriptionJob]:
+        """Get the queued or running full-recording job for a recording, if any."""
+        return (
+            self.db.query(TranscriptionJob)
+            .filter(
+                TranscriptionJob.recording_id == recording_id,
+                TranscriptionJob.first_chunk_index.is_(None),
+                TranscriptionJob.status.in_(
+                    [TranscriptionJobStatus.QUEUED, TranscriptionJobStatus.RUNNING]
+                )
+            )
+            .order_by(TranscriptionJob.created_at.desc())
+            .first()
+        )
+
+    def claim_next_job(self) -> Optional[TranscriptionJob]:
+        """
+        Atomically claim the next queued job and mark it as running.
+
+        Jobs are claimed fairly between users: first those of the users with
+        the fewest running jobs, then the smallest (chunk window jobs before
+        full recordings, full recordings by total_bytes), then the oldest.
+        One user's long recordings therefore cannot keep everyone else's
+        short notes waiting in the queue. Jobs queued for longer than
+        TRANSCRIPTION_JOB_MAX_WAIT_SECONDS go before all others, oldest first,
+        so a large recording is not starved by a steady flow of small ones.
+
+        The claim is a conditional UPDATE on the queued status, so when several
+        workers race for the same row only one of them sees a matched row.
+        Full-recording jobs are held back while chunk window jobs for the same
+        recording are still pending, so their partial transcripts can be reused.
+
+        Returns:
+            The claimed job, or None if the queue is empty
+        """
+        segment_job = aliased(TranscriptionJob)
+        pending_segments = exists().where(
+            segment_job.recording_id == TranscriptionJob.recording_id,
+            segment_job.first_chunk_index.isnot(None),
+            segment_job.status.in_([TranscriptionJobStatus.QUEUED, TranscriptionJobStatus.RUNNING])
+        )
+        running_job, running_recording = aliased(TranscriptionJob), aliased(Recording)
+        owner_running_jobs = (
+            select(func.count(running_job.id))
+            .join(running_recording, running_recording.id == running_job.recording_id)
+            .where(
+                running_recording.user_id == Recording.user_id,
+                running_job.status == TranscriptionJobStatus.RUNNING
+            )
+            .scalar_subquery()
+        )
+        job_size = case((TranscriptionJob.first_chunk_index.isnot(None), 0), else_=Recording.total_bytes)
+        overdue = TranscriptionJob.created_at < datetime.utcnow() - timedelta(
+            seconds=settings.TRANSCRIPTION_JOB_MAX_WAIT_SECONDS
+        )
+
+        def unless_overdue(key):
+            return case((overdue, 0), else_=key)
+
+        while True:
+            job_id = (
+                self.db.query(TranscriptionJob.id)
+                .outerjoin(Recording, Recording.id == TranscriptionJob.recording_id)
+                .filter(
+                    TranscriptionJob.status == TranscriptionJobStatus.QUEUED,
+                    or_(TranscriptionJob.first_chunk_index.isnot(None), ~pending_segments)
+                )
+                .order_by(
+                    unless_overdue(1),
+                    unless_overdue(owner_running_jobs),
+                    unless_overdue(job_size),
+                    TranscriptionJob.created_at
+                )
+                .limit(1)
+                .scalar()
+            )
+            if job_id is None:
+                return None
+
+            now = datetime.utcnow()
+            claimed = (
+                self.db.query(TranscriptionJob)
+                .filter(
+                    TranscriptionJob.id == job_id,
+                    TranscriptionJob.status == TranscriptionJobStatus.QUEUED
+                )
+                .update(
+                    {
+                        TranscriptionJob.status: TranscriptionJobStatus.RUNNING,
+                        TranscriptionJob.attempts: TranscriptionJob.attempts + 1,
+                        TranscriptionJob.started_at: now,
+                        TranscriptionJob.updated_at: now,
+                    },
+                    synchronize_session=False
+                )
+            )
+            self.db.commit()
+
+            if claimed:
+                # The UPDATE bypassed the identity map; reload the claimed row
+                return (
+                    self.db.query(TranscriptionJob)
+                    .populate_existing()
+                    .filter(TranscriptionJob.id == job_id)
+                    .first()
+                )
+
+    def mark_completed(self, job_id: str) -> Optional[TranscriptionJob]:
+        """Mark a job as completed."""
+        job = self.get_job(job_id)
+        if not job:
+            return None
+
+        job.status = TranscriptionJobStatus.COMPLETED
+        job.error = None
+        job.finished_at = datetime.utcnow()
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def mark_failed(self, job_id: str, error: str, retry: bool = False) -> Optional[TranscriptionJob]:
+        """Record a failed attempt, re-queueing the job when retry is True."""
+        job = self.get_job(job_id)
+        if not job:
+            return None
+
+        job.error = error
+        if retry:
+            job.status = TranscriptionJobStatus.QUEUED
+            job.started_at = None
+        else:
+            job.status = TranscriptionJobStatus.FAILED
+            job.finished_at = datetime.utcnow()
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def release_job(self, job_id: str, error: str) -> Optional[TranscriptionJob]:
+        """Re-queue a job that could not be attempted, without spending one of its attempts."""
+        job = self.get_job(job_id)
+        if not job:
+            return None
+
+        job.error = error
+        job.status = TranscriptionJobStatus.QUEUED
+        job.started_at = None
+        job.attempts = max(job.attempts - 1, 0)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def requeue_stale_jobs(self, started_before: datetime) -> int:
+        """Re-queue running jobs whose worker started them before the given time."""
+        requeued = (
+            self.db.query(TranscriptionJob)
+            .filter(
+                TranscriptionJob.status == TranscriptionJobStatus.RUNNING,
+                TranscriptionJob.started_at < started_before
+            )
+            .update(
+                {
+                    TranscriptionJob.status: TranscriptionJobStatus.QUEUED,
+                    TranscriptionJob.started_at: None,
+                    TranscriptionJob.updated_at: datetime.utcnow(),
+                },
+                synchronize_session=False
+            )
+        )
+        self.db.commit()
+        return requeued
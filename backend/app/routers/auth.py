@@ -1,13 +1,16 @@
 """Authentication routes for Google OAuth2."""
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import RedirectResponse
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from authlib.integrations.starlette_client import OAuth
-from sqlalchemy.orm import Session
-from app.core import get_db, settings, create_access_token
-from app.repositories import MySQLUserRepository
+from app.core import get_db, DatabaseSession, settings, create_access_token, revoke_access_token
+from app.repositories import AsyncMySQLUserRepository
+from app.services import user_cache
 from starlette.requests import Request
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
+optional_security = HTTPBearer(auto_error=False)
 
 # Configure OAuth
 oauth = OAuth()
@@ -33,7 +36,7 @@ async def google_login(request: Request):
 
 
 @router.get("/google/callback")
-async def google_callback(request: Request, db: Session = Depends(get_db)):
+async def google_callback(request: Request, db: DatabaseSession = Depends(get_db)):
     """
     Handle Google OAuth2 callback.
 
@@ -63,12 +66,12 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
         avatar_url = user_info.get("picture")
 
         # Get or create user in database
-        user_repo = MySQLUserRepository(db)
-        user = user_repo.get_user_by_google_id(google_id)
+        user_repo = AsyncMySQLUserRepository(db)
+        user = await user_repo.get_user_by_google_id(google_id)
 
         if not user:
             # Create new user
-            user = user_repo.create_user(
+            user = await user_repo.create_user(
                 google_id=google_id,
                 email=email,
                 display_name=display_name,
@@ -76,11 +79,12 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
             )
         else:
             # Update existing user info
-            user = user_repo.update_user(
+            user = await user_repo.update_user(
                 user_id=user.id,
                 display_name=display_name,
                 avatar_url=avatar_url
             )
+            await user_cache.invalidate(user.id)
 
         # Create JWT token
         access_token = create_access_token(
@@ -102,11 +106,23 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
 
 
 @router.post("/logout")
-async def logout():
+async def logout(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
     """
-    Logout endpoint (stateless, just for API completeness).
+    Logout endpoint.
+
+    Tokens are stateless; the presented bearer token, if valid, is revoked
+    so it is rejected until it expires, by every worker when
+    TOKEN_REVOCATION_BACKEND is "redis".
+
+    Args:
+        credentials: Optional HTTP authorization credentials with bearer token
 
     Returns:
         Success message
     """
+    if credentials:
+        await revoke_access_token(credentials.credentials)
+
     return {"message": "Logged out successfully"}
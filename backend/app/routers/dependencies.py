@@ -1,17 +1,19 @@
 """Dependency functions for API routes."""
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from fastapi import Depends, HTTPException, Query, Request, WebSocket, WebSocketException, status
+from starlette.requests import HTTPConnection
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.core import get_db, decode_access_token
-from app.repositories import MySQLUserRepository
+from app.core import get_db, DatabaseSession, decode_access_token
+from app.repositories import AsyncMySQLUserRepository
 from app.models import User
+from app.services import user_cache
 
 security = HTTPBearer()
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: DatabaseSession = Depends(get_db)
 ) -> User:
     """
     Get the current authenticated user from JWT token.
@@ -26,32 +28,113 @@ async def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found
     """
-    token = credentials.credentials
-    payload = decode_access_token(token)
-
-    if not payload:
+    try:
+        return await _authenticate(credentials.credentials, db)
+    except _AuthenticationError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
+            detail=str(e),
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_id = payload.get("sub")
-    if not user_id:
+
+async def get_websocket_user(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+    db: DatabaseSession = Depends(get_db)
+) -> User:
+    """
+    Get the authenticated user of a WebSocket connection.
+
+    Browsers cannot set headers on a WebSocket handshake, so the JWT may be
+    passed in the token query parameter instead of a bearer Authorization
+    header. The connection is authenticated once, at the handshake.
+
+    Args:
+        websocket: Connecting WebSocket
+        token: JWT from the query string
+        db: Database session
+
+    Returns:
+        Current authenticated user
+
+    Raises:
+        WebSocketException: If the token is missing or invalid or the user not found
+    """
+    token = token or _bearer_token(websocket)
+    if not token:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Not authenticated")
+
+    try:
+        return await _authenticate(token, db)
+    except _AuthenticationError as e:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+
+
+async def get_event_stream_user(
+    request: Request,
+    token: Optional[str] = Query(None),
+    db: DatabaseSession = Depends(get_db)
+) -> User:
+    """
+    Get the authenticated user of a Server-Sent Events stream.
+
+    EventSource cannot set headers, so like get_websocket_user this accepts
+    the JWT in the token query parameter as well as a bearer header.
+
+    Args:
+        request: Incoming request
+        token: JWT from the query string
+        db: Database session
+
+    Returns:
+        Current authenticated user
+
+    Raises:
+        HTTPException: If the token is missing or invalid or the user not found
+    """
+    token = token or _bearer_token(request)
+    try:
+        if not token:
+            raise _AuthenticationError("Not authenticated")
+        return await _authenticate(token, db)
+    except _AuthenticationError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
+            detail=str(e),
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_repo = MySQLUserRepository(db)
-    user = user_repo.get_user_by_id(user_id)
+
+def _bearer_token(connection: HTTPConnection) -> Optional[str]:
+    """Get the token of a bearer Authorization header, if any."""
+    scheme, _, credentials = connection.headers.get("authorization", "").partition(" ")
+    return credentials if scheme.lower() == "bearer" and credentials else None
+
+
+class _AuthenticationError(Exception):
+    """Raised when a token does not identify a user."""
+
+
+async def _authenticate(token: str, db: DatabaseSession) -> User:
+    """Resolve a JWT to its user, from the user cache when possible."""
+    payload = await decode_access_token(token)
+    if not payload:
+        raise _AuthenticationError("Invalid authentication credentials")
+
+    user_id = payload.get("sub")
+    if not user_id:
+        raise _AuthenticationError("Invalid token payload")
+
+    user = await user_cache.get(user_id)
+    if user:
+        return user
+
+    user_repo = AsyncMySQLUserRepository(db)
+    user = await user_repo.get_user_by_id(user_id)
 
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _AuthenticationError("User not found")
 
+    await user_cache.set(user)
     return user
@@ -1,15 +1,56 @@
 """Recording management routes."""
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
+import json
+from typing import AsyncIterator, List, Optional
+from fastapi import (
+    APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Header, Query, Request, Response,
+    WebSocket, WebSocketException,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from app.core import get_db
-from app.models import User, Recording
-from app.services import RecordingService
-from app.routers.dependencies import get_current_user
+from app.core import get_db, DatabaseSession, settings
+from app.core.database import close_session
+from app.models import User, Recording, RecordingChunk, ChunkUploadResult
+from app.repositories import RecordingNotFoundError, RecordingAccessDeniedError
+from app.services import (
+    RecordingService,
+    ChunkTooLargeError,
+    InvalidCursorError,
+    MissingChunksError,
+    UploadOffsetMismatchError,
+    recording_events,
+)
+from app.routers.dependencies import get_current_user, get_event_stream_user, get_websocket_user
 
 router = APIRouter(prefix="/recordings", tags=["recordings"])
 
+# Page sizes for GET /recordings
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Content types accepted by the raw chunk upload route
+RAW_CHUNK_CONTENT_TYPES = ("application/octet-stream", "audio/")
+
+
+async def _iter_upload(upload: UploadFile, buffer_size: int) -> AsyncIterator[bytes]:
+    """Read an uploaded file in fixed-size buffers."""
+    while True:
+        data = await upload.read(buffer_size)
+        if not data:
+            break
+        yield data
+
+
+async def _iter_request(request: Request, buffer_size: int) -> AsyncIterator[bytes]:
+    """Coalesce a raw request body into buffers of at least buffer_size bytes."""
+    buffer = bytearray()
+    async for data in request.stream():
+        buffer += data
+        if len(buffer) >= buffer_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
 
 # Pydantic models for request/response
 class RecordingResponse(BaseModel):
@@ -27,9 +68,73 @@ class RecordingResponse(BaseModel):
         from_attributes = True
 
 
+class RecordingSummaryResponse(BaseModel):
+    """Response model for a recording in a list, without its full transcript and notes."""
+    id: str
+    user_id: str
+    status: str
+    created_at: str
+    updated_at: str
+    transcription_preview: Optional[str] = None
+    transcription_truncated: bool = False
+    has_notes: bool = False
+    chunk_count: int = 0
+    total_duration_seconds: float = 0.0
+    total_bytes: int = 0
+    last_chunk_at: Optional[str] = None
+
+
 class RecordingListResponse(BaseModel):
-    """Response model for list of recordings."""
-    recordings: List[RecordingResponse]
+    """Response model for a page of recordings."""
+    recordings: List[RecordingSummaryResponse]
+    next_cursor: Optional[str] = None
+
+
+class ChunkUploadResponse(BaseModel):
+    """Response model for one chunk of a batch upload."""
+    chunk_id: str
+    chunk_index: int
+    status: str
+
+
+class ChunkBatchResponse(BaseModel):
+    """Response model for a batch chunk upload."""
+    chunks: List[ChunkUploadResponse]
+
+
+class ChunkManifestItemResponse(BaseModel):
+    """Response model for a stored chunk in an upload manifest."""
+    chunk_index: int
+    size_bytes: Optional[int] = None
+    content_hash: Optional[str] = None
+
+
+class PartialChunkResponse(BaseModel):
+    """Response model for an interrupted chunk upload."""
+    chunk_index: int
+    received_bytes: int
+
+
+class ChunkManifestResponse(BaseModel):
+    """Response model for the chunks the server holds of a recording."""
+    recording_id: str
+    chunks: List[ChunkManifestItemResponse]
+    partial_chunks: List[PartialChunkResponse]
+    missing_chunk_indexes: List[int]
+    next_chunk_index: int
+
+
+class TranscriptionJobResponse(BaseModel):
+    """Response model for a background transcription job."""
+    id: str
+    recording_id: str
+    status: str
+    attempts: int
+    error: Optional[str] = None
+    created_at: str
+    updated_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
 
 
 class NotesRequest(BaseModel):
@@ -40,7 +145,7 @@ class NotesRequest(BaseModel):
 @router.post("/", response_model=RecordingResponse, status_code=status.HTTP_201_CREATED)
 async def create_recording(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: DatabaseSession = Depends(get_db)
 ):
     """
     Create a new recording session.
@@ -53,7 +158,7 @@ async def create_recording(
         Created recording
     """
     recording_service = RecordingService(db)
-    recording = recording_service.create_recording(current_user.id)
+    recording = await recording_service.create_recording(current_user.id)
 
     return RecordingResponse(
         id=recording.id,
@@ -69,36 +174,89 @@ async def create_recording(
 
 @router.get("/", response_model=RecordingListResponse)
 async def list_recordings(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: DatabaseSession = Depends(get_db)
 ):
     """
-    List all recordings for the authenticated user.
+    List the authenticated user's recordings, newest first, one page at a time.
+
+    Each item is a summary with a transcript preview; the full transcript
+    and notes come from GET /recordings/{recording_id}.
 
     Args:
+        limit: Maximum number of recordings to return
+        cursor: next_cursor from the previous page
         current_user: Authenticated user
         db: Database session
 
     Returns:
-        List of user's recordings
+        A page of the user's recordings and the cursor of the next page
+
+    Raises:
+        HTTPException: If the cursor is invalid
     """
     recording_service = RecordingService(db)
-    recordings = recording_service.list_user_recordings(current_user.id)
+    try:
+        recordings, next_cursor = await recording_service.list_user_recordings(
+            current_user.id, limit=limit, cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
     return RecordingListResponse(
         recordings=[
-            RecordingResponse(
+            RecordingSummaryResponse(
                 id=r.id,
                 user_id=r.user_id,
                 status=r.status.value,
                 created_at=r.created_at.isoformat(),
                 updated_at=r.updated_at.isoformat(),
-                audio_file_path=r.audio_file_path,
-                transcription_text=r.transcription_text,
-                notes=r.notes
+                transcription_preview=r.transcription_preview,
+                transcription_truncated=r.transcription_truncated,
+                has_notes=r.has_notes,
+                chunk_count=r.chunk_count,
+                total_duration_seconds=r.total_duration_seconds,
+                total_bytes=r.total_bytes,
+                last_chunk_at=r.last_chunk_at.isoformat() if r.last_chunk_at else None
             )
             for r in recordings
-        ]
+        ],
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/events")
+async def stream_recording_events(
+    current_user: User = Depends(get_event_stream_user),
+    db: DatabaseSession = Depends(get_db)
+):
+    """
+    Stream the current user's recording changes as Server-Sent Events.
+
+    Replaces polling GET /recordings and GET /recordings/{id}: "status"
+    events report status changes, "partial_transcript" events carry window
+    transcripts as incremental transcription produces them, "transcript"
+    carries the final text and "deleted" reports deletions.
+
+    Args:
+        current_user: User authenticated once, when the stream opens
+        db: Database session
+
+    Returns:
+        An endless text/event-stream response
+    """
+    # The stream queries nothing, so it must not pin a pooled connection while open
+    await close_session(db)
+
+    return StreamingResponse(
+        recording_events.sse_stream(current_user.id, settings.EVENT_STREAM_KEEPALIVE_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
@@ -106,7 +264,7 @@ async def list_recordings(
 async def get_recording(
     recording_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: DatabaseSession = Depends(get_db)
 ):
     """
     Get a specific recording.
@@ -123,7 +281,7 @@ async def get_recording(
         HTTPException: If recording not found or access denied
     """
     recording_service = RecordingService(db)
-    recording = recording_service.get_recording(recording_id)
+    recording = await recording_service.get_recording(recording_id)
 
     if not recording:
         raise HTTPException(
@@ -150,20 +308,83 @@ async def get_recording(
     )
 
 
+@router.get("/{recording_id}/chunks", response_model=ChunkManifestResponse)
+async def get_chunk_manifest(
+    recording_id: str,
+    current_user: User = Depends(get_current_user),
+    db: DatabaseSession = Depends(get_db)
+):
+    """
+    List the chunks the server holds for a recording.
+
+    Clients resuming after a network failure re-send only the chunks in
+    missing_chunk_indexes and continue interrupted uploads from their
+    received_bytes with the Upload-Offset header.
+
+    Args:
+        recording_id: ID of the recording
+        current_user: Authenticated user
+        db: Database session
+
+    Returns:
+        Stored chunks with their sizes and hashes, interrupted uploads and missing indexes
+
+    Raises:
+        HTTPException: If recording not found or access denied
+    """
+    recording_service = RecordingService(db)
+    try:
+        manifest = await recording_service.get_chunk_manifest(recording_id, current_user.id)
+    except RecordingNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recording not found"
+        )
+    except RecordingAccessDeniedError:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+
+    return ChunkManifestResponse(
+        recording_id=recording_id,
+        chunks=[
+            ChunkManifestItemResponse(
+                chunk_index=chunk.chunk_index,
+                size_bytes=chunk.size_bytes,
+                content_hash=chunk.content_hash
+            )
+            for chunk in manifest.chunks
+        ],
+        partial_chunks=[
+            PartialChunkResponse(chunk_index=index, received_bytes=size)
+            for index, size in sorted(manifest.partial_chunks.items())
+        ],
+        missing_chunk_indexes=manifest.missing_chunk_indexes,
+        next_chunk_index=manifest.next_chunk_index
+    )
+
+
 @router.post("/{recording_id}/chunks", status_code=status.HTTP_201_CREATED)
 async def upload_chunk(
     recording_id: str,
+    response: Response,
     chunk_index: int = Form(...),
     audio_chunk: UploadFile = File(...),
     duration_seconds: Optional[float] = Form(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: DatabaseSession = Depends(get_db)
 ):
     """
     Upload an audio chunk for a recording.
 
+    Uploads are idempotent per chunk index: retrying with the same content
+    returns 200 with status "unchanged", different content replaces the
+    stored chunk with status "replaced", and a new chunk returns 201.
+
     Args:
         recording_id: ID of the recording
+        response: Response, whose status is 200 when the chunk already existed
         chunk_index: Sequential index of the chunk
         audio_chunk: Audio file chunk
         duration_seconds: Optional duration of the chunk
@@ -171,13 +392,13 @@ async def upload_chunk(
         db: Database session
 
     Returns:
-        Success message with chunk info
+        Success message with chunk info and whether it was created, replaced or unchanged
 
     Raises:
         HTTPException: If recording not found or access denied
     """
     recording_service = RecordingService(db)
-    recording = recording_service.get_recording(recording_id)
+    recording = await recording_service.get_recording(recording_id)
 
     if not recording:
         raise HTTPException(
@@ -191,29 +412,335 @@ async def upload_chunk(
             detail="Access denied"
         )
 
-    # Read chunk data
-    chunk_data = await audio_chunk.read()
+    if audio_chunk.size is not None and audio_chunk.size > settings.MAX_CHUNK_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Audio chunk exceeds the maximum size of {settings.MAX_CHUNK_BYTES} bytes"
+        )
+
+    # Stream chunk data to storage in bounded buffers
+    try:
+        chunk, result = await recording_service.upload_chunk(
+            recording_id=recording_id,
+            chunk_index=chunk_index,
+            chunk_stream=_iter_upload(audio_chunk, settings.AUDIO_STREAM_BUFFER_BYTES),
+            duration_seconds=duration_seconds
+        )
+    except ChunkTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
 
-    # Upload chunk
-    chunk = await recording_service.upload_chunk(
-        recording_id=recording_id,
-        chunk_index=chunk_index,
-        chunk_data=chunk_data,
-        duration_seconds=duration_seconds
+    if result != ChunkUploadResult.CREATED:
+        response.status_code = status.HTTP_200_OK
+
+    return {
+        "message": "Chunk uploaded successfully",
+        "chunk_id": chunk.id,
+        "chunk_index": chunk.chunk_index,
+        "status": result.value
+    }
+
+
+@router.post("/{recording_id}/chunks/batch", response_model=ChunkBatchResponse)
+async def upload_chunk_batch(
+    recording_id: str,
+    chunk_indexes: List[int] = Form(...),
+    audio_chunks: List[UploadFile] = File(...),
+    durations: List[float] = Form([]),
+    current_user: User = Depends(get_current_user),
+    db: DatabaseSession = Depends(get_db)
+):
+    """
+    Upload several audio chunks for a recording in one request.
+
+    Meant for clients replaying chunks buffered while offline. The form
+    repeats chunk_indexes, audio_chunks and optionally durations in the same
+    order. Every chunk is written to storage and then all of them are
+    recorded in a single transaction; each index has the same idempotency as
+    the single-chunk upload.
+
+    Args:
+        recording_id: ID of the recording
+        chunk_indexes: Sequential index of each chunk
+        audio_chunks: Audio file of each chunk
+        durations: Duration of each chunk in seconds, or empty
+        current_user: Authenticated user
+        db: Database session
+
+    Returns:
+        Per-chunk upload status
+
+    Raises:
+        HTTPException: If recording not found, access denied, or the batch
+            is malformed or too large
+    """
+    if len(audio_chunks) != len(chunk_indexes) or (durations and len(durations) != len(chunk_indexes)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="chunk_indexes, audio_chunks and durations must have the same length"
+        )
+
+    if len(set(chunk_indexes)) != len(chunk_indexes):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="chunk_indexes must be distinct"
+        )
+
+    if len(chunk_indexes) > settings.MAX_CHUNK_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A batch may contain at most {settings.MAX_CHUNK_BATCH_SIZE} chunks"
+        )
+
+    recording_service = RecordingService(db)
+    recording = await recording_service.get_recording(recording_id)
+
+    if not recording:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recording not found"
+        )
+
+    if recording.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+
+    if any(chunk.size is not None and chunk.size > settings.MAX_CHUNK_BYTES for chunk in audio_chunks):
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Audio chunk exceeds the maximum size of {settings.MAX_CHUNK_BYTES} bytes"
+        )
+
+    try:
+        results = await recording_service.upload_chunks(
+            recording_id,
+            [
+                (
+                    chunk_index,
+                    _iter_upload(audio_chunk, settings.AUDIO_STREAM_BUFFER_BYTES),
+                    durations[i] if durations else None
+                )
+                for i, (chunk_index, audio_chunk) in enumerate(zip(chunk_indexes, audio_chunks))
+            ]
+        )
+    except ChunkTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+
+    return ChunkBatchResponse(
+        chunks=[
+            ChunkUploadResponse(
+                chunk_id=chunk.id,
+                chunk_index=chunk.chunk_index,
+                status=result.value
+            )
+            for chunk, result in results
+        ]
     )
 
+
+@router.put("/{recording_id}/chunks/{chunk_index}", status_code=status.HTTP_201_CREATED)
+async def put_chunk(
+    recording_id: str,
+    chunk_index: int,
+    request: Request,
+    response: Response,
+    x_chunk_duration: Optional[float] = Header(None),
+    upload_offset: Optional[int] = Header(None, ge=0),
+    current_user: User = Depends(get_current_user),
+    db: DatabaseSession = Depends(get_db)
+):
+    """
+    Upload an audio chunk as a raw request body.
+
+    The body is streamed straight to storage without multipart parsing; the
+    chunk duration is carried in the X-Chunk-Duration header.
+
+    If the connection drops mid-body, the bytes received are kept and listed
+    in the chunk manifest. Sending the rest of the chunk with an Upload-Offset
+    header equal to the bytes received completes it; a wrong offset is
+    rejected with 409 and the expected offset in the Upload-Offset header.
+
+    Args:
+        recording_id: ID of the recording
+        chunk_index: Sequential index of the chunk
+        request: Incoming request whose body is the audio chunk
+        response: Response, whose status is 200 when the chunk already existed
+        x_chunk_duration: Optional duration of the chunk in seconds
+        upload_offset: Byte offset the body resumes an interrupted upload at
+        current_user: Authenticated user
+        db: Database session
+
+    Returns:
+        Success message with chunk info and whether it was created, replaced or unchanged
+
+    Raises:
+        HTTPException: If recording not found, access denied, the body is
+            not raw audio or the upload offset is wrong
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if not content_type.startswith(RAW_CHUNK_CONTENT_TYPES):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Chunk body must be application/octet-stream"
+        )
+
+    recording_service = RecordingService(db)
+    recording = await recording_service.get_recording(recording_id)
+
+    if not recording:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recording not found"
+        )
+
+    if recording.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+
+    content_length = request.headers.get("content-length")
+    if (
+        content_length and content_length.isdigit()
+        and (upload_offset or 0) + int(content_length) > settings.MAX_CHUNK_BYTES
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Audio chunk exceeds the maximum size of {settings.MAX_CHUNK_BYTES} bytes"
+        )
+
+    try:
+        chunk, result = await recording_service.upload_chunk(
+            recording_id=recording_id,
+            chunk_index=chunk_index,
+            chunk_stream=_iter_request(request, settings.AUDIO_STREAM_BUFFER_BYTES),
+            duration_seconds=x_chunk_duration,
+            upload_offset=upload_offset
+        )
+    except ChunkTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except UploadOffsetMismatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+            headers={"Upload-Offset": str(e.received_bytes)}
+        )
+
+    if result != ChunkUploadResult.CREATED:
+        response.status_code = status.HTTP_200_OK
+
     return {
         "message": "Chunk uploaded successfully",
         "chunk_id": chunk.id,
-        "chunk_index": chunk.chunk_index
+        "chunk_index": chunk.chunk_index,
+        "status": result.value
     }
 
 
+@router.websocket("/{recording_id}/stream")
+async def stream_audio(
+    websocket: WebSocket,
+    recording_id: str,
+    current_user: User = Depends(get_websocket_user),
+    db: DatabaseSession = Depends(get_db)
+):
+    """
+    Ingest a continuous audio stream over a WebSocket.
+
+    The connection is authenticated and the recording checked once. Binary
+    frames carry audio, which the server cuts into chunks of about
+    STREAM_CHUNK_BYTES, on WebM cluster boundaries, and stores like uploaded
+    chunks. Each stored chunk is acknowledged with an "ack" message carrying
+    the stream offset stored so far; while STREAM_MAX_PENDING_CHUNKS chunks
+    wait to be stored the server stops reading, so the client's send buffer
+    fills instead of the server's.
+
+    Text frames are JSON control messages: {"type": "flush"} stores the
+    buffered audio as a chunk now, up to the last WebM cluster, and
+    {"type": "end"} stores all of it and closes the stream. Audio received
+    before a disconnect is stored as well.
+
+    Args:
+        websocket: WebSocket connection
+        recording_id: ID of the recording
+        current_user: User authenticated at the handshake
+        db: Database session
+
+    Raises:
+        WebSocketException: If recording not found or access denied
+    """
+    async def acknowledge(chunk: RecordingChunk, result: ChunkUploadResult, stored_bytes: int) -> None:
+        await websocket.send_json({
+            "type": "ack",
+            "chunk_id": chunk.id,
+            "chunk_index": chunk.chunk_index,
+            "status": result.value,
+            "stored_bytes": stored_bytes,
+        })
+
+    recording_service = RecordingService(db)
+    try:
+        ingest = await recording_service.open_stream(recording_id, current_user.id, acknowledge)
+    except RecordingNotFoundError:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Recording not found")
+    except RecordingAccessDeniedError:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Access denied")
+
+    await websocket.accept()
+    await websocket.send_json({
+        "type": "ready",
+        "next_chunk_index": ingest.next_chunk_index,
+        "stored_bytes": ingest.stored_bytes,
+        "chunk_bytes": ingest.chunk_bytes,
+        "max_pending_chunks": settings.STREAM_MAX_PENDING_CHUNKS,
+    })
+
+    ended = False
+    async with ingest:
+        while not ended:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                await ingest.feed(message["bytes"])
+                continue
+
+            try:
+                control = json.loads(message.get("text") or "")
+            except ValueError:
+                control = None
+            control_type = control.get("type") if isinstance(control, dict) else None
+            if control_type == "flush":
+                await ingest.flush()
+            elif control_type == "end":
+                ended = True
+            else:
+                await websocket.send_json({"type": "error", "detail": "Unknown control message"})
+
+    if ended:
+        await websocket.send_json({
+            "type": "end",
+            "next_chunk_index": ingest.next_chunk_index,
+            "stored_bytes": ingest.stored_bytes,
+        })
+        await websocket.close()
+
+
 @router.patch("/{recording_id}/pause", response_model=RecordingResponse)
 async def pause_recording(
     recording_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: DatabaseSession = Depends(get_db)
 ):
     """
     Pause a recording.
@@ -230,22 +757,19 @@ async def pause_recording(
         HTTPException: If recording not found or access denied
     """
     recording_service = RecordingService(db)
-    recording = recording_service.get_recording(recording_id)
-
-    if not recording:
+    try:
+        recording = await recording_service.pause_recording(recording_id, current_user.id)
+    except RecordingNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Recording not found"
         )
-
-    if recording.user_id != current_user.id:
+    except RecordingAccessDeniedError:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
         )
 
-    recording = recording_service.pause_recording(recording_id)
-
     return RecordingResponse(
         id=recording.id,
         user_id=recording.user_id,
@@ -258,14 +782,18 @@ async def pause_recording(
     )
 
 
-@router.post("/{recording_id}/finish", response_model=RecordingResponse)
+@router.post(
+    "/{recording_id}/finish",
+    response_model=TranscriptionJobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
 async def finish_recording(
     recording_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: DatabaseSession = Depends(get_db)
 ):
     """
-    Finish a recording, assemble chunks, and trigger transcription.
+    Finish a recording and enqueue it for background transcription.
 
     Args:
         recording_id: ID of the recording
@@ -273,13 +801,74 @@ async def finish_recording(
         db: Database session
 
     Returns:
-        Updated recording with transcription
+        The queued transcription job
 
     Raises:
-        HTTPException: If recording not found or access denied
+        HTTPException: If recording not found, access denied or chunks are
+            missing from the index sequence
+    """
+    recording_service = RecordingService(db)
+    try:
+        job = await recording_service.finish_recording(recording_id, current_user.id)
+    except RecordingNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recording not found"
+        )
+    except RecordingAccessDeniedError:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    except MissingChunksError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": str(e), "missing_chunk_indexes": e.missing_chunk_indexes}
+        )
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to finish recording"
+        )
+
+    return TranscriptionJobResponse(
+        id=job.id,
+        recording_id=job.recording_id,
+        status=job.status.value,
+        attempts=job.attempts,
+        error=job.error,
+        created_at=job.created_at.isoformat(),
+        updated_at=job.updated_at.isoformat(),
+        started_at=job.started_at.isoformat() if job.started_at else None,
+        finished_at=job.finished_at.isoformat() if job.finished_at else None
+    )
+
+
+@router.get("/{recording_id}/jobs/{job_id}", response_model=TranscriptionJobResponse)
+async def get_transcription_job(
+    recording_id: str,
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: DatabaseSession = Depends(get_db)
+):
+    """
+    Get the status of a transcription job.
+
+    Args:
+        recording_id: ID of the recording
+        job_id: ID of the transcription job
+        current_user: Authenticated user
+        db: Database session
+
+    Returns:
+        Transcription job details
+
+    Raises:
+        HTTPException: If recording or job not found or access denied
     """
     recording_service = RecordingService(db)
-    recording = recording_service.get_recording(recording_id)
+    recording = await recording_service.get_recording(recording_id)
 
     if not recording:
         raise HTTPException(
@@ -293,23 +882,24 @@ async def finish_recording(
             detail="Access denied"
         )
 
-    recording = await recording_service.finish_recording(recording_id)
+    job = await recording_service.get_transcription_job(job_id)
 
-    if not recording:
+    if not job or job.recording_id != recording_id:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to finish recording"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transcription job not found"
         )
 
-    return RecordingResponse(
-        id=recording.id,
-        user_id=recording.user_id,
-        status=recording.status.value,
-        created_at=recording.created_at.isoformat(),
-        updated_at=recording.updated_at.isoformat(),
-        audio_file_path=recording.audio_file_path,
-        transcription_text=recording.transcription_text,
-        notes=recording.notes
+    return TranscriptionJobResponse(
+        id=job.id,
+        recording_id=job.recording_id,
+        status=job.status.value,
+        attempts=job.attempts,
+        error=job.error,
+        created_at=job.created_at.isoformat(),
+        updated_at=job.updated_at.isoformat(),
+        started_at=job.started_at.isoformat() if job.started_at else None,
+        finished_at=job.finished_at.isoformat() if job.finished_at else None
     )
 
 
@@ -318,7 +908,7 @@ async def add_notes(
     recording_id: str,
     notes_request: NotesRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: DatabaseSession = Depends(get_db)
 ):
     """
     Add or update notes for a recording.
@@ -336,22 +926,19 @@ async def add_notes(
         HTTPException: If recording not found or access denied
     """
     recording_service = RecordingService(db)
-    recording = recording_service.get_recording(recording_id)
-
-    if not recording:
+    try:
+        recording = await recording_service.add_notes(recording_id, notes_request.notes, current_user.id)
+    except RecordingNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Recording not found"
         )
-
-    if recording.user_id != current_user.id:
+    except RecordingAccessDeniedError:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
         )
 
-    recording = recording_service.add_notes(recording_id, notes_request.notes)
-
     return RecordingResponse(
         id=recording.id,
         user_id=recording.user_id,
@@ -368,7 +955,7 @@ async def add_notes(
 async def delete_recording(
     recording_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: DatabaseSession = Depends(get_db)
 ):
     """
     Delete a recording and all associated files.
@@ -382,22 +969,19 @@ async def delete_recording(
         HTTPException: If recording not found or access denied
     """
     recording_service = RecordingService(db)
-    recording = recording_service.get_recording(recording_id)
-
-    if not recording:
+    try:
+        success = await recording_service.delete_recording(recording_id, current_user.id)
+    except RecordingNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Recording not found"
         )
-
-    if recording.user_id != current_user.id:
+    except RecordingAccessDeniedError:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
         )
 
-    success = recording_service.delete_recording(recording_id)
-
     if not success:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
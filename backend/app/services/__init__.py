@@ -1,8 +1,29 @@
 """Service layer implementations."""
-from .recording_service import RecordingService
-from .audio_service import AudioService
+from .recording_service import RecordingService, MissingChunksError
+from .audio_service import AudioService, ChunkTooLargeError, UploadOffsetMismatchError
+from .audio_stream import ChunkStream
+from .stream_ingest import StreamIngest
+from .user_cache import UserCache, user_cache
+from .transcription_cache import TranscriptionCache, transcription_cache
+from .transcription_scheduler import FairShareScheduler, transcription_scheduler
+from .recording_events import RecordingEvents, recording_events
+from .pagination import InvalidCursorError
 
 __all__ = [
     "RecordingService",
+    "MissingChunksError",
     "AudioService",
+    "ChunkTooLargeError",
+    "UploadOffsetMismatchError",
+    "ChunkStream",
+    "StreamIngest",
+    "UserCache",
+    "user_cache",
+    "TranscriptionCache",
+    "transcription_cache",
+    "FairShareScheduler",
+    "transcription_scheduler",
+    "RecordingEvents",
+    "recording_events",
+    "InvalidCursorError",
 ]
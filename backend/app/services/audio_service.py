@@ -1,29 +1,53 @@
 """Audio processing service."""
+import asyncio
+import hashlib
 import os
 import shutil
+import uuid
 from pathlib import Path
-from typing import List
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+import aiofiles
 from app.core.config import settings
+from app.services.audio_stream import ChunkStream
+from app.services.file_io import io_executor, ensure_directory, forget_directory, sync_file
+
+# Suffix of the file holding the received bytes of an interrupted chunk upload
+PARTIAL_SUFFIX = ".partial"
+
+# EBML element IDs marking a WebM file and the first cluster of audio frames
+WEBM_MAGIC = b"\x1a\x45\xdf\xa3"
+WEBM_CLUSTER_ID = b"\x1f\x43\xb6\x75"
+
+
+class ChunkTooLargeError(ValueError):
+    """Raised when an uploaded chunk exceeds MAX_CHUNK_BYTES."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Audio chunk exceeds the maximum size of {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+class UploadOffsetMismatchError(ValueError):
+    """Raised when a resumed chunk upload does not start where the stored bytes end."""
+
+    def __init__(self, received_bytes: int):
+        super().__init__(f"Upload must resume at offset {received_bytes}")
+        self.received_bytes = received_bytes
 
 
 class AudioService:
     """Service for handling audio file operations."""
 
     def __init__(self):
-        self.storage_path = Path(settings.AUDIO_STORAGE_PATH)
-        self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.storage_path = ensure_directory(Path(settings.AUDIO_STORAGE_PATH))
 
     def get_chunk_directory(self, recording_id: str) -> Path:
         """Get the directory for storing chunks of a recording."""
-        chunk_dir = self.storage_path / recording_id / "chunks"
-        chunk_dir.mkdir(parents=True, exist_ok=True)
-        return chunk_dir
+        return ensure_directory(self.storage_path / recording_id / "chunks")
 
     def get_recording_directory(self, recording_id: str) -> Path:
         """Get the directory for a recording."""
-        recording_dir = self.storage_path / recording_id
-        recording_dir.mkdir(parents=True, exist_ok=True)
-        return recording_dir
+        return ensure_directory(self.storage_path / recording_id)
 
     async def save_chunk(self, recording_id: str, chunk_index: int, chunk_data: bytes) -> str:
         """
@@ -37,28 +61,180 @@ class AudioService:
         Returns:
             Path to the saved chunk file
         """
+        async def single_buffer() -> AsyncIterator[bytes]:
+            yield chunk_data
+
+        return await self.save_chunk_stream(recording_id, chunk_index, single_buffer())
+
+    def _chunk_path(self, recording_id: str, chunk_index: int) -> str:
+        return str(self.get_chunk_directory(recording_id) / f"chunk_{chunk_index:05d}.webm")
+
+    def partial_chunk_path(self, recording_id: str, chunk_index: int) -> str:
+        """Get the path holding the received bytes of an interrupted chunk upload."""
+        return f"{self._chunk_path(recording_id, chunk_index)}{PARTIAL_SUFFIX}"
+
+    async def get_partial_size(self, recording_id: str, chunk_index: int) -> int:
+        """Get how many bytes of an interrupted chunk upload are stored, 0 if none."""
+        return await asyncio.get_running_loop().run_in_executor(
+            io_executor, self._size_if_exists, self.partial_chunk_path(recording_id, chunk_index)
+        )
+
+    async def get_partial_chunks(self, recording_id: str) -> Dict[int, int]:
+        """
+        List the interrupted chunk uploads of a recording.
+
+        Args:
+            recording_id: ID of the recording
+
+        Returns:
+            Bytes received so far, keyed by chunk index
+        """
         chunk_dir = self.get_chunk_directory(recording_id)
-        chunk_path = chunk_dir / f"chunk_{chunk_index:05d}.webm"
+        return await asyncio.get_running_loop().run_in_executor(io_executor, self._list_partial_chunks, chunk_dir)
 
-        with open(chunk_path, "wb") as f:
-            f.write(chunk_data)
+    def stream_partial_chunk(self, recording_id: str, chunk_index: int) -> ChunkStream:
+        """Open a streaming view over the received bytes of an interrupted chunk upload."""
+        path = self.partial_chunk_path(recording_id, chunk_index)
+        return ChunkStream([path], Path(path).name, settings.AUDIO_STREAM_BUFFER_BYTES)
+
+    async def save_chunk_stream(
+        self,
+        recording_id: str,
+        chunk_index: int,
+        chunk_stream: AsyncIterable[bytes],
+        max_bytes: Optional[int] = None,
+        offset: Optional[int] = None,
+        is_unchanged: Optional[Callable[[], Awaitable[bool]]] = None
+    ) -> str:
+        """
+        Stream an audio chunk to disk in bounded buffers.
 
-        return str(chunk_path)
+        Buffers are written to a temporary file next to the chunk on the
+        bounded audio I/O pool and renamed into place, so a partially written
+        chunk is never visible, then flushed according to AUDIO_FSYNC_MODE.
 
-    async def assemble_chunks(self, recording_id: str, chunk_paths: List[str]) -> str:
+        If the stream breaks off, e.g. because the client disconnected, the
+        bytes received so far are kept as the chunk's partial upload, and a
+        later call with ``offset`` set to their size appends the rest.
+
+        When a chunk is already stored at the index, ``is_unchanged`` is asked
+        once the stream is written; if it says the new copy is identical, the
+        copy is dropped and the stored chunk is neither rewritten nor flushed.
+
+        Args:
+            recording_id: ID of the recording
+            chunk_index: Index of the chunk
+            chunk_stream: Async iterator of binary audio data
+            max_bytes: Size cap for the chunk, defaults to MAX_CHUNK_BYTES
+            offset: Byte offset the stream resumes an interrupted upload at,
+                or None for a complete chunk
+            is_unchanged: Called when a chunk is already stored at the index,
+                returning whether the stream matched it
+
+        Returns:
+            Path to the saved chunk file
+
+        Raises:
+            ChunkTooLargeError: If the chunk exceeds the size cap
+            UploadOffsetMismatchError: If offset is not the size of the partial upload
+        """
+        max_bytes = max_bytes or settings.MAX_CHUNK_BYTES
+        chunk_path = self._chunk_path(recording_id, chunk_index)
+        partial_path = self.partial_chunk_path(recording_id, chunk_index)
+        loop = asyncio.get_running_loop()
+
+        if offset:
+            received = await loop.run_in_executor(io_executor, self._size_if_exists, partial_path)
+            if received != offset:
+                raise UploadOffsetMismatchError(received)
+            temp_path, mode = partial_path, "ab"
+        else:
+            temp_path, mode = f"{chunk_path}.{uuid.uuid4().hex}.part", "wb"
+
+        size = offset or 0
+        try:
+            async with aiofiles.open(temp_path, mode, executor=io_executor) as f:
+                async for data in chunk_stream:
+                    size += len(data)
+                    if size > max_bytes:
+                        raise ChunkTooLargeError(max_bytes)
+                    await f.write(data)
+            unchanged = (
+                is_unchanged is not None
+                and await loop.run_in_executor(io_executor, os.path.exists, chunk_path)
+                and await is_unchanged()
+            )
+            if unchanged:
+                await loop.run_in_executor(io_executor, self._remove_if_exists, temp_path)
+            else:
+                await loop.run_in_executor(io_executor, os.replace, temp_path, chunk_path)
+        except ChunkTooLargeError:
+            await loop.run_in_executor(io_executor, self._remove_if_exists, temp_path)
+            raise
+        except BaseException:
+            # Keep what arrived so the client can resume instead of resending it
+            if size:
+                await loop.run_in_executor(io_executor, os.replace, temp_path, partial_path)
+            else:
+                await loop.run_in_executor(io_executor, self._remove_if_exists, temp_path)
+            raise
+
+        if temp_path != partial_path:
+            # A complete upload supersedes an interrupted one at the same index
+            await loop.run_in_executor(io_executor, self._remove_if_exists, partial_path)
+
+        if not unchanged:
+            # Flushes the file and the directory entry created by the rename
+            await sync_file(chunk_path)
+        return chunk_path
+
+    @staticmethod
+    def _size_if_exists(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def _list_partial_chunks(chunk_dir: Path) -> Dict[int, int]:
+        partial_chunks = {}
+        for path in chunk_dir.glob(f"chunk_*.webm{PARTIAL_SUFFIX}"):
+            index = path.name[len("chunk_"):-len(f".webm{PARTIAL_SUFFIX}")]
+            if index.isdigit():
+                partial_chunks[int(index)] = path.stat().st_size
+        return partial_chunks
+
+    @staticmethod
+    def _remove_if_exists(path: str) -> None:
+        Path(path).unlink(missing_ok=True)
+
+    async def assemble_chunks(
+        self,
+        recording_id: str,
+        chunk_paths: List[str],
+        filename: str = "recording.webm"
+    ) -> str:
         """
         Assemble audio chunks into a single file.
 
         Args:
             recording_id: ID of the recording
             chunk_paths: List of paths to chunk files in order
+            filename: Name of the assembled file inside the recording directory
 
         Returns:
             Path to the assembled audio file
         """
         recording_dir = self.get_recording_directory(recording_id)
-        output_path = recording_dir / "recording.webm"
+        output_path = str(recording_dir / filename)
+
+        await asyncio.get_running_loop().run_in_executor(
+            io_executor, self._concatenate_files, chunk_paths, output_path
+        )
+        return output_path
 
+    @staticmethod
+    def _concatenate_files(chunk_paths: List[str], output_path: str) -> None:
         # Simple concatenation for WebM files
         # In production, you might want to use ffmpeg for proper merging
         with open(output_path, "wb") as output_file:
@@ -66,18 +242,86 @@ class AudioService:
                 with open(chunk_path, "rb") as chunk_file:
                     shutil.copyfileobj(chunk_file, output_file)
 
-        return str(output_path)
+    def stream_chunks(
+        self,
+        chunk_paths: List[str],
+        filename: str = "recording.webm",
+        header: bytes = b""
+    ) -> ChunkStream:
+        """
+        Open a streaming view over chunk files in order, without assembling them.
+
+        Args:
+            chunk_paths: List of paths to chunk files in order
+            filename: File name reported to the transcription provider
+            header: Bytes sent before the chunks, see read_container_header
+
+        Returns:
+            Re-iterable stream of the concatenated chunk bytes
+        """
+        return ChunkStream(chunk_paths, filename, settings.AUDIO_STREAM_BUFFER_BYTES, header)
+
+    async def read_container_header(self, first_chunk_path: str) -> bytes:
+        """
+        Read the WebM header that MediaRecorder writes only into a recording's first chunk.
+
+        Later chunks hold bare clusters of audio frames, so a segment cut from
+        the middle of a recording is prefixed with this header to be decodable.
 
-    def delete_recording_files(self, recording_id: str) -> None:
+        Args:
+            first_chunk_path: Path to the chunk at index 0
+
+        Returns:
+            The bytes before the first cluster, or b"" if the chunk is not WebM
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            io_executor, self._read_container_header, first_chunk_path
+        )
+
+    @staticmethod
+    def _read_container_header(path: str) -> bytes:
+        with open(path, "rb") as chunk_file:
+            data = chunk_file.read(settings.AUDIO_STREAM_BUFFER_BYTES)
+        if not data.startswith(WEBM_MAGIC):
+            return b""
+        cluster = data.find(WEBM_CLUSTER_ID)
+        return data[:cluster] if cluster > 0 else b""
+
+    async def hash_chunk(self, chunk_path: str) -> str:
+        """
+        Hash a stored chunk, for chunks saved without a content_hash.
+
+        Args:
+            chunk_path: Path to the chunk
+
+        Returns:
+            SHA-256 of the chunk, hex encoded
+        """
+        return await asyncio.get_running_loop().run_in_executor(io_executor, self._hash_file, chunk_path)
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as chunk_file:
+            while data := chunk_file.read(settings.AUDIO_STREAM_BUFFER_BYTES):
+                digest.update(data)
+        return digest.hexdigest()
+
+    async def delete_recording_files(self, recording_id: str) -> None:
         """
         Delete all files associated with a recording.
 
         Args:
             recording_id: ID of the recording
         """
-        recording_dir = self.get_recording_directory(recording_id)
-        if recording_dir.exists():
-            shutil.rmtree(recording_dir)
+        recording_dir = self.storage_path / recording_id
+        await asyncio.get_running_loop().run_in_executor(io_executor, self._remove_tree, recording_dir)
+        forget_directory(recording_dir)
+
+    @staticmethod
+    def _remove_tree(path: Path) -> None:
+        if path.exists():
+            shutil.rmtree(path)
 
     def get_file_size(self, file_path: str) -> int:
         """Get the size of a file in bytes."""
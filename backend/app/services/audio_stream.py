@@ -0,0 +1,50 @@
+"""Streaming reader over ordered audio chunk files."""
+import asyncio
+import os
+from typing import AsyncIterator, List, Optional
+import aiofiles
+from app.services.file_io import io_executor
+
+
+class ChunkStream:
+    """
+    Virtual concatenation of chunk files, read lazily in fixed-size buffers.
+
+    Satisfies the ``AudioStream`` protocol used by LLM providers. Every
+    iteration starts again from the first chunk, so a failed upload can be
+    retried with the same object.
+
+    A header, e.g. the container header of the recording's first chunk, can
+    be sent ahead of the chunks so a segment from mid-recording decodes on
+    its own.
+
+    The size is measured on the I/O thread pool when first asked for, so
+    opening a stream never blocks the event loop.
+    """
+
+    def __init__(self, chunk_paths: List[str], filename: str, buffer_size: int, header: bytes = b""):
+        self.chunk_paths = list(chunk_paths)
+        self.filename = filename
+        self.buffer_size = buffer_size
+        self.header = header
+        self._size: Optional[int] = None
+
+    async def get_size(self) -> int:
+        """Total size in bytes of the header and the chunk files."""
+        if self._size is None:
+            sizes = await asyncio.get_running_loop().run_in_executor(
+                io_executor, lambda: [os.path.getsize(path) for path in self.chunk_paths]
+            )
+            self._size = len(self.header) + sum(sizes)
+        return self._size
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        if self.header:
+            yield self.header
+        for path in self.chunk_paths:
+            async with aiofiles.open(path, "rb", executor=io_executor) as chunk_file:
+                while True:
+                    data = await chunk_file.read(self.buffer_size)
+                    if not data:
+                        break
+                    yield data
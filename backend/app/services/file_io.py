@@ -0,0 +1,143 @@
+"""Off-event-loop file I/O helpers for audio storage."""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from app.core.config import settings
+
+# Bounded pool for all audio file I/O, so disk stalls cannot exhaust the
+# default executor or block the event loop.
+io_executor = ThreadPoolExecutor(
+    max_workers=settings.AUDIO_IO_THREADS,
+    thread_name_prefix="audio-io"
+)
+
+_known_directories: Set[Path] = set()
+
+
+def ensure_directory(path: Path) -> Path:
+    """
+    Create a directory once per process.
+
+    Subsequent calls for the same path skip the mkdir system call.
+
+    Args:
+        path: Directory to create
+
+    Returns:
+        The same path
+    """
+    if path not in _known_directories:
+        path.mkdir(parents=True, exist_ok=True)
+        _known_directories.add(path)
+    return path
+
+
+def forget_directory(path: Path) -> None:
+    """Drop a directory and its children from the cache after it is deleted."""
+    for known in [known for known in _known_directories if known == path or path in known.parents]:
+        _known_directories.discard(known)
+
+
+def _fsync(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_each(paths: Iterable[str]) -> Dict[str, OSError]:
+    """
+    Flush files and their parent directories to stable storage, one by one.
+
+    A failure only affects the files it concerns: a file that cannot be
+    flushed, or every file of a directory that cannot be.
+
+    Returns:
+        The error of each path that could not be made durable
+    """
+    errors: Dict[str, OSError] = {}
+    directories: Dict[str, List[str]] = {}
+    for path in paths:
+        try:
+            _fsync(path)
+        except OSError as e:
+            errors[path] = e
+        else:
+            directories.setdefault(os.path.dirname(path), []).append(path)
+
+    for directory, members in directories.items():
+        try:
+            _fsync(directory)
+        except OSError as e:
+            errors.update((path, e) for path in members)
+    return errors
+
+
+def fsync_paths(paths: Iterable[str]) -> None:
+    """
+    Flush files and their parent directories to stable storage.
+
+    Raises:
+        OSError: If any of them could not be flushed
+    """
+    errors = fsync_each(paths)
+    if errors:
+        raise next(iter(errors.values()))
+
+
+class FsyncBatcher:
+    """
+    Group commit for fsync.
+
+    Writers that ask for durability within one batch interval wait on the
+    same flush pass, which runs on the I/O pool, instead of each paying for
+    its own fsync. Each writer only sees the outcome for its own file.
+    """
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def sync(self, path: str) -> None:
+        """Wait until the file at ``path`` has been flushed by a batch."""
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.setdefault(path, []).append(waiter)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_while_pending())
+        await waiter
+
+    async def _flush_while_pending(self) -> None:
+        # Writers that arrive while a flush is running are picked up by the next pass
+        while self._waiters:
+            await asyncio.sleep(self.interval_seconds)
+            waiters, self._waiters = self._waiters, {}
+
+            try:
+                errors = await asyncio.get_running_loop().run_in_executor(io_executor, fsync_each, list(waiters))
+            except Exception as e:
+                errors = dict.fromkeys(waiters, e)
+            for path, path_waiters in waiters.items():
+                for waiter in path_waiters:
+                    if waiter.done():
+                        continue
+                    if path in errors:
+                        waiter.set_exception(errors[path])
+                    else:
+                        waiter.set_result(None)
+
+
+fsync_batcher = FsyncBatcher(settings.AUDIO_FSYNC_BATCH_INTERVAL_MS / 1000)
+
+
+async def sync_file(path: str) -> None:
+    """Make a written file durable according to AUDIO_FSYNC_MODE."""
+    mode = settings.AUDIO_FSYNC_MODE
+    if mode == "always":
+        await asyncio.get_running_loop().run_in_executor(io_executor, fsync_paths, [path])
+    elif mode == "batch":
+        await fsync_batcher.sync(path)
@@ -0,0 +1,46 @@
+"""Opaque cursors for keyset pagination."""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(created_at: datetime, item_id: str) -> str:
+    """
+    Encode the sort key of the last item on a page.
+
+    Args:
+        created_at: Creation time of the item
+        item_id: ID of the item, breaking ties between equal timestamps
+
+    Returns:
+        URL-safe cursor string
+    """
+    data = json.dumps([created_at.isoformat(), item_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        (created_at, id) of the last item on the previous page
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, item_id = json.loads(data)
+        return datetime.fromisoformat(created_at), str(item_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
@@ -0,0 +1,112 @@
+"""Recording change events pushed to their owners."""
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+from app.core.config import settings
+from app.core.events import EventBroker, create_event_broker
+from app.models import Recording
+
+logger = logging.getLogger(__name__)
+
+
+class RecordingEvents:
+    """
+    Publishes recording status changes and transcripts on a per-user channel.
+
+    Events are JSON objects with a type and its data. Publishing is best
+    effort: a broker failure is logged and never fails the change itself,
+    and clients that reconnect re-read the recordings they care about.
+    """
+
+    def __init__(self, broker: EventBroker):
+        self.broker = broker
+
+    @staticmethod
+    def _channel(user_id: str) -> str:
+        return f"recordings:{user_id}"
+
+    async def publish(self, user_id: str, event_type: str, data: Dict[str, Any]) -> None:
+        """Publish an event to a user's subscribers."""
+        try:
+            await self.broker.publish(self._channel(user_id), json.dumps({"type": event_type, "data": data}))
+        except Exception:
+            logger.warning("Publishing %s event for user %s failed", event_type, user_id, exc_info=True)
+
+    async def status_changed(self, recording: Recording) -> None:
+        """Publish a recording's new status."""
+        await self.publish(recording.user_id, "status", {
+            "recording_id": recording.id,
+            "status": recording.status.value,
+            "updated_at": recording.updated_at.isoformat(),
+        })
+
+    async def transcript_ready(self, recording: Recording) -> None:
+        """Publish the final transcript of a recording, with its ended status."""
+        await self.publish(recording.user_id, "transcript", {
+            "recording_id": recording.id,
+            "status": recording.status.value,
+            "updated_at": recording.updated_at.isoformat(),
+            "transcription_text": recording.transcription_text,
+        })
+
+    async def partial_transcript(
+        self,
+        user_id: str,
+        recording_id: str,
+        first_chunk_index: int,
+        last_chunk_index: int,
+        text: str
+    ) -> None:
+        """Publish the transcript of a window of chunks, ahead of the final transcript."""
+        await self.publish(user_id, "partial_transcript", {
+            "recording_id": recording_id,
+            "first_chunk_index": first_chunk_index,
+            "last_chunk_index": last_chunk_index,
+            "text": text,
+        })
+
+    async def recording_deleted(self, user_id: str, recording_id: str) -> None:
+        """Publish the deletion of a recording."""
+        await self.publish(user_id, "deleted", {"recording_id": recording_id})
+
+    async def sse_stream(self, user_id: str, keepalive_seconds: float) -> AsyncIterator[str]:
+        """
+        Stream a user's events in Server-Sent Events format.
+
+        A comment line is sent after keepalive_seconds without events, so
+        proxies keep the connection open and disconnected clients are noticed.
+
+        Args:
+            user_id: ID of the subscribing user
+            keepalive_seconds: Longest silence on the stream
+
+        Yields:
+            SSE frames, starting with the client reconnection delay
+        """
+        yield "retry: 3000\n\n"
+        async with self.broker.subscribe(self._channel(user_id)) as messages:
+            messages = messages.__aiter__()
+            next_message: Optional[asyncio.Future] = None
+            try:
+                while True:
+                    # Waiting on a task rather than wait_for, so a timeout does not close the iterator
+                    if next_message is None:
+                        next_message = asyncio.ensure_future(messages.__anext__())
+                    done, _ = await asyncio.wait({next_message}, timeout=keepalive_seconds)
+                    if not done:
+                        yield ": keepalive\n\n"
+                        continue
+
+                    event = json.loads(next_message.result())
+                    next_message = None
+                    yield f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+            finally:
+                if next_message is not None:
+                    next_message.cancel()
+
+
+# Process-wide publisher used by RecordingService and GET /recordings/events
+recording_events = RecordingEvents(
+    create_event_broker(settings.EVENT_BROKER_BACKEND, settings.EVENT_SUBSCRIBER_QUEUE_SIZE)
+)
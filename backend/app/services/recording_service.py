@@ -1,117 +1,726 @@
 """Recording service for business logic."""
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from app.repositories import MySQLRecordingRepository
-from app.models import Recording, RecordingChunk
-from app.llm import RequestYaiProvider
-from app.services.audio_service import AudioService
+import hashlib
+from typing import AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.database import DatabaseSession
+from app.repositories import (
+    AsyncMySQLRecordingRepository,
+    AsyncMySQLTranscriptionJobRepository,
+    AsyncMySQLTranscriptionCacheRepository,
+    RecordingNotFoundError,
+    RecordingAccessDeniedError,
+)
+from app.models import (
+    ChunkManifest,
+    ChunkUpload,
+    ChunkUploadResult,
+    Recording,
+    RecordingChunk,
+    RecordingSummary,
+    TranscriptionJob,
+)
+from app.llm import ProviderUnavailableError, SegmentTranscriptionError, get_llm_provider, transcribe_segments
+from app.services.audio_service import AudioService, UploadOffsetMismatchError
+from app.services.audio_stream import ChunkStream
+from app.services.pagination import encode_cursor, decode_cursor
+from app.services.recording_events import recording_events
+from app.services.stream_ingest import ChunkStoredCallback, StreamIngest
+from app.services.transcription_cache import TranscriptionCache, transcription_cache
+from app.services.transcription_scheduler import transcription_scheduler
+
+
+class MissingChunksError(ValueError):
+    """Raised when a recording is finished while chunks are missing from its index sequence."""
+
+    def __init__(self, missing_chunk_indexes: List[int]):
+        super().__init__(f"Recording is missing chunks {missing_chunk_indexes}")
+        self.missing_chunk_indexes = missing_chunk_indexes
 
 
 class RecordingService:
-    """Service for managing recording business logic."""
+    """
+    Service for managing recording business logic.
 
-    def __init__(self, db: Session):
+    Database calls go through the async repositories, so they never block
+    the event loop whichever DATABASE_BACKEND the session comes from.
+    Status changes and transcripts are published to the owner's recording
+    events.
+    """
+
+    def __init__(self, db: DatabaseSession):
         self.db = db
-        self.recording_repo = MySQLRecordingRepository(db)
+        self.recording_repo = AsyncMySQLRecordingRepository(db)
+        self.job_repo = AsyncMySQLTranscriptionJobRepository(db)
+        self.cache_repo = AsyncMySQLTranscriptionCacheRepository(db)
         self.audio_service = AudioService()
-        self.llm_provider = RequestYaiProvider()
+        self.llm_provider = get_llm_provider()
+        self.transcription_cache = transcription_cache
+        self.scheduler = transcription_scheduler
+        self.events = recording_events
 
-    def create_recording(self, user_id: str) -> Recording:
+    async def create_recording(self, user_id: str) -> Recording:
         """Create a new recording session."""
-        return self.recording_repo.create_recording(user_id)
+        recording = await self.recording_repo.create_recording(user_id)
+        await self.events.status_changed(recording)
+        return recording
 
-    def get_recording(self, recording_id: str) -> Optional[Recording]:
+    async def get_recording(self, recording_id: str) -> Optional[Recording]:
         """Get a recording by ID."""
-        return self.recording_repo.get_recording(recording_id)
+        return await self.recording_repo.get_recording(recording_id)
+
+    async def list_user_recordings(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[RecordingSummary], Optional[str]]:
+        """
+        List a page of summaries of a user's recordings, newest first.
+
+        Summaries carry a transcript preview instead of the full text; use
+        get_recording for the transcript and notes.
+
+        Args:
+            user_id: ID of the user
+            limit: Page size, or None for all remaining recordings
+            cursor: Cursor returned with the previous page
+
+        Returns:
+            The recording summaries and the cursor of the next page, or None on the last page
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        after = decode_cursor(cursor) if cursor else None
+        if limit is None:
+            return await self.recording_repo.list_recording_summaries(user_id, after=after), None
 
-    def list_user_recordings(self, user_id: str) -> List[Recording]:
-        """List all recordings for a user."""
-        return self.recording_repo.list_recordings(user_id)
+        # Read one extra row to learn whether another page follows
+        recordings = await self.recording_repo.list_recording_summaries(user_id, limit + 1, after)
+        if len(recordings) <= limit:
+            return recordings, None
+
+        recordings = recordings[:limit]
+        return recordings, encode_cursor(recordings[-1].created_at, recordings[-1].id)
 
     async def upload_chunk(
         self,
         recording_id: str,
         chunk_index: int,
-        chunk_data: bytes,
-        duration_seconds: Optional[float] = None
-    ) -> RecordingChunk:
+        chunk_stream: AsyncIterable[bytes],
+        duration_seconds: Optional[float] = None,
+        upload_offset: Optional[int] = None
+    ) -> Tuple[RecordingChunk, ChunkUploadResult]:
         """
         Upload and save an audio chunk.
 
+        Uploads are idempotent per chunk index: the chunk is hashed while it
+        streams to disk, a retry with the same content leaves the stored chunk
+        unchanged and different content replaces it.
+
+        An upload that breaks off is kept as a partial chunk; sending the rest
+        with upload_offset set to the bytes received completes it.
+
         Args:
             recording_id: ID of the recording
             chunk_index: Index of the chunk
-            chunk_data: Binary audio data
+            chunk_stream: Async iterator of binary audio data
             duration_seconds: Duration of the chunk in seconds
+            upload_offset: Byte offset chunk_stream resumes an interrupted upload at
 
         Returns:
-            Created RecordingChunk
+            The stored RecordingChunk and whether it was created, replaced or unchanged
+
+        Raises:
+            ChunkTooLargeError: If the chunk exceeds MAX_CHUNK_BYTES
+            UploadOffsetMismatchError: If upload_offset is not the number of bytes received
         """
-        # Save chunk to disk
-        chunk_path = await self.audio_service.save_chunk(recording_id, chunk_index, chunk_data)
+        upload = await self._save_chunk(recording_id, chunk_index, chunk_stream, duration_seconds, upload_offset)
+        return (await self._record_chunks(recording_id, [upload]))[0]
 
-        # Save chunk metadata to database
-        return self.recording_repo.add_chunk(
-            recording_id=recording_id,
-            chunk_index=chunk_index,
-            audio_blob_path=chunk_path,
-            duration_seconds=duration_seconds
+    async def upload_chunks(
+        self,
+        recording_id: str,
+        chunks: List[Tuple[int, AsyncIterable[bytes], Optional[float]]]
+    ) -> List[Tuple[RecordingChunk, ChunkUploadResult]]:
+        """
+        Upload and save a batch of audio chunks.
+
+        Each chunk is streamed to disk in turn, then all of them are recorded
+        in one database transaction, with the same per-index idempotency as
+        upload_chunk.
+
+        Args:
+            recording_id: ID of the recording
+            chunks: (chunk_index, chunk_stream, duration_seconds) for each
+                chunk, with distinct indexes
+
+        Returns:
+            Each stored RecordingChunk, in upload order, with whether it was
+            created, replaced or unchanged
+
+        Raises:
+            ChunkTooLargeError: If a chunk exceeds MAX_CHUNK_BYTES
+        """
+        uploads = [
+            await self._save_chunk(recording_id, chunk_index, chunk_stream, duration_seconds)
+            for chunk_index, chunk_stream, duration_seconds in chunks
+        ]
+        return await self._record_chunks(recording_id, uploads)
+
+    async def _record_chunks(
+        self,
+        recording_id: str,
+        uploads: List[ChunkUpload]
+    ) -> List[Tuple[RecordingChunk, ChunkUploadResult]]:
+        """Save the metadata of chunks written to storage and enqueue the windows they complete."""
+        results = await self.recording_repo.add_chunks(recording_id, uploads)
+
+        if settings.INCREMENTAL_TRANSCRIPTION:
+            window = max(settings.INCREMENTAL_TRANSCRIPTION_WINDOW, 1)
+            created_windows = sorted({
+                chunk.chunk_index // window for chunk, result in results if result == ChunkUploadResult.CREATED
+            })
+            for window_index in created_windows:
+                await self._enqueue_completed_window(recording_id, window_index * window, window)
+
+        return results
+
+    async def _save_chunk(
+        self,
+        recording_id: str,
+        chunk_index: int,
+        chunk_stream: AsyncIterable[bytes],
+        duration_seconds: Optional[float],
+        upload_offset: Optional[int] = None
+    ) -> ChunkUpload:
+        """Stream a chunk to disk, measuring and hashing it on the way."""
+        size_bytes = 0
+        digest = hashlib.sha256()
+
+        if upload_offset:
+            # The hash covers the whole chunk, so fold in the bytes already received
+            received = await self.audio_service.get_partial_size(recording_id, chunk_index)
+            if received != upload_offset:
+                raise UploadOffsetMismatchError(received)
+            async for data in self.audio_service.stream_partial_chunk(recording_id, chunk_index):
+                size_bytes += len(data)
+                digest.update(data)
+
+        async def measured_stream() -> AsyncIterator[bytes]:
+            nonlocal size_bytes
+            async for data in chunk_stream:
+                size_bytes += len(data)
+                digest.update(data)
+                yield data
+
+        async def is_unchanged() -> bool:
+            # A retry of the stored chunk leaves its file alone
+            stored = await self.recording_repo.get_chunks_in_range(recording_id, chunk_index, chunk_index)
+            return bool(stored) and stored[0].content_hash == digest.hexdigest()
+
+        chunk_path = await self.audio_service.save_chunk_stream(
+            recording_id, chunk_index, measured_stream(), offset=upload_offset, is_unchanged=is_unchanged
         )
+        return ChunkUpload(chunk_index, chunk_path, duration_seconds, size_bytes, digest.hexdigest())
+
+    async def _enqueue_completed_window(self, recording_id: str, first_chunk_index: int, window: int) -> None:
+        """
+        Enqueue a window transcription job once every chunk of the window is stored.
+
+        Chunks may arrive out of order, so the window is checked whenever one
+        of its chunks is created, not only when its last index arrives.
+        """
+        last_chunk_index = first_chunk_index + window - 1
+        if window > 1:
+            chunks = await self.recording_repo.get_chunks_in_range(recording_id, first_chunk_index, last_chunk_index)
+            if len(chunks) < window:
+                return
+        await self.job_repo.create_job(
+            recording_id,
+            first_chunk_index=first_chunk_index,
+            last_chunk_index=last_chunk_index
+        )
+
+    async def get_chunk_manifest(self, recording_id: str, user_id: Optional[str] = None) -> ChunkManifest:
+        """
+        List the chunks the server holds for a recording, so a client can resume an upload.
+
+        Args:
+            recording_id: ID of the recording
+            user_id: ID of the user who must own the recording, or None
+
+        Returns:
+            The stored chunks, interrupted uploads and the indexes still to send
+
+        Raises:
+            RecordingNotFoundError: If the recording does not exist
+            RecordingAccessDeniedError: If the recording belongs to another user
+        """
+        await self._get_owned_recording(recording_id, user_id)
+        return await self._build_manifest(recording_id)
+
+    async def open_stream(
+        self,
+        recording_id: str,
+        user_id: Optional[str] = None,
+        on_chunk_stored: Optional[ChunkStoredCallback] = None
+    ) -> StreamIngest:
+        """
+        Prepare to store a continuous audio stream as chunks of a recording.
+
+        Streamed chunks continue after the highest chunk index already
+        received, and stored_bytes starts at the recording's total_bytes, so a
+        reconnecting client knows which offset of its audio to resume from.
+
+        Args:
+            recording_id: ID of the recording
+            user_id: ID of the user who must own the recording, or None
+            on_chunk_stored: Called after each chunk is stored, e.g. to acknowledge it
+
+        Returns:
+            The stream ingest, to be entered as an async context manager
+
+        Raises:
+            RecordingNotFoundError: If the recording does not exist
+            RecordingAccessDeniedError: If the recording belongs to another user
+        """
+        recording = await self._get_owned_recording(recording_id, user_id)
+        manifest = await self._build_manifest(recording_id)
+        return StreamIngest(
+            self,
+            recording_id,
+            next_chunk_index=manifest.next_chunk_index,
+            stored_bytes=recording.total_bytes or 0,
+            chunk_bytes=min(settings.STREAM_CHUNK_BYTES, settings.MAX_CHUNK_BYTES),
+            max_chunk_bytes=settings.MAX_CHUNK_BYTES,
+            max_pending_chunks=settings.STREAM_MAX_PENDING_CHUNKS,
+            on_chunk_stored=on_chunk_stored
+        )
+
+    async def _build_manifest(self, recording_id: str) -> ChunkManifest:
+        """Combine the stored chunks with the interrupted uploads on disk."""
+        chunks = await self.recording_repo.get_chunk_manifest(recording_id)
+        partial_chunks = await self.audio_service.get_partial_chunks(recording_id)
+        stored = {chunk.chunk_index for chunk in chunks}
+        # Interrupted re-uploads of a stored chunk leave the stored copy usable
+        partial_chunks = {index: size for index, size in partial_chunks.items() if index not in stored}
+
+        next_chunk_index = max(stored | set(partial_chunks), default=-1) + 1
+        missing = [index for index in range(next_chunk_index) if index not in stored]
+        return ChunkManifest(chunks, partial_chunks, missing, next_chunk_index)
+
+    async def _get_owned_recording(self, recording_id: str, user_id: Optional[str]) -> Recording:
+        """Get a recording, checking that it belongs to user_id when given."""
+        recording = await self.recording_repo.get_recording(recording_id)
+        if not recording:
+            raise RecordingNotFoundError(recording_id)
+        if user_id is not None and recording.user_id != user_id:
+            raise RecordingAccessDeniedError(recording_id)
+        return recording
+
+    async def pause_recording(self, recording_id: str, user_id: Optional[str] = None) -> Optional[Recording]:
+        """
+        Pause a recording.
+
+        Args:
+            recording_id: ID of the recording
+            user_id: ID of the user who must own the recording, or None
+
+        Returns:
+            Updated recording, or None if it does not exist and user_id is None
+
+        Raises:
+            RecordingNotFoundError: If user_id is given and the recording does not exist
+            RecordingAccessDeniedError: If the recording belongs to another user
+        """
+        recording = await self.recording_repo.mark_paused(recording_id, user_id)
+        if recording:
+            await self.events.status_changed(recording)
+        return recording
+
+    async def finish_recording(self, recording_id: str, user_id: Optional[str] = None) -> Optional[TranscriptionJob]:
+        """
+        Finish a recording and enqueue it for background transcription.
+
+        If a transcription job is already queued or running for the recording,
+        that job is returned instead of enqueueing a second one. Otherwise the
+        chunk indexes must run from 0 without gaps or interrupted uploads, so
+        transcription never runs over incomplete audio.
+
+        Args:
+            recording_id: ID of the recording
+            user_id: ID of the user who must own the recording, or None
+
+        Returns:
+            The transcription job, or None if the recording has no chunks
+
+        Raises:
+            RecordingNotFoundError: If the recording does not exist
+            RecordingAccessDeniedError: If the recording belongs to another user
+            MissingChunksError: If chunks are missing from the index sequence
+        """
+        recording = await self._get_owned_recording(recording_id, user_id)
+
+        active_job = await self.job_repo.get_active_job(recording_id)
+        if active_job:
+            return active_job
+
+        if not recording.chunk_count:
+            return None
+
+        manifest = await self._build_manifest(recording_id)
+        if manifest.missing_chunk_indexes:
+            raise MissingChunksError(manifest.missing_chunk_indexes)
+
+        recording = await self.recording_repo.mark_transcribing(recording_id)
+        job = await self.job_repo.create_job(recording_id)
+        if recording:
+            await self.events.status_changed(recording)
+        return job
 
-    def pause_recording(self, recording_id: str) -> Optional[Recording]:
-        """Pause a recording."""
-        return self.recording_repo.mark_paused(recording_id)
+    async def get_transcription_job(self, job_id: str) -> Optional[TranscriptionJob]:
+        """Get a transcription job by ID."""
+        return await self.job_repo.get_job(job_id)
 
-    async def finish_recording(self, recording_id: str) -> Optional[Recording]:
+    async def transcribe_recording(self, recording_id: str) -> Optional[Recording]:
         """
-        Finish a recording, assemble chunks, and trigger transcription.
+        Assemble chunks, transcribe them, and mark the recording as ended.
+
+        This is the unit of work run by the transcription worker; provider
+        errors are propagated so the worker can retry or fail the job.
+
+        Long recordings are transcribed as concurrent segments. Each segment's
+        transcript is stored on its chunks as soon as it is known, so a retried
+        job only transcribes the segments that failed, and cached by the hash
+        of its audio, so identical audio is never transcribed twice. Provider
+        calls share the process's slots fairly with other users' recordings.
 
         Args:
             recording_id: ID of the recording
 
         Returns:
-            Updated Recording with transcription
+            Updated Recording with transcription, or None if it has no chunks
+
+        Raises:
+            RecordingNotFoundError: If the recording was deleted
+            Exception: If transcription fails
         """
+        owner = await self.recording_repo.get_recording(recording_id)
+        if not owner:
+            raise RecordingNotFoundError(recording_id)
+
         # Get all chunks for the recording
-        chunks = self.recording_repo.get_chunks(recording_id)
+        chunks = await self.recording_repo.get_chunks(recording_id)
         if not chunks:
             return None
 
-        # Assemble chunks into a single audio file
+        # Stream the chunks to the provider; writing recording.webm is optional
         chunk_paths = [chunk.audio_blob_path for chunk in chunks]
-        assembled_path = await self.audio_service.assemble_chunks(recording_id, chunk_paths)
+        assembled_path = None
+        if settings.AUDIO_ASSEMBLE_ON_FINISH:
+            assembled_path = await self.audio_service.assemble_chunks(recording_id, chunk_paths)
 
-        # Trigger transcription
-        try:
-            transcription = await self.llm_provider.transcribe_audio(assembled_path)
-        except Exception as e:
-            # If transcription fails, still mark as ended but without transcription
-            print(f"Transcription failed: {e}")
-            transcription = None
+        # Transcribe what no window job or earlier attempt covered, then stitch
+        transcription = await self._stitch_chunk_transcriptions(recording_id, owner.user_id, chunks)
 
         # Mark recording as ended
-        return self.recording_repo.mark_ended(
+        recording = await self.recording_repo.mark_ended(
             recording_id=recording_id,
             full_audio_path=assembled_path,
             transcription=transcription
         )
+        if recording:
+            await self.events.transcript_ready(recording)
+        return recording
+
+    async def transcribe_chunk_window(
+        self,
+        recording_id: str,
+        first_chunk_index: int,
+        last_chunk_index: int
+    ) -> Optional[str]:
+        """
+        Transcribe a window of chunks and store the partial transcript.
+
+        Args:
+            recording_id: ID of the recording
+            first_chunk_index: Index of the first chunk in the window
+            last_chunk_index: Index of the last chunk in the window
+
+        Returns:
+            Partial transcript, or None if the recording does not exist or the
+            window is missing chunks, which are then transcribed at finish
+
+        Raises:
+            Exception: If transcription fails
+        """
+        chunks = await self.recording_repo.get_chunks_in_range(
+            recording_id, first_chunk_index, last_chunk_index
+        )
+        # Never send audio with a gap in it as one segment
+        complete = len(chunks) == last_chunk_index - first_chunk_index + 1
+        recording = await self.recording_repo.get_recording(recording_id) if complete else None
+        if not recording:
+            return None
+
+        header = await self._container_header(recording_id, chunks) if first_chunk_index > 0 else b""
+        transcription, = await self._transcribe_segments(recording_id, recording.user_id, [chunks], header)
+        await self.recording_repo.store_chunk_transcription([chunk.id for chunk in chunks], transcription)
+
+        await self.events.partial_transcript(
+            recording.user_id, recording_id,
+            chunks[0].chunk_index, chunks[-1].chunk_index, transcription
+        )
+        return transcription
+
+    def _segment_stream(self, chunks: List[RecordingChunk], header: bytes) -> ChunkStream:
+        """Stream a contiguous run of chunks, behind the container header unless it starts the recording."""
+        return self.audio_service.stream_chunks(
+            [chunk.audio_blob_path for chunk in chunks],
+            filename=f"segment_{chunks[0].chunk_index:05d}_{chunks[-1].chunk_index:05d}.webm",
+            header=header if chunks[0].chunk_index > 0 else b""
+        )
+
+    async def _container_header(self, recording_id: str, chunks: List[RecordingChunk]) -> bytes:
+        """Read the container header from the recording's first chunk."""
+        if chunks[0].chunk_index != 0:
+            chunks = await self.recording_repo.get_chunks_in_range(recording_id, 0, 0)
+            if not chunks:
+                return b""
+        return await self.audio_service.read_container_header(chunks[0].audio_blob_path)
+
+    def _group_pending_chunks(self, chunks: List[RecordingChunk]) -> List[List[RecordingChunk]]:
+        """
+        Group the chunks without a transcript into runs of consecutive chunks.
+
+        In incremental mode the runs match the window jobs; otherwise they are
+        segments ending at TRANSCRIPTION_SEGMENT_SECONDS or
+        TRANSCRIPTION_SEGMENT_BYTES, whichever is reached first.
+        """
+        window = max(settings.INCREMENTAL_TRANSCRIPTION_WINDOW, 1)
+        pending: List[List[RecordingChunk]] = []
+        seconds, size = 0.0, 0
+
+        for chunk in chunks:
+            if chunk.transcription_text is not None:
+                continue
+            chunk_seconds, chunk_size = chunk.duration_seconds or 0.0, chunk.size_bytes or 0
+            group = pending[-1] if pending else None
+            if group and group[-1].chunk_index + 1 == chunk.chunk_index and (
+                len(group) < window if settings.INCREMENTAL_TRANSCRIPTION
+                else seconds + chunk_seconds <= settings.TRANSCRIPTION_SEGMENT_SECONDS
+                and size + chunk_size <= settings.TRANSCRIPTION_SEGMENT_BYTES
+            ):
+                group.append(chunk)
+                seconds, size = seconds + chunk_seconds, size + chunk_size
+            else:
+                pending.append([chunk])
+                seconds, size = chunk_seconds, chunk_size
+
+        return pending
+
+    async def _stitch_chunk_transcriptions(
+        self,
+        recording_id: str,
+        user_id: str,
+        chunks: List[RecordingChunk]
+    ) -> str:
+        """
+        Join partial transcripts in chunk_index order.
+
+        Chunks that no window job or earlier attempt has covered yet are
+        grouped into segments and transcribed first, concurrently when there
+        are several.
+        """
+        texts = {chunk.chunk_index: chunk.transcription_text for chunk in chunks}
+        pending = self._group_pending_chunks(chunks)
+
+        if pending:
+            header = b""
+            if any(group[0].chunk_index > 0 for group in pending):
+                header = await self._container_header(recording_id, chunks)
+
+            try:
+                transcripts = await self._transcribe_segments(recording_id, user_id, pending, header)
+            except SegmentTranscriptionError as e:
+                # Keep the segments that succeeded, so the retried job skips them
+                await self._store_segment_transcripts(pending, e.transcripts, texts)
+                if all(isinstance(error, ProviderUnavailableError) for error in e.errors.values()):
+                    raise next(iter(e.errors.values())) from e
+                raise
+            await self._store_segment_transcripts(pending, transcripts, texts)
+
+        return " ".join(
+            texts[index].strip() for index in sorted(texts) if texts[index] and texts[index].strip()
+        )
+
+    async def _transcribe_segments(
+        self,
+        recording_id: str,
+        user_id: str,
+        segments: List[List[RecordingChunk]],
+        header: bytes
+    ) -> List[str]:
+        """
+        Transcribe runs of chunks, reusing cached transcripts of identical audio.
+
+        Each provider call waits for the user's turn in the fair-share
+        scheduler, with the run's size in bytes as its cost. Transcripts are
+        cached under the provider that answered, and a transcript cached by
+        any of the providers that may answer is reused.
+
+        Args:
+            recording_id: Recording the chunks belong to, whose deletion purges the new entries
+            user_id: Owner of the recording, whose share the calls use
+            segments: Runs of consecutive chunks
+            header: Container header for runs that do not start the recording
 
-    def add_notes(self, recording_id: str, notes: str) -> Optional[Recording]:
-        """Add or update notes for a recording."""
-        return self.recording_repo.add_notes(recording_id, notes)
+        Returns:
+            One transcript per segment, in order
 
-    def delete_recording(self, recording_id: str) -> bool:
+        Raises:
+            SegmentTranscriptionError: If some segments failed, with the
+                transcripts of the others
         """
-        Delete a recording and all associated files.
+        names = self._provider_names()
+        content_hashes = [await self._segment_content_hashes(group, header) for group in segments]
+        found = await self.transcription_cache.get_many(self.cache_repo, [
+            TranscriptionCache.key(name, settings.LLM_PROVIDER_VERSION, hashes)
+            for hashes in content_hashes for name in names
+        ])
+        transcripts = [
+            next((text for text in found[index * len(names):(index + 1) * len(names)] if text is not None), None)
+            for index in range(len(segments))
+        ]
+        uncached = [index for index, transcription in enumerate(transcripts) if transcription is None]
+        if not uncached:
+            return transcripts
+
+        answered_by: Dict[int, str] = {}
+
+        async def transcribe(index: int) -> str:
+            cost = sum(chunk.size_bytes or 0 for chunk in segments[index])
+            async with self.scheduler.slot(user_id, cost):
+                answered_by[index], transcription = await self._transcribe_stream(
+                    self._segment_stream(segments[index], header)
+                )
+            return transcription
+
+        error: Optional[SegmentTranscriptionError] = None
+        try:
+            if len(uncached) == 1:
+                results = [await transcribe(uncached[0])]
+            else:
+                results = await transcribe_segments(
+                    transcribe, uncached, max_concurrency=settings.TRANSCRIPTION_SEGMENT_CONCURRENCY
+                )
+        except SegmentTranscriptionError as e:
+            results, error = e.transcripts, e
+
+        by_provider: Dict[str, Dict[str, str]] = {}
+        for index, transcription in zip(uncached, results):
+            transcripts[index] = transcription
+            if transcription is not None:
+                name = answered_by[index]
+                key = TranscriptionCache.key(name, settings.LLM_PROVIDER_VERSION, content_hashes[index])
+                by_provider.setdefault(name, {})[key] = transcription
+        for name, transcriptions in by_provider.items():
+            await self.transcription_cache.set_many(self.cache_repo, name, transcriptions, recording_id)
+
+        if error is not None:
+            raise SegmentTranscriptionError(
+                transcripts, {uncached[index]: failure for index, failure in error.errors.items()}
+            ) from error
+        return transcripts
+
+    def _provider_names(self) -> List[str]:
+        """Names of the providers that may answer: the routed ones, or LLM_PROVIDER."""
+        routed = getattr(self.llm_provider, "providers", None)
+        return list(routed) if routed else [settings.LLM_PROVIDER]
+
+    async def _transcribe_stream(self, audio: ChunkStream) -> Tuple[str, str]:
+        """Transcribe a stream, returning the name of the provider that answered and its transcript."""
+        transcribe_routed = getattr(self.llm_provider, "transcribe_stream_routed", None)
+        if transcribe_routed is not None:
+            return await transcribe_routed(audio)
+        return settings.LLM_PROVIDER, await self.llm_provider.transcribe_stream(audio)
+
+    async def _segment_content_hashes(self, chunks: List[RecordingChunk], header: bytes) -> List[str]:
+        """Content hashes making up the cache key of a run of chunks, as streamed by _segment_stream."""
+        content_hashes = [
+            chunk.content_hash or await self.audio_service.hash_chunk(chunk.audio_blob_path)
+            for chunk in chunks
+        ]
+        if chunks[0].chunk_index > 0:
+            content_hashes.insert(0, hashlib.sha256(header).hexdigest())
+        return content_hashes
+
+    async def _store_segment_transcripts(
+        self,
+        segments: List[List[RecordingChunk]],
+        transcripts: List[Optional[str]],
+        texts: Dict[int, Optional[str]]
+    ) -> None:
+        """Store each known segment transcript on its chunks and in texts, keyed by chunk_index."""
+        for group, transcription in zip(segments, transcripts):
+            if transcription is None:
+                continue
+            await self.recording_repo.store_chunk_transcription([chunk.id for chunk in group], transcription)
+            texts[group[0].chunk_index] = transcription
+            for chunk in group[1:]:
+                texts[chunk.chunk_index] = ""
+
+    async def mark_transcription_failed(self, recording_id: str) -> Optional[Recording]:
+        """Mark a recording whose transcription job has exhausted its attempts."""
+        recording = await self.recording_repo.mark_failed(recording_id)
+        if recording:
+            await self.events.status_changed(recording)
+        return recording
+
+    async def add_notes(self, recording_id: str, notes: str, user_id: Optional[str] = None) -> Optional[Recording]:
+        """
+        Add or update notes for a recording.
+
+        Args:
+            recording_id: ID of the recording
+            notes: Notes content
+            user_id: ID of the user who must own the recording, or None
+
+        Returns:
+            Updated recording, or None if it does not exist and user_id is None
+
+        Raises:
+            RecordingNotFoundError: If user_id is given and the recording does not exist
+            RecordingAccessDeniedError: If the recording belongs to another user
+        """
+        return await self.recording_repo.add_notes(recording_id, notes, user_id)
+
+    async def delete_recording(self, recording_id: str, user_id: Optional[str] = None) -> bool:
+        """
+        Delete a recording, all associated files and the transcripts cached from its audio.
+
+        Files and cached transcripts are removed only after the owner-scoped
+        delete succeeded.
 
         Args:
             recording_id: ID of the recording to delete
+            user_id: ID of the user who must own the recording, or None
 
         Returns:
             True if deleted successfully, False otherwise
-        """
-        # Delete files from disk
-        self.audio_service.delete_recording_files(recording_id)
 
+        Raises:
+            RecordingNotFoundError: If user_id is given and the recording does not exist
+            RecordingAccessDeniedError: If the recording belongs to another user
+        """
         # Delete from database
-        return self.recording_repo.delete_recording(recording_id)
+        if not await self.recording_repo.delete_recording(recording_id, user_id):
+            return False
+
+        # Delete files from disk and forget the transcripts of the audio
+        await self.audio_service.delete_recording_files(recording_id)
+        await self.transcription_cache.purge_recording(self.cache_repo, recording_id)
+        if user_id is not None:
+            await self.events.recording_deleted(user_id, recording_id)
+        return True
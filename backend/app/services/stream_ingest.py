@@ -0,0 +1,154 @@
+"""Cutting a continuous audio stream into stored chunks."""
+import asyncio
+import logging
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Optional, Tuple
+from app.models import ChunkUploadResult, RecordingChunk
+from app.services.audio_service import WEBM_CLUSTER_ID
+
+if TYPE_CHECKING:
+    from app.services.recording_service import RecordingService
+
+logger = logging.getLogger(__name__)
+
+# Called with each stored chunk, its upload result and the stream offset stored so far
+ChunkStoredCallback = Callable[[RecordingChunk, ChunkUploadResult, int], Awaitable[None]]
+
+
+class StreamIngest:
+    """
+    Stores a continuous audio stream as recording chunks of about chunk_bytes.
+
+    Bytes fed in are buffered and cut into chunks, which a writer task stores
+    through RecordingService.upload_chunk while more audio arrives. At most
+    max_pending_chunks cut chunks wait for the writer; beyond that feed
+    blocks, so the caller stops reading from the client.
+
+    A WebM stream is cut just before a cluster, the last one starting within
+    chunk_bytes, so every chunk after the first starts on a cluster like an
+    uploaded MediaRecorder chunk, and segments cut from it decode behind the
+    container header. Only a cluster larger than max_chunk_bytes is split.
+    Other streams are cut every chunk_bytes.
+
+    Use as an async context manager: leaving it stores the buffered tail as
+    a final, shorter chunk and waits for the writer to finish.
+    """
+
+    def __init__(
+        self,
+        recording_service: "RecordingService",
+        recording_id: str,
+        next_chunk_index: int,
+        stored_bytes: int,
+        chunk_bytes: int,
+        max_chunk_bytes: int,
+        max_pending_chunks: int,
+        on_chunk_stored: Optional[ChunkStoredCallback] = None
+    ):
+        self.recording_service = recording_service
+        self.recording_id = recording_id
+        self.next_chunk_index = next_chunk_index
+        self.stored_bytes = stored_bytes
+        self.chunk_bytes = chunk_bytes
+        self.max_chunk_bytes = max(max_chunk_bytes, chunk_bytes)
+        self.on_chunk_stored = on_chunk_stored
+        self._buffer = bytearray()
+        self._clustered = False
+        self._pending: asyncio.Queue[Optional[Tuple[int, bytes]]] = asyncio.Queue(max(max_pending_chunks, 1))
+        self._writer: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+
+    async def __aenter__(self) -> "StreamIngest":
+        self._writer = asyncio.create_task(self._write_chunks())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            if self._error is None and (exc_type is None or not issubclass(exc_type, asyncio.CancelledError)):
+                # Audio received before a disconnect is still worth keeping
+                if self._buffer:
+                    await self._cut(len(self._buffer))
+        finally:
+            await self._pending.put(None)
+            await self._writer
+        if exc_type is None and self._error is not None:
+            raise self._error
+
+    async def feed(self, data: bytes) -> None:
+        """
+        Add received audio, cutting a chunk whenever chunk_bytes are buffered.
+
+        Raises:
+            Exception: The error that stopped the writer, if storing a chunk failed
+        """
+        self._buffer += data
+        self._clustered = self._clustered or WEBM_CLUSTER_ID in self._buffer
+        while len(self._buffer) >= self.chunk_bytes:
+            size = self._chunk_size()
+            if size is None:
+                break
+            await self._cut(size)
+
+    async def flush(self) -> None:
+        """
+        Cut the buffered audio into a chunk, e.g. when the client pauses.
+
+        A WebM stream keeps its last cluster buffered, as more of it may follow.
+        """
+        size = len(self._buffer)
+        if self._clustered:
+            size = max(self._buffer.rfind(WEBM_CLUSTER_ID, 1), 0)
+        if size:
+            await self._cut(size)
+
+    def _chunk_size(self) -> Optional[int]:
+        """Bytes to cut from the buffer, or None to wait for the end of a cluster."""
+        if not self._clustered:
+            return self.chunk_bytes
+        boundary = self._buffer.rfind(WEBM_CLUSTER_ID, 1, self.chunk_bytes + len(WEBM_CLUSTER_ID))
+        if boundary > 0:
+            return boundary
+        boundary = self._buffer.find(WEBM_CLUSTER_ID, self.chunk_bytes)
+        if 0 < boundary <= self.max_chunk_bytes:
+            return boundary
+        if len(self._buffer) >= self.max_chunk_bytes:
+            logger.warning(
+                "Splitting a WebM cluster larger than %s bytes of recording %s", self.max_chunk_bytes, self.recording_id
+            )
+            return self.max_chunk_bytes
+        return None
+
+    async def _cut(self, size: int) -> None:
+        if self._error is not None:
+            raise self._error
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        chunk_index = self.next_chunk_index
+        self.next_chunk_index += 1
+        await self._pending.put((chunk_index, data))
+
+    async def _write_chunks(self) -> None:
+        while (item := await self._pending.get()) is not None:
+            if self._error is not None:
+                # Keep draining so feed never blocks on a dead writer
+                continue
+            chunk_index, data = item
+            try:
+                chunk, result = await self.recording_service.upload_chunk(
+                    self.recording_id, chunk_index, _single_buffer(data)
+                )
+            except Exception as e:
+                logger.exception("Storing streamed chunk %s of recording %s failed", chunk_index, self.recording_id)
+                self._error = e
+                continue
+
+            self.stored_bytes += len(data)
+            if self.on_chunk_stored is not None:
+                try:
+                    await self.on_chunk_stored(chunk, result, self.stored_bytes)
+                except Exception:
+                    # The chunk is stored; a client that missed the ack re-syncs on reconnect
+                    logger.debug("Acknowledging streamed chunk %s failed", chunk_index, exc_info=True)
+
+
+async def _single_buffer(data: bytes) -> AsyncIterator[bytes]:
+    yield data
@@ -0,0 +1,144 @@
+"""Cache of transcripts keyed by the content of their audio."""
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional
+from app.core.cache import CacheBackend, create_cache_backend
+from app.core.config import settings
+from app.repositories import AsyncTranscriptionCacheRepository
+
+
+class TranscriptionCache:
+    """
+    Transcripts of audio segments, keyed by a hash of the audio and the provider.
+
+    Entries are stored in the transcription_cache table, behind a front
+    backend (normally a per-process LRU) that answers repeated lookups
+    without a query. Keys are built from the chunks' content hashes, so
+    looking one up never re-reads the audio. Each entry belongs to the
+    recording whose audio it transcribes and is purged when that recording
+    is deleted.
+    """
+
+    def __init__(self, front: Optional[CacheBackend], ttl_seconds: float, enabled: bool = True):
+        self.front = front
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(llm_provider: str, provider_version: str, content_hashes: Iterable[str]) -> str:
+        """
+        Build the cache key of a piece of audio.
+
+        Args:
+            llm_provider: Name of the provider transcribing it
+            provider_version: Version of the provider's model
+            content_hashes: SHA-256 of each part of the audio, in order
+
+        Returns:
+            SHA-256 over the provider, version and content hashes, hex encoded
+        """
+        digest = hashlib.sha256(f"{llm_provider}\n{provider_version}\n".encode())
+        for content_hash in content_hashes:
+            digest.update(f"{content_hash}\n".encode())
+        return digest.hexdigest()
+
+    async def get_many(self, repo: AsyncTranscriptionCacheRepository, keys: List[str]) -> List[Optional[str]]:
+        """
+        Look up transcripts, in the front first and then in one query.
+
+        Args:
+            repo: Repository of the database store
+            keys: Cache keys to look up
+
+        Returns:
+            The transcript of each key, or None on a miss
+        """
+        if not self.enabled:
+            return [None] * len(keys)
+
+        found: Dict[str, str] = {}
+        if self.front is not None:
+            for key in keys:
+                value = await self.front.get(self._front_key(key))
+                if value is not None:
+                    found[key] = value
+
+        missing = [key for key in keys if key not in found]
+        if missing:
+            stored = await repo.get_transcriptions(missing)
+            for key, transcription in stored.items():
+                await self._remember(key, transcription)
+            found.update(stored)
+
+        self.hits += sum(1 for key in keys if key in found)
+        self.misses += sum(1 for key in keys if key not in found)
+        return [found.get(key) for key in keys]
+
+    async def set_many(
+        self,
+        repo: AsyncTranscriptionCacheRepository,
+        llm_provider: str,
+        transcriptions: Dict[str, str],
+        recording_id: Optional[str] = None
+    ) -> None:
+        """
+        Cache transcripts in the database store and the front.
+
+        Args:
+            repo: Repository of the database store
+            llm_provider: Name of the provider that made them
+            transcriptions: Transcripts by cache key
+            recording_id: Recording whose audio was transcribed
+        """
+        if not self.enabled or not transcriptions:
+            return
+
+        await repo.store_transcriptions(llm_provider, transcriptions, recording_id)
+        for key, transcription in transcriptions.items():
+            await self._remember(key, transcription)
+
+    async def purge_recording(self, repo: AsyncTranscriptionCacheRepository, recording_id: str) -> int:
+        """
+        Forget the transcripts cached from a deleted recording's audio.
+
+        Entries are deleted from the database store and from the front; a
+        per-process front of another process keeps them until its TTL.
+
+        Args:
+            repo: Repository of the database store
+            recording_id: ID of the deleted recording
+
+        Returns:
+            Number of entries deleted
+        """
+        keys = await repo.delete_recording_entries(recording_id)
+        if self.front is not None:
+            for key in keys:
+                await self.front.delete(self._front_key(key))
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    async def _remember(self, key: str, transcription: str) -> None:
+        if self.front is not None:
+            await self.front.set(self._front_key(key), transcription, self.ttl_seconds)
+
+    @staticmethod
+    def _front_key(key: str) -> str:
+        return f"transcription:{key}"
+
+
+# Process-wide cache used by RecordingService
+transcription_cache = TranscriptionCache(
+    create_cache_backend(settings.TRANSCRIPTION_CACHE_BACKEND, settings.TRANSCRIPTION_CACHE_MAX_SIZE),
+    settings.TRANSCRIPTION_CACHE_TTL_SECONDS,
+    settings.TRANSCRIPTION_CACHE_ENABLED
+)
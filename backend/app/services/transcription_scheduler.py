@@ -0,0 +1,161 @@
+"""Fair sharing of transcription provider calls between users."""
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.llm.routing import LatencyWindow
+
+QueueEntry = Tuple[float, int, float, asyncio.Future]
+
+
+class FairShareScheduler:
+    """
+    Weighted fair queueing of provider calls per user, shortest job first.
+
+    Each call waits for a slot, given while fewer than max_concurrency calls
+    are in flight and its user has fewer than per_user_concurrency. Among
+    waiting users, the next slot goes to the one whose call would finish
+    first in virtual time: a user's virtual finish time grows by the cost
+    of each call divided by the user's weight, and catches up with the
+    scheduler's virtual time whenever the user starts queueing again, so
+    idle users cannot bank credit. A user's own calls run shortest first.
+    Small dictations therefore overtake the segments of long recordings,
+    while long recordings keep their share.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        per_user_concurrency: int,
+        weights: Optional[Dict[str, float]] = None,
+        wait_window: int = 1000
+    ):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.per_user_concurrency = max(per_user_concurrency, 1)
+        self.weights = weights or {}
+        self.dispatched = 0
+        self.waits = LatencyWindow(wait_window)
+        self._queues: Dict[str, List[QueueEntry]] = {}
+        self._running: Dict[str, int] = {}
+        self._finish: Dict[str, float] = {}
+        self._virtual_time = 0.0
+        self._in_flight = 0
+        self._sequence = itertools.count()
+
+    @classmethod
+    def from_settings(cls) -> "FairShareScheduler":
+        """Build a scheduler from the TRANSCRIPTION_SCHEDULER_* settings."""
+        return cls(
+            max_concurrency=settings.TRANSCRIPTION_SCHEDULER_MAX_CONCURRENCY,
+            per_user_concurrency=settings.TRANSCRIPTION_SCHEDULER_PER_USER_CONCURRENCY,
+            weights=settings.TRANSCRIPTION_SCHEDULER_USER_WEIGHTS
+        )
+
+    @asynccontextmanager
+    async def slot(self, user_id: str, cost: float) -> AsyncIterator[None]:
+        """
+        Wait for this user's turn, and hold a slot for the body of the block.
+
+        Args:
+            user_id: User the call is made for
+            cost: Size of the call, e.g. the bytes of audio sent
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (max(cost, 1.0), next(self._sequence), time.monotonic(), waiter)
+        if user_id not in self._queues:
+            self._finish[user_id] = max(self._virtual_time, self._finish.get(user_id, 0.0))
+        heapq.heappush(self._queues.setdefault(user_id, []), entry)
+        self._dispatch()
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release(user_id)
+            else:
+                self._discard(user_id, entry)
+            raise
+
+        try:
+            yield
+        finally:
+            self._release(user_id)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Queue depth, calls in flight and recent wait times as a JSON-serializable dict."""
+        now = time.monotonic()
+        enqueued = [entry[2] for queue in self._queues.values() for entry in queue]
+        p50, p95 = self.waits.percentile(0.5), self.waits.percentile(0.95)
+        return {
+            "queued": len(enqueued),
+            "users_queued": len(self._queues),
+            "max_user_queued": max((len(queue) for queue in self._queues.values()), default=0),
+            "in_flight": self._in_flight,
+            "users_in_flight": len(self._running),
+            "dispatched": self.dispatched,
+            "wait_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "wait_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "oldest_wait_ms": round((now - min(enqueued)) * 1000, 1) if enqueued else None,
+        }
+
+    def _dispatch(self) -> None:
+        """Hand free slots to the waiting calls with the earliest virtual finish times."""
+        while self._in_flight < self.max_concurrency:
+            best: Optional[Tuple[Tuple[float, int], str, float, float]] = None
+            for user_id, queue in self._queues.items():
+                if self._running.get(user_id, 0) >= self.per_user_concurrency:
+                    continue
+                cost, sequence = queue[0][0], queue[0][1]
+                start = self._finish[user_id]
+                finish = start + cost / self.weights.get(user_id, 1.0)
+                if best is None or (finish, sequence) < best[0]:
+                    best = ((finish, sequence), user_id, start, finish)
+            if best is None:
+                return
+
+            _, user_id, start, finish = best
+            queue = self._queues[user_id]
+            _, _, enqueued_at, waiter = heapq.heappop(queue)
+            if not queue:
+                del self._queues[user_id]
+            self._virtual_time = max(self._virtual_time, start)
+            self._finish[user_id] = finish
+            self._running[user_id] = self._running.get(user_id, 0) + 1
+            self._in_flight += 1
+            self.dispatched += 1
+            self.waits.record(time.monotonic() - enqueued_at, True)
+            waiter.set_result(None)
+
+    def _release(self, user_id: str) -> None:
+        """Free a slot held by a user and pass it on."""
+        self._in_flight -= 1
+        self._running[user_id] -= 1
+        if not self._running[user_id]:
+            del self._running[user_id]
+        self._forget_idle(user_id)
+        self._dispatch()
+
+    def _discard(self, user_id: str, entry: QueueEntry) -> None:
+        """Remove a call cancelled while it was waiting."""
+        queue = self._queues.get(user_id, [])
+        if entry in queue:
+            queue.remove(entry)
+            heapq.heapify(queue)
+        if not queue:
+            self._queues.pop(user_id, None)
+        self._forget_idle(user_id)
+
+    def _forget_idle(self, user_id: str) -> None:
+        """Drop the state of a user with nothing queued or running whose finish time has passed."""
+        if (
+            user_id not in self._queues
+            and user_id not in self._running
+            and self._finish.get(user_id, 0.0) <= self._virtual_time
+        ):
+            self._finish.pop(user_id, None)
+
+
+transcription_scheduler = FairShareScheduler.from_settings()
@@ -0,0 +1,85 @@
+"""Cache of authenticated users."""
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+from app.core.cache import CacheBackend, create_cache_backend
+from app.core.config import settings
+from app.models import User
+
+# User columns holding datetimes, serialized as ISO 8601
+_DATETIME_COLUMNS = {"created_at", "updated_at"}
+
+
+class UserCache:
+    """
+    Cache of users keyed by ID, used to authenticate requests without a query.
+
+    Users are stored as JSON snapshots of their columns and returned as
+    detached User instances, so cached users can be read but not lazy-load
+    relationships.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(user_id: str) -> str:
+        return f"user:{user_id}"
+
+    async def get(self, user_id: str) -> Optional[User]:
+        """Get a cached user, or None on a miss."""
+        if self.backend is None:
+            return None
+
+        value = await self.backend.get(self._key(user_id))
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self._deserialize(value)
+
+    async def set(self, user: User) -> None:
+        """Cache a user."""
+        if self.backend is not None:
+            await self.backend.set(self._key(user.id), self._serialize(user), self.ttl_seconds)
+
+    async def invalidate(self, user_id: str) -> None:
+        """Drop a user, e.g. after their profile changed."""
+        if self.backend is not None:
+            await self.backend.delete(self._key(user_id))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    @staticmethod
+    def _serialize(user: User) -> str:
+        data = {}
+        for column in User.__table__.columns:
+            value = getattr(user, column.name)
+            data[column.name] = value.isoformat() if isinstance(value, datetime) else value
+        return json.dumps(data)
+
+    @staticmethod
+    def _deserialize(value: str) -> User:
+        data = json.loads(value)
+        for name in _DATETIME_COLUMNS:
+            if data.get(name):
+                data[name] = datetime.fromisoformat(data[name])
+        return User(**data)
+
+
+# Process-wide cache used by get_current_user
+user_cache = UserCache(
+    create_cache_backend(settings.USER_CACHE_BACKEND, settings.USER_CACHE_MAX_SIZE),
+    settings.USER_CACHE_TTL_SECONDS
+)
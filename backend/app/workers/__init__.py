@@ -0,0 +1,6 @@
+"""Background workers."""
+from .transcription_worker import TranscriptionWorker
+
+__all__ = [
+    "TranscriptionWorker",
+]
@@ -0,0 +1,35 @@
+"""
+Run the transcription worker pool as a standalone process.
+
+Usage:
+    python -m app.workers
+
+Set TRANSCRIPTION_WORKER_MODE=external on the API so it does not start its
+own in-process pool.
+"""
+import asyncio
+import logging
+import signal
+from app.llm import provider_registry
+from app.workers.transcription_worker import TranscriptionWorker
+
+
+async def main() -> None:
+    """Run the worker pool until SIGINT or SIGTERM."""
+    await provider_registry.startup()
+    worker = TranscriptionWorker()
+    await worker.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await stop.wait()
+    await worker.stop()
+    await provider_registry.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
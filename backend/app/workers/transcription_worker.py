@@ -0,0 +1,181 @@
+"""Worker pool that drains the persistent transcription job queue."""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import DatabaseSession, get_session_factory, run_sync, close_session
+from app.llm import ProviderUnavailableError
+from app.repositories import (
+    AsyncMySQLTranscriptionJobRepository,
+    AsyncMySQLTranscriptionCacheRepository,
+    RecordingNotFoundError,
+)
+from app.services.recording_service import RecordingService
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptionWorker:
+    """
+    Pool of asyncio tasks that claim and run queued transcription jobs.
+
+    The pool can run inside the API process (started from the FastAPI
+    lifespan) or on its own via ``python -m app.workers``. Jobs are claimed
+    through the database, so any number of pools can share one queue.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+        prune_interval: Optional[float] = None,
+        session_factory: Optional[Callable[[], DatabaseSession]] = None
+    ):
+        self.concurrency = concurrency or settings.TRANSCRIPTION_WORKER_CONCURRENCY
+        self.poll_interval = poll_interval or settings.TRANSCRIPTION_JOB_POLL_INTERVAL_SECONDS
+        self.max_attempts = max_attempts or settings.TRANSCRIPTION_JOB_MAX_ATTEMPTS
+        self.lease_seconds = lease_seconds or settings.TRANSCRIPTION_JOB_LEASE_SECONDS
+        self.prune_interval = prune_interval or settings.TRANSCRIPTION_CACHE_PRUNE_INTERVAL_SECONDS
+        self.session_factory = session_factory or get_session_factory()
+        self._stopping = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Recover abandoned jobs, start the worker tasks and the task expiring old cached transcripts."""
+        self._stopping.clear()
+        await self.requeue_stale_jobs()
+        self._tasks = [
+            asyncio.create_task(self._run_loop(), name=f"transcription-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        self._tasks.append(asyncio.create_task(self._prune_loop(), name="transcription-cache-pruner"))
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """
+        Stop the worker tasks.
+
+        In-flight jobs get ``timeout`` seconds to finish; jobs that are
+        cancelled stay running in the database and are re-queued once their
+        lease expires.
+        """
+        self._stopping.set()
+        if not self._tasks:
+            return
+
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+    async def requeue_stale_jobs(self) -> int:
+        """Re-queue running jobs whose lease has expired, e.g. after a crash."""
+        db = self.session_factory()
+        try:
+            started_before = datetime.utcnow() - timedelta(seconds=self.lease_seconds)
+            return await AsyncMySQLTranscriptionJobRepository(db).requeue_stale_jobs(started_before)
+        finally:
+            await close_session(db)
+
+    async def prune_transcription_cache(self) -> int:
+        """Delete cached transcripts older than TRANSCRIPTION_CACHE_RETENTION_DAYS."""
+        db = self.session_factory()
+        try:
+            created_before = datetime.utcnow() - timedelta(days=settings.TRANSCRIPTION_CACHE_RETENTION_DAYS)
+            return await AsyncMySQLTranscriptionCacheRepository(db).delete_entries_before(created_before)
+        finally:
+            await close_session(db)
+
+    async def run_once(self) -> bool:
+        """
+        Claim and process a single job.
+
+        Returns:
+            True if a job was processed, False if the queue was empty or the
+            provider's circuit breaker is open
+        """
+        db = self.session_factory()
+        try:
+            job_repo = AsyncMySQLTranscriptionJobRepository(db)
+            job = await job_repo.claim_next_job()
+            if not job:
+                return False
+
+            job_id = job.id
+            recording_id = job.recording_id
+            attempts = job.attempts
+            is_segment_job = job.is_segment_job
+            recording_service = RecordingService(db)
+
+            try:
+                if is_segment_job:
+                    await recording_service.transcribe_chunk_window(
+                        recording_id, job.first_chunk_index, job.last_chunk_index
+                    )
+                    await job_repo.mark_completed(job_id)
+                    return True
+
+                recording = await recording_service.transcribe_recording(recording_id)
+            except RecordingNotFoundError as e:
+                # Deleted while queued; there is nothing left to transcribe or mark as failed
+                await run_sync(db, Session.rollback)
+                await job_repo.mark_failed(job_id, str(e))
+                return True
+            except ProviderUnavailableError as e:
+                # Not the job's fault: put it back untouched and let the loop back off
+                await run_sync(db, Session.rollback)
+                await job_repo.release_job(job_id, str(e))
+                return False
+            except Exception as e:
+                await run_sync(db, Session.rollback)
+                retry = attempts < self.max_attempts
+                logger.warning(
+                    "Transcription job %s failed (attempt %s/%s): %s",
+                    job_id, attempts, self.max_attempts, e
+                )
+                await job_repo.mark_failed(job_id, str(e), retry=retry)
+                # A failed chunk window is picked up again when the recording is finished
+                if not retry and not is_segment_job:
+                    await recording_service.mark_transcription_failed(recording_id)
+                return True
+
+            if recording is None:
+                await job_repo.mark_failed(job_id, "Recording has no chunks to transcribe")
+                await recording_service.mark_transcription_failed(recording_id)
+            else:
+                await job_repo.mark_completed(job_id)
+            return True
+        finally:
+            await close_session(db)
+
+    async def _prune_loop(self) -> None:
+        """Prune the transcription cache now and every prune_interval seconds until stopped."""
+        while not self._stopping.is_set():
+            try:
+                await self.prune_transcription_cache()
+            except Exception:
+                logger.exception("Pruning the transcription cache failed")
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.prune_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_loop(self) -> None:
+        """Process jobs until stopped, sleeping while the queue is empty."""
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Transcription worker iteration failed")
+                processed = False
+
+            if not processed:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
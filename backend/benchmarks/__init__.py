@@ -0,0 +1,21 @@
+"""
+Performance benchmarks.
+
+Run from the backend directory, e.g. ``python -m benchmarks.llm_http_pool``.
+Benchmarks do not need a .env file: required settings get placeholder
+values before the application modules are imported.
+"""
+import os
+
+for _name, _value in {
+    "GOOGLE_CLIENT_ID": "benchmark",
+    "GOOGLE_CLIENT_SECRET": "benchmark",
+    "GOOGLE_REDIRECT_URI": "http://localhost:8000/auth/google/callback",
+    "JWT_SECRET": "benchmark-secret",
+    "MYSQL_URL": "sqlite://",
+    "LLM_API_KEY": "benchmark",
+    "LLM_API_URL": "http://127.0.0.1:1/v1/transcribe",
+    "AUDIO_STORAGE_PATH": "/tmp/audio_storage_benchmark",
+    "ENCRYPTION_KEY": "benchmark",
+}.items():
+    os.environ.setdefault(_name, _value)
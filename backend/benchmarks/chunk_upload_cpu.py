@@ -0,0 +1,140 @@
+"""
+Server CPU time per MB: multipart POST vs raw PUT chunk uploads.
+
+Runs the real recordings router in a separate process, backed by a SQLite
+file and with authentication overridden, then uploads chunks through
+either route and reads the server's process CPU time before and after:
+
+* ``multipart`` - ``POST /recordings/{id}/chunks`` (python-multipart parsing,
+  spooled to a temporary file by Starlette before the handler runs)
+* ``raw``       - ``PUT /recordings/{id}/chunks/{chunk_index}`` with an
+  application/octet-stream body streamed straight into AudioService
+
+Usage:
+    python -m benchmarks.chunk_upload_cpu --uploads 200 --chunk-bytes 1048576
+
+Sample run (1 vCPU shared by server and load generator, 4 concurrent
+uploaders):
+
+    1 MiB chunks x 200
+    multipart  uploads  200  MB  200.0  server CPU 3.55 s   17.7 ms/MB  17.7 ms/req
+    raw        uploads  200  MB  200.0  server CPU 2.05 s   10.3 ms/MB  10.3 ms/req
+
+    160 KiB chunks x 1000
+    multipart  uploads 1000  MB  156.2  server CPU 9.18 s   58.7 ms/MB   9.2 ms/req
+    raw        uploads 1000  MB  156.2  server CPU 7.95 s   50.9 ms/MB   8.0 ms/req
+
+Per-request cost includes the SQLite insert and the ownership lookup,
+which both routes share; the per-MB difference is the multipart parser
+and the extra copy through Starlette's spooled temporary file, so the
+raw route pays off most for large chunks.
+"""
+import argparse
+import asyncio
+import functools
+import os
+import tempfile
+import time
+import httpx
+from benchmarks.stub_server import serve
+
+USER_ID = "benchmark-user"
+
+
+def create_app(storage_path: str):
+    """Build the API under test inside the server process."""
+    from fastapi import FastAPI
+    from app.core import settings
+    from app.core.database import Base, engine, SessionLocal
+    from app.models import User
+    from app.routers import recordings
+    from app.routers.dependencies import get_current_user
+
+    settings.AUDIO_STORAGE_PATH = storage_path
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = db.merge(User(id=USER_ID, google_id=USER_ID, email="benchmark@example.com"))
+    db.commit()
+    db.refresh(user)
+    db.expunge(user)
+    db.close()
+
+    app = FastAPI()
+    app.include_router(recordings.router)
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    @app.get("/__cpu")
+    async def cpu():
+        return {"cpu": time.process_time()}
+
+    return app
+
+
+async def _server_cpu(client: httpx.AsyncClient) -> float:
+    response = await client.get("/__cpu")
+    return response.json()["cpu"]
+
+
+async def _upload(client: httpx.AsyncClient, mode: str, recording_id: str, chunk_index: int, payload: bytes) -> None:
+    if mode == "multipart":
+        response = await client.post(
+            f"/recordings/{recording_id}/chunks",
+            data={"chunk_index": str(chunk_index), "duration_seconds": "10.0"},
+            files={"audio_chunk": (f"chunk_{chunk_index}.webm", payload, "audio/webm")},
+        )
+    else:
+        response = await client.put(
+            f"/recordings/{recording_id}/chunks/{chunk_index}",
+            content=payload,
+            headers={"Content-Type": "application/octet-stream", "X-Chunk-Duration": "10.0"},
+        )
+    response.raise_for_status()
+
+
+async def _measure(base_url: str, args) -> None:
+    payload = os.urandom(args.chunk_bytes)
+    next_index = iter(range(args.uploads))
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        recording_id = (await client.post("/recordings/")).json()["id"]
+
+        async def uploader() -> None:
+            for chunk_index in next_index:
+                await _upload(client, args.mode, recording_id, chunk_index, payload)
+
+        # Warm up imports and connections before sampling CPU time
+        await _upload(client, args.mode, recording_id, args.uploads, payload)
+        started = await _server_cpu(client)
+        await asyncio.gather(*(uploader() for _ in range(args.concurrency)))
+        cpu = await _server_cpu(client) - started
+
+    megabytes = args.uploads * args.chunk_bytes / (1024 * 1024)
+    print(
+        f"{args.mode:<10} uploads {args.uploads:>4}  MB {megabytes:>6.1f}  "
+        f"server CPU {cpu:.2f} s  {cpu / megabytes * 1000:>5.1f} ms/MB  "
+        f"{cpu / args.uploads * 1000:>4.1f} ms/req"
+    )
+
+
+def main(args) -> None:
+    with tempfile.TemporaryDirectory(dir=args.storage_dir) as storage_path:
+        # The server process imports the app after the fork, so it picks this up
+        os.environ["MYSQL_URL"] = f"sqlite:///{storage_path}/benchmark.db"
+        factory = functools.partial(create_app, storage_path)
+        with serve(factory) as base_url:
+            asyncio.run(_measure(base_url, args))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["multipart", "raw", "both"], default="both")
+    parser.add_argument("--uploads", type=int, default=200)
+    parser.add_argument("--chunk-bytes", type=int, default=1024 * 1024)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--storage-dir", default=None, help="Parent directory for chunk files")
+    arguments = parser.parse_args()
+
+    modes = ["multipart", "raw"] if arguments.mode == "both" else [arguments.mode]
+    for mode in modes:
+        arguments.mode = mode
+        main(arguments)
@@ -0,0 +1,67 @@
+"""
+Microbenchmark: per-request authentication overhead with and without the
+verified-JWT payload cache.
+
+Times ``decode_access_token`` on its own and the whole ``get_current_user``
+dependency (with the user served from the user cache, so no query runs),
+once with the token cache disabled and once with it warm.
+
+Usage:
+    python -m benchmarks.jwt_auth --iterations 20000
+
+Sample run (1 vCPU):
+
+    decode_access_token  uncached    98.7 us/request
+    get_current_user     uncached   148.7 us/request
+    decode_access_token  cached       2.2 us/request
+    get_current_user     cached      44.2 us/request
+
+The remaining get_current_user cost is mostly rebuilding the cached User.
+"""
+import argparse
+import asyncio
+import time
+from fastapi.security import HTTPAuthorizationCredentials
+
+
+def _per_call_us(fn, iterations: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def _per_await_us(fn, iterations: int) -> float:
+    await fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main(args) -> None:
+    from app.core import security
+    from app.core.security import TokenCache, create_access_token, decode_access_token
+    from app.models import User
+    from app.routers import dependencies
+    from app.services import user_cache
+
+    token = create_access_token({"sub": "benchmark-user", "email": "benchmark@example.com"})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    asyncio.run(user_cache.set(User(id="benchmark-user", google_id="benchmark", email="benchmark@example.com")))
+
+    for label, max_size in (("uncached", 0), ("cached", 10000)):
+        security.token_cache = TokenCache(max_size)
+        decode_us = _per_call_us(lambda: decode_access_token(token), args.iterations)
+        auth_us = asyncio.run(
+            _per_await_us(lambda: dependencies.get_current_user(credentials, None), args.iterations)
+        )
+        print(f"decode_access_token  {label:<9} {decode_us:>6.1f} us/request")
+        print(f"get_current_user     {label:<9} {auth_us:>6.1f} us/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    main(parser.parse_args())
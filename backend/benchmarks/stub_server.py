@@ -0,0 +1,250 @@
+"""
+Local HTTP(S) stub servers for benchmarks and tests.
+
+FaultInjectingStub stands in for the transcription API and fails requests
+as configured. Run it and point LLM_API_URL at it to watch retries,
+backoff, the adaptive concurrency limit and the circuit breaker react to a
+misbehaving provider:
+
+    python -m benchmarks.stub_server --port 9000 --failure-rate 0.2 --throttle-rate 0.1
+    LLM_API_URL=http://localhost:9000/v1/transcribe
+
+Faults can be changed while it runs with POST /faults, and GET /stats
+reports what it has served.
+"""
+import argparse
+import asyncio
+import datetime
+import ipaddress
+import multiprocessing
+import os
+import random
+import socket
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def create_self_signed_certificate(directory: Path) -> Tuple[str, str]:
+    """
+    Write a throwaway self-signed certificate for 127.0.0.1.
+
+    Returns:
+        Paths to the certificate and private key files
+    """
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.utcnow()
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .add_extension(
+            x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]),
+            critical=False,
+        )
+        .sign(key, hashes.SHA256())
+    )
+
+    cert_path = directory / "stub.crt"
+    key_path = directory / "stub.key"
+    cert_path.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.TraditionalOpenSSL,
+            serialization.NoEncryption(),
+        )
+    )
+    return str(cert_path), str(key_path)
+
+
+def _run_server(app_factory, port: int, ssl_certfile: Optional[str], ssl_keyfile: Optional[str]) -> None:
+    uvicorn.run(
+        app_factory(),
+        host="127.0.0.1",
+        port=port,
+        log_level="error",
+        ssl_certfile=ssl_certfile,
+        ssl_keyfile=ssl_keyfile,
+        backlog=4096,
+        timeout_keep_alive=60,
+    )
+
+
+@contextmanager
+def serve(app_factory, tls: bool = False) -> Iterator[str]:
+    """
+    Run an ASGI app with uvicorn in a separate process.
+
+    The server gets its own interpreter so it does not compete with the
+    client under test for the GIL. With ``tls`` a throwaway self-signed
+    certificate is generated and exported through SSL_CERT_FILE, so
+    clients verify it like a real provider certificate.
+
+    Args:
+        app_factory: Module-level callable returning the ASGI app
+        tls: Serve HTTPS instead of HTTP
+
+    Yields:
+        Base URL of the running server
+    """
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as directory:
+        ssl_certfile: Optional[str] = None
+        ssl_keyfile: Optional[str] = None
+        if tls:
+            ssl_certfile, ssl_keyfile = create_self_signed_certificate(Path(directory))
+            os.environ["SSL_CERT_FILE"] = ssl_certfile
+
+        process = multiprocessing.Process(
+            target=_run_server,
+            args=(app_factory, port, ssl_certfile, ssl_keyfile),
+            daemon=True,
+        )
+        process.start()
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    process.terminate()
+                    raise RuntimeError("Stub server did not start")
+                time.sleep(0.05)
+
+        try:
+            yield f"{'https' if tls else 'http'}://127.0.0.1:{port}"
+        finally:
+            process.terminate()
+            process.join(timeout=5)
+            if tls:
+                os.environ.pop("SSL_CERT_FILE", None)
+
+
+class FaultConfig(BaseModel):
+    """Faults injected into transcription requests."""
+
+    failure_rate: float = 0.0  # Share of requests answered with 503
+    throttle_rate: float = 0.0  # Share of requests answered with 429
+    retry_after_seconds: Optional[float] = None  # Retry-After sent with 429 and 503 responses
+    latency_seconds: float = 0.0  # Delay before answering
+    max_concurrency: Optional[int] = None  # Requests beyond this many in flight get 429
+    script: List[int] = []  # Status codes for the next requests, before the rates apply
+
+
+class FaultInjectingStub:
+    """ASGI app mimicking the transcription API, failing requests as configured."""
+
+    def __init__(self, faults: Optional[FaultConfig] = None, seed: Optional[int] = None):
+        self.faults = faults or FaultConfig()
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.statuses: Dict[int, int] = {}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.app = self._create_app()
+
+    def _create_app(self) -> FastAPI:
+        app = FastAPI(title="Transcription API stub")
+
+        @app.post("/v1/transcribe")
+        async def transcribe(request: Request):
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                body = await request.body()
+                if self.faults.latency_seconds:
+                    await asyncio.sleep(self.faults.latency_seconds)
+                status = self._pick_status()
+            finally:
+                self.in_flight -= 1
+
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status != 200:
+                headers = {}
+                if status in (429, 503) and self.faults.retry_after_seconds is not None:
+                    headers["Retry-After"] = f"{self.faults.retry_after_seconds:g}"
+                return JSONResponse({"error": "injected fault"}, status_code=status, headers=headers)
+            return {"transcription": f"Transcribed {len(body)} bytes"}
+
+        @app.post("/faults")
+        async def set_faults(faults: FaultConfig):
+            self.faults = faults
+            return faults
+
+        @app.get("/stats")
+        async def stats():
+            return self.stats()
+
+        return app
+
+    def _pick_status(self) -> int:
+        if self.faults.script:
+            return self.faults.script.pop(0)
+        if self.faults.max_concurrency is not None and self.in_flight > self.faults.max_concurrency:
+            return 429
+        roll = self.random.random()
+        if roll < self.faults.failure_rate:
+            return 503
+        if roll < self.faults.failure_rate + self.faults.throttle_rate:
+            return 429
+        return 200
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests served so far, by response status."""
+        return {
+            "requests": self.requests,
+            "statuses": self.statuses,
+            "peak_in_flight": self.peak_in_flight,
+        }
+
+
+def main() -> None:
+    """Run the fault-injecting stub server."""
+    parser = argparse.ArgumentParser(description="Fault-injecting stand-in for the transcription API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=None)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--max-concurrency", type=int, default=None)
+    args = parser.parse_args()
+
+    stub = FaultInjectingStub(FaultConfig(
+        failure_rate=args.failure_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after_seconds=args.retry_after,
+        latency_seconds=args.latency,
+        max_concurrency=args.max_concurrency,
+    ))
+    uvicorn.run(stub.app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,43 @@
 """Main FastAPI application."""
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from app.core import settings, Base, engine
+from app.core.query_stats import QueryStatsMiddleware
+from app.llm import provider_registry
 from app.routers import auth_router, recordings_router
+from app.services import transcription_scheduler
+from app.workers import TranscriptionWorker
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared provider connections and run the in-process worker pool."""
+    await provider_registry.startup()
+
+    worker = None
+    if settings.TRANSCRIPTION_WORKER_MODE == "inprocess":
+        worker = TranscriptionWorker()
+        await worker.start()
+
+    yield
+
+    if worker:
+        await worker.stop()
+
+    await provider_registry.shutdown()
+
+
 # Create FastAPI application
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="HIPAA-compliant audio transcription service for healthcare professionals",
+    lifespan=lifespan,
 )
 
 # Add session middleware (required for OAuth)
@@ -27,6 +52,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Count queries and database time per request
+app.add_middleware(QueryStatsMiddleware)
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(recordings_router)
@@ -48,6 +76,16 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Transcription provider call, routing and scheduling metrics for this process."""
+    return {
+        "llm_providers": provider_registry.metrics(),
+        "llm_routing": provider_registry.routing_metrics(),
+        "transcription_scheduler": transcription_scheduler.snapshot(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,73 @@
+"""Shared pytest helpers."""
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.cache import LocalCacheBackend
+from app.core.database import Base
+from app.core.query_stats import capture_engine_queries
+from app.services.transcription_cache import transcription_cache
+from app.services.transcription_scheduler import FairShareScheduler
+
+
+@pytest.fixture
+def engine():
+    """Create an in-memory database shared by every session and thread."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def session_factory(engine):
+    """Create a session factory over the test database."""
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    """Create a fake audio file."""
+    path = tmp_path / "audio.webm"
+    path.write_bytes(b"fake audio data")
+    return str(path)
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Assert that a block runs at most a given number of queries on an engine.
+
+    Usage:
+        with query_budget(engine, 3):
+            client.patch(f"/recordings/{recording_id}/pause")
+    """
+    @contextmanager
+    def budget(engine, max_queries: int):
+        with capture_engine_queries(engine) as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            f"Query budget of {max_queries} exceeded:\n{stats.report()}"
+        )
+
+    return budget
+
+
+@pytest.fixture(autouse=True)
+def transcription_cache_front(monkeypatch):
+    """Give each test an empty front for the process-wide transcription cache."""
+    front = LocalCacheBackend(max_size=100)
+    monkeypatch.setattr(transcription_cache, "front", front)
+    return front
+
+
+@pytest.fixture(autouse=True)
+def transcription_scheduler(monkeypatch):
+    """Give each test an idle process-wide transcription scheduler."""
+    scheduler = FairShareScheduler(max_concurrency=8, per_user_concurrency=4)
+    monkeypatch.setattr("app.services.recording_service.transcription_scheduler", scheduler)
+    return scheduler
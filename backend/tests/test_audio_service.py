@@ -0,0 +1,154 @@
+"""Tests for audio storage."""
+import asyncio
+import time
+import pytest
+from app.services import AudioService, ChunkTooLargeError
+from app.services.audio_service import WEBM_CLUSTER_ID, WEBM_MAGIC
+from app.services import file_io
+
+
+@pytest.fixture
+def audio_service(tmp_path, monkeypatch):
+    """Create an AudioService storing files under a temporary directory."""
+    monkeypatch.setattr("app.services.audio_service.settings.AUDIO_STORAGE_PATH", str(tmp_path))
+    return AudioService()
+
+
+async def _buffers(*parts):
+    for part in parts:
+        yield part
+
+
+class TestAudioService:
+    """Test cases for AudioService."""
+
+    @pytest.mark.asyncio
+    async def test_save_chunk_stream_writes_buffers_in_order(self, audio_service, tmp_path):
+        """Test that streamed buffers are renamed into place as one chunk file."""
+        path = await audio_service.save_chunk_stream("rec-0", 3, _buffers(b"ab", b"cd", b"ef"))
+
+        assert path.endswith("chunk_00003.webm")
+        assert open(path, "rb").read() == b"abcdef"
+        assert sorted(p.name for p in (tmp_path / "rec-0" / "chunks").iterdir()) == ["chunk_00003.webm"]
+
+    @pytest.mark.asyncio
+    async def test_save_chunk_stream_enforces_size_cap(self, audio_service, tmp_path):
+        """Test that an oversized chunk is rejected and leaves no file behind."""
+        with pytest.raises(ChunkTooLargeError):
+            await audio_service.save_chunk_stream(
+                "rec-0", 0, _buffers(b"1234", b"5678"), max_bytes=6
+            )
+
+        assert list((tmp_path / "rec-0" / "chunks").iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_save_chunk_creates_directory_once(self, audio_service, monkeypatch):
+        """Test that chunk directories are created once and then cached."""
+        mkdir_calls = []
+        original_mkdir = file_io.Path.mkdir
+
+        def counting_mkdir(path, *args, **kwargs):
+            mkdir_calls.append(path)
+            return original_mkdir(path, *args, **kwargs)
+
+        monkeypatch.setattr(file_io.Path, "mkdir", counting_mkdir)
+
+        first = await audio_service.save_chunk("rec-1", 0, b"chunk zero")
+        calls_after_first_chunk = len(mkdir_calls)
+        second = await audio_service.save_chunk("rec-1", 1, b"chunk one")
+
+        assert open(first, "rb").read() == b"chunk zero"
+        assert open(second, "rb").read() == b"chunk one"
+        assert calls_after_first_chunk > 0
+        assert len(mkdir_calls) == calls_after_first_chunk
+
+    @pytest.mark.asyncio
+    async def test_delete_recording_files_removes_directory(self, audio_service, tmp_path):
+        """Test that a recording's files are removed and its directory is created again on the next save."""
+        await audio_service.save_chunk("rec-2", 0, b"chunk zero")
+
+        await audio_service.delete_recording_files("rec-2")
+        await audio_service.delete_recording_files("rec-2")
+
+        assert not (tmp_path / "rec-2").exists()
+        path = await audio_service.save_chunk("rec-2", 0, b"chunk again")
+        assert open(path, "rb").read() == b"chunk again"
+
+    @pytest.mark.asyncio
+    async def test_batched_fsync_shares_one_flush(self, audio_service, monkeypatch):
+        """Test that concurrent writers in batch mode share a single fsync pass."""
+        flushed = []
+        monkeypatch.setattr("app.services.file_io.settings.AUDIO_FSYNC_MODE", "batch")
+        monkeypatch.setattr(file_io, "fsync_batcher", file_io.FsyncBatcher(0.01))
+        monkeypatch.setattr(file_io, "fsync_each", lambda paths: flushed.append(sorted(paths)) or {})
+
+        paths = await asyncio.gather(
+            *(audio_service.save_chunk("rec-2", index, b"data") for index in range(5))
+        )
+
+        assert flushed == [sorted(paths)]
+
+    @pytest.mark.asyncio
+    async def test_batched_fsync_flushes_writers_arriving_mid_flush(self, audio_service, monkeypatch):
+        """Test that a writer arriving while a batch is flushing gets its own pass."""
+        flushed = []
+        batcher = file_io.FsyncBatcher(0.01)
+        monkeypatch.setattr("app.services.file_io.settings.AUDIO_FSYNC_MODE", "batch")
+        monkeypatch.setattr(file_io, "fsync_batcher", batcher)
+
+        def slow_fsync(paths):
+            flushed.append(sorted(paths))
+            time.sleep(0.05)
+            return {}
+
+        monkeypatch.setattr(file_io, "fsync_each", slow_fsync)
+
+        first = asyncio.create_task(audio_service.save_chunk("rec-3", 0, b"data"))
+        await asyncio.sleep(0.03)
+        second = await asyncio.wait_for(audio_service.save_chunk("rec-3", 1, b"data"), timeout=1)
+        await first
+
+        assert flushed == [[await first], [second]]
+
+    @pytest.mark.asyncio
+    async def test_batched_fsync_failure_only_reaches_its_writer(self, monkeypatch):
+        """Test that a file failing to flush does not fail the other writers of its batch."""
+        batcher = file_io.FsyncBatcher(0.01)
+        failure = OSError("disk error")
+        monkeypatch.setattr(
+            file_io, "fsync_each", lambda paths: {path: failure for path in paths if path == "/bad"}
+        )
+
+        results = await asyncio.gather(
+            batcher.sync("/good"), batcher.sync("/bad"), batcher.sync("/good"), return_exceptions=True
+        )
+
+        assert results == [None, failure, None]
+
+    def test_fsync_each_reports_failures_per_path(self, tmp_path):
+        """Test that a missing file is reported without failing the file beside it."""
+        present = tmp_path / "present.webm"
+        present.write_bytes(b"data")
+        missing = str(tmp_path / "missing.webm")
+
+        errors = file_io.fsync_each([str(present), missing])
+
+        assert list(errors) == [missing]
+        assert isinstance(errors[missing], FileNotFoundError)
+
+    @pytest.mark.asyncio
+    async def test_segment_stream_is_prefixed_with_container_header(self, audio_service, tmp_path):
+        """Test that a segment from mid-recording starts with the first chunk's WebM header."""
+        header = WEBM_MAGIC + b"header"
+        first = tmp_path / "chunk_00000.webm"
+        first.write_bytes(header + WEBM_CLUSTER_ID + b"frames-0")
+        later = tmp_path / "chunk_00001.webm"
+        later.write_bytes(WEBM_CLUSTER_ID + b"frames-1")
+
+        read_header = await audio_service.read_container_header(str(first))
+        stream = audio_service.stream_chunks([str(later)], header=read_header)
+
+        assert read_header == header
+        assert await stream.get_size() == len(header) + later.stat().st_size
+        assert b"".join([part async for part in stream]) == header + later.read_bytes()
+        assert await audio_service.read_container_header(str(later)) == b""
@@ -0,0 +1,55 @@
+"""Tests for maintenance commands."""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.commands.backfill_recording_aggregates import backfill_recording_aggregates
+from app.core.database import Base
+from app.models import Recording, RecordingChunk
+from app.repositories import MySQLUserRepository, MySQLRecordingRepository
+
+
+@pytest.fixture
+def db_session():
+    """Create a test database session."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+class TestBackfillRecordingAggregates:
+    """Test cases for the recording aggregates backfill."""
+
+    def test_backfills_sizes_and_aggregates(self, db_session, tmp_path):
+        """Test that legacy chunks get sizes from disk and recordings get aggregates."""
+        user = MySQLUserRepository(db_session).create_user(google_id="backfill", email="backfill@example.com")
+        rec_repo = MySQLRecordingRepository(db_session)
+        recordings = [rec_repo.create_recording(user.id) for _ in range(3)]
+        chunk_path = tmp_path / "chunk_00000.webm"
+        chunk_path.write_bytes(b"x" * 42)
+        # Rows written before the aggregates existed
+        db_session.add_all([
+            RecordingChunk(
+                recording_id=recordings[0].id,
+                chunk_index=0,
+                audio_blob_path=str(chunk_path),
+                duration_seconds=3.0
+            ),
+            RecordingChunk(
+                recording_id=recordings[0].id,
+                chunk_index=1,
+                audio_blob_path=str(tmp_path / "missing.webm"),
+                duration_seconds=2.0
+            ),
+        ])
+        db_session.commit()
+
+        updated = backfill_recording_aggregates(db_session, batch_size=2)
+
+        recording = db_session.get(Recording, recordings[0].id)
+        assert updated == 3
+        assert recording.chunk_count == 2
+        assert recording.total_duration_seconds == 5.0
+        assert recording.total_bytes == 42
+        assert recording.last_chunk_at is not None
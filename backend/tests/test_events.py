@@ -0,0 +1,84 @@
+"""Tests for the event broker and recording events."""
+import asyncio
+import json
+import pytest
+from app.core.events import LocalEventBroker
+from app.repositories import MySQLUserRepository, MySQLRecordingRepository
+from app.services import RecordingEvents, RecordingService
+
+
+async def _wait_for_subscriber(broker, channel):
+    while not broker.subscriber_count(channel):
+        await asyncio.sleep(0)
+
+
+class TestLocalEventBroker:
+    """Test cases for LocalEventBroker."""
+
+    @pytest.mark.asyncio
+    async def test_delivers_to_channel_subscribers_only(self):
+        """Test that messages reach every subscriber of their channel and no other."""
+        broker = LocalEventBroker()
+        async with broker.subscribe("a") as first, broker.subscribe("a") as second, broker.subscribe("b") as other:
+            await broker.publish("a", "hello")
+
+            assert await first.__anext__() == "hello"
+            assert await second.__anext__() == "hello"
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(other.__anext__(), timeout=0.01)
+
+        assert broker.subscriber_count("a") == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_loses_oldest_messages(self):
+        """Test that a full subscriber queue drops its oldest message instead of blocking publishers."""
+        broker = LocalEventBroker(max_queue_size=2)
+        async with broker.subscribe("a") as messages:
+            for message in ("1", "2", "3"):
+                await broker.publish("a", message)
+
+            assert [await messages.__anext__(), await messages.__anext__()] == ["2", "3"]
+
+
+class TestRecordingEvents:
+    """Test cases for RecordingEvents."""
+
+    @pytest.mark.asyncio
+    async def test_sse_stream_formats_events_and_keepalives(self):
+        """Test that events are framed as SSE and silence is filled with keepalive comments."""
+        broker = LocalEventBroker()
+        events = RecordingEvents(broker)
+        stream = events.sse_stream("user-1", keepalive_seconds=0.01)
+
+        assert await stream.__anext__() == "retry: 3000\n\n"
+        next_frame = asyncio.ensure_future(stream.__anext__())
+        await _wait_for_subscriber(broker, "recordings:user-1")
+        await events.recording_deleted("user-1", "recording-1")
+
+        assert await next_frame == 'event: deleted\ndata: {"recording_id": "recording-1"}\n\n'
+        assert await stream.__anext__() == ": keepalive\n\n"
+        await stream.aclose()
+        assert broker.subscriber_count("recordings:user-1") == 0
+
+    @pytest.mark.asyncio
+    async def test_service_publishes_status_changes(self, session_factory, tmp_path, monkeypatch):
+        """Test that pausing and deleting a recording are published to its owner."""
+        monkeypatch.setattr("app.services.audio_service.settings.AUDIO_STORAGE_PATH", str(tmp_path))
+        db = session_factory()
+        user = MySQLUserRepository(db).create_user(google_id="events", email="events@example.com")
+        recording = MySQLRecordingRepository(db).create_recording(user.id)
+        broker = LocalEventBroker()
+        service = RecordingService(db)
+        service.events = RecordingEvents(broker)
+
+        async with broker.subscribe(f"recordings:{user.id}") as messages:
+            await service.pause_recording(recording.id, user.id)
+            await service.delete_recording(recording.id, user.id)
+            published = [json.loads(await messages.__anext__()) for _ in range(2)]
+
+        assert [(event["type"], event["data"].get("status")) for event in published] == [
+            ("status", "paused"),
+            ("deleted", None),
+        ]
+        assert all(event["data"]["recording_id"] == recording.id for event in published)
+        db.close()
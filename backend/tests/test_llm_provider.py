@@ -1,47 +1,161 @@
 """Tests for LLM provider implementations."""
+import asyncio
+import httpx
 import pytest
-from unittest.mock import AsyncMock, patch, mock_open
-from app.llm import RequestYaiProvider
+from app.llm import (
+    RequestYaiProvider,
+    ProviderRegistry,
+    ResilientProvider,
+    SegmentTranscriptionError,
+    transcribe_segments,
+)
+from app.llm.registry import _QueuedTransport
+from app.services import ChunkStream
+
+
+def _mock_client(handler):
+    """Create an AsyncClient that routes requests to a handler function."""
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
 
 
 class TestRequestYaiProvider:
     """Test cases for RequestYaiProvider."""
 
     @pytest.mark.asyncio
-    async def test_transcribe_audio_success(self):
+    async def test_transcribe_audio_success(self, audio_file):
         """Test successful audio transcription."""
-        provider = RequestYaiProvider()
-
-        # Mock the HTTP client
-        mock_response = AsyncMock()
-        mock_response.json.return_value = {
-            "transcription": "This is a test transcription"
-        }
-        mock_response.raise_for_status = AsyncMock()
-
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-                return_value=mock_response
-            )
-            with patch('builtins.open', mock_open(read_data=b'fake audio data')):
-                result = await provider.transcribe_audio("/fake/path/audio.webm")
+        def handler(request):
+            assert request.headers["Authorization"].startswith("Bearer ")
+            assert b"fake audio data" in request.read()
+            return httpx.Response(200, json={"transcription": "This is a test transcription"})
+
+        provider = RequestYaiProvider(_mock_client(handler))
+        result = await provider.transcribe_audio(audio_file)
 
         assert result == "This is a test transcription"
 
     @pytest.mark.asyncio
-    async def test_transcribe_audio_missing_field(self):
+    async def test_transcribe_audio_missing_field(self, audio_file):
         """Test transcription with missing transcription field."""
-        provider = RequestYaiProvider()
+        def handler(request):
+            return httpx.Response(200, json={"error": "Invalid response"})
+
+        provider = RequestYaiProvider(_mock_client(handler))
+
+        with pytest.raises(ValueError, match="missing 'transcription' field"):
+            await provider.transcribe_audio(audio_file)
+
+
+    @pytest.mark.asyncio
+    async def test_transcribe_stream_sends_concatenated_chunks(self, tmp_path):
+        """Test that streamed chunks are uploaded as one multipart file."""
+        paths = []
+        for index, data in enumerate([b"first-", b"second-", b"third"]):
+            path = tmp_path / f"chunk_{index:05d}.webm"
+            path.write_bytes(data)
+            paths.append(str(path))
+
+        def handler(request):
+            body = request.read()
+            assert int(request.headers["Content-Length"]) == len(body)
+            assert request.headers["Content-Type"].startswith("multipart/form-data; boundary=")
+            assert b'filename="recording.webm"' in body
+            assert b"\r\n\r\nfirst-second-third\r\n" in body
+            return httpx.Response(200, json={"transcription": "streamed"})
+
+        provider = RequestYaiProvider(_mock_client(handler))
+        audio = ChunkStream(paths, "recording.webm", buffer_size=4)
+
+        assert await audio.get_size() == len(b"first-second-third")
+        assert await provider.transcribe_stream(audio) == "streamed"
+
+
+class TestProviderRegistry:
+    """Test cases for ProviderRegistry."""
+
+    @pytest.mark.asyncio
+    async def test_providers_share_one_client(self):
+        """Test that providers are cached and share the pooled client."""
+        registry = ProviderRegistry()
+        registry.register("requestyai", RequestYaiProvider)
+        await registry.startup()
+
+        provider = registry.get_provider("requestyai")
+
+        assert registry.get_provider("requestyai") is provider
+        assert isinstance(provider, ResilientProvider)
+        assert provider.provider.http_client is registry.http_client
+        assert registry.metrics()["requestyai"]["circuit_state"] == "closed"
 
-        # Mock the HTTP client with invalid response
-        mock_response = AsyncMock()
-        mock_response.json.return_value = {"error": "Invalid response"}
-        mock_response.raise_for_status = AsyncMock()
+        await registry.shutdown()
+        assert provider.provider.http_client.is_closed
 
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-                return_value=mock_response
+    def test_unknown_provider(self):
+        """Test that an unregistered provider name is rejected."""
+        with pytest.raises(ValueError, match="Unknown LLM provider"):
+            ProviderRegistry().get_provider("missing")
+
+    @pytest.mark.asyncio
+    async def test_queued_transport_caps_in_flight_requests(self):
+        """Test that the shared transport admits at most max_concurrency requests."""
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={"transcription": "ok"})
+
+        transport = _QueuedTransport(httpx.MockTransport(handler), max_concurrency=2)
+        async with httpx.AsyncClient(transport=transport) as client:
+            responses = await asyncio.gather(
+                *(client.post("http://provider.test/v1") for _ in range(6))
             )
-            with patch('builtins.open', mock_open(read_data=b'fake audio data')):
-                with pytest.raises(ValueError, match="missing 'transcription' field"):
-                    await provider.transcribe_audio("/fake/path/audio.webm")
+
+        assert all(response.status_code == 200 for response in responses)
+        assert peak == 2
+
+
+class TestTranscribeSegments:
+    """Test cases for transcribe_segments."""
+
+    @pytest.mark.asyncio
+    async def test_transcripts_keep_segment_order_within_concurrency(self):
+        """Test that segments run at most max_concurrency at a time and come back in order."""
+        in_flight = []
+        peak = 0
+
+        async def transcribe(segment):
+            nonlocal peak
+            in_flight.append(segment)
+            peak = max(peak, len(in_flight))
+            # Later segments finish first
+            await asyncio.sleep(0.001 * (5 - segment))
+            in_flight.remove(segment)
+            return f"text-{segment}"
+
+        result = await transcribe_segments(transcribe, [0, 1, 2, 3, 4], 2)
+
+        assert result == ["text-0", "text-1", "text-2", "text-3", "text-4"]
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_segment_is_reported_with_the_others_transcripts(self):
+        """Test that a failing segment does not stop the others and is reported alongside their transcripts."""
+        calls = []
+
+        async def transcribe(segment):
+            calls.append(segment)
+            if segment == 1:
+                raise RuntimeError("bad audio")
+            return f"text-{segment}"
+
+        with pytest.raises(SegmentTranscriptionError) as exc_info:
+            await transcribe_segments(transcribe, [0, 1, 2], 4)
+
+        assert sorted(calls) == [0, 1, 2]
+        assert exc_info.value.transcripts == ["text-0", None, "text-2"]
+        assert list(exc_info.value.errors) == [1]
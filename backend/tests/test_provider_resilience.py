@@ -0,0 +1,173 @@
+"""Tests for the resilient provider wrapper, against the fault-injecting stub server."""
+import asyncio
+import time
+import httpx
+import pytest
+from app.llm import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    ProviderUnavailableError,
+    RequestYaiProvider,
+    ResilientProvider,
+)
+from benchmarks.stub_server import FaultConfig, FaultInjectingStub
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def stub():
+    """Create a stub transcription API that answers every request successfully."""
+    return FaultInjectingStub(seed=0)
+
+
+@pytest.fixture
+def sleeps():
+    """Backoff delays requested by the provider under test."""
+    return []
+
+
+@pytest.fixture
+async def make_provider(stub, sleeps):
+    """Build a ResilientProvider calling the stub in-process."""
+    clients = []
+
+    def make(max_attempts=3, max_delay_seconds=30.0, failure_threshold=5, clock=None, initial=4):
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=stub.app))
+        clients.append(client)
+        provider = RequestYaiProvider(client)
+        provider.api_url = "http://stub/v1/transcribe"
+
+        async def sleep(delay):
+            sleeps.append(delay)
+
+        return ResilientProvider(
+            provider,
+            AdaptiveConcurrencyLimiter(initial, minimum=1, maximum=8),
+            CircuitBreaker(failure_threshold, reset_timeout_seconds=30.0, clock=clock or time.monotonic),
+            max_attempts=max_attempts,
+            base_delay_seconds=0.1,
+            max_delay_seconds=max_delay_seconds,
+            sleep=sleep
+        )
+
+    yield make
+    for client in clients:
+        await client.aclose()
+
+
+class TestResilientProvider:
+    """Test cases for ResilientProvider."""
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_failures(self, stub, make_provider, sleeps, audio_file):
+        """Test that 503 and 502 responses are retried with growing, jittered delays."""
+        stub.faults = FaultConfig(script=[503, 502])
+        provider = make_provider()
+
+        assert (await provider.transcribe_audio(audio_file)).startswith("Transcribed")
+        assert stub.stats()["statuses"] == {503: 1, 502: 1, 200: 1}
+        assert len(sleeps) == 2 and 0 <= sleeps[0] <= 0.1 and 0 <= sleeps[1] <= 0.2
+        assert provider.snapshot()["retries"] == 2
+        assert provider.snapshot()["successes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_honours_retry_after(self, stub, make_provider, sleeps, audio_file):
+        """Test that a 429 is retried no sooner than its Retry-After and shrinks the limit."""
+        stub.faults = FaultConfig(script=[429], retry_after_seconds=2)
+        provider = make_provider()
+
+        await provider.transcribe_audio(audio_file)
+
+        assert sleeps == [2.0]
+        assert provider.snapshot()["throttled"] == 1
+        assert provider.limiter.limit < 4
+
+    @pytest.mark.asyncio
+    async def test_gives_up_when_retry_after_is_too_long(self, stub, make_provider, sleeps, audio_file):
+        """Test that a Retry-After beyond max_delay_seconds fails the call instead of waiting."""
+        stub.faults = FaultConfig(script=[503], retry_after_seconds=120)
+        provider = make_provider(max_delay_seconds=30.0)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await provider.transcribe_audio(audio_file)
+
+        assert stub.requests == 1
+        assert sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, stub, make_provider, audio_file):
+        """Test that a 400 is raised at once and does not count against the circuit."""
+        stub.faults = FaultConfig(script=[400])
+        provider = make_provider(failure_threshold=1)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await provider.transcribe_audio(audio_file)
+
+        assert stub.requests == 1
+        assert provider.breaker.state == CircuitBreaker.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_circuit_sheds_load_until_probe_succeeds(self, stub, make_provider, audio_file):
+        """Test that the circuit opens on repeated failures and a single probe closes it again."""
+        stub.faults = FaultConfig(failure_rate=1.0)
+        clock = FakeClock()
+        provider = make_provider(max_attempts=2, failure_threshold=2, clock=clock)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await provider.transcribe_audio(audio_file)
+        with pytest.raises(ProviderUnavailableError):
+            await provider.transcribe_audio(audio_file)
+
+        assert stub.requests == 2
+        assert provider.snapshot()["rejected"] == 1
+        assert provider.snapshot()["circuit_state"] == "open"
+
+        stub.faults = FaultConfig()
+        clock.now += 30
+        assert provider.breaker.state == CircuitBreaker.HALF_OPEN
+        await provider.transcribe_audio(audio_file)
+        assert provider.breaker.state == CircuitBreaker.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_concurrency_adapts_to_throttling(self, stub, make_provider, audio_file):
+        """Test that calls in flight never exceed the limit, which backs off under 429s."""
+        stub.faults = FaultConfig(max_concurrency=2, latency_seconds=0.01)
+        provider = make_provider(max_attempts=10, initial=6)
+
+        results = await asyncio.gather(*(provider.transcribe_audio(audio_file) for _ in range(12)))
+
+        assert len(results) == 12
+        assert stub.statuses.get(429, 0) > 0
+        assert provider.limiter.limit < 6
+        assert stub.peak_in_flight <= 6
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test cases for AdaptiveConcurrencyLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_additive_increase_multiplicative_decrease(self):
+        """Test that successes grow the limit slowly and one round of overloads halves it once."""
+        limiter = AdaptiveConcurrencyLimiter(initial=4, minimum=1, maximum=8)
+
+        for _ in range(4):
+            limiter.on_success()
+        assert 4.9 < limiter.limit < 5
+
+        async with limiter.slot() as first, limiter.slot() as second:
+            limiter.on_overload(first)
+            limiter.on_overload(second)
+        assert 2.4 < limiter.limit < 2.5
+
+        async with limiter.slot() as later:
+            limiter.on_overload(later)
+        assert 1.2 < limiter.limit < 1.25
@@ -0,0 +1,144 @@
+"""Tests for latency-aware provider routing, against fault-injecting stub servers."""
+import time
+import httpx
+import pytest
+from app.llm import (
+    LatencyWindow,
+    ProviderRegistry,
+    RequestYaiProvider,
+    RoutingProvider,
+    register_endpoints,
+)
+from benchmarks.stub_server import FaultConfig, FaultInjectingStub
+from app.services.audio_stream import ChunkStream
+
+
+@pytest.fixture
+async def stub_provider():
+    """Build RequestYai providers calling stub servers in-process, one stub per provider."""
+    clients = []
+
+    def make(latency_seconds=0.0, failure_rate=0.0):
+        stub = FaultInjectingStub(FaultConfig(latency_seconds=latency_seconds, failure_rate=failure_rate))
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=stub.app))
+        clients.append(client)
+        return stub, RequestYaiProvider(client, api_url="http://stub/v1/transcribe", api_key="test")
+
+    yield make
+    for client in clients:
+        await client.aclose()
+
+
+class TestLatencyWindow:
+    """Test cases for LatencyWindow."""
+
+    def test_percentiles_and_error_rate_cover_recent_calls(self):
+        """Test that percentiles use successful calls and old samples roll out of the window."""
+        window = LatencyWindow(size=10)
+        window.record(5.0, False)
+        for latency in range(1, 11):
+            window.record(latency / 10, True)
+
+        assert window.percentile(0.5) == 0.5
+        assert window.percentile(0.95) == 1.0
+        assert window.error_rate == 0.0
+
+        window.record(0.1, False)
+        assert window.error_rate == 0.1
+        assert window.snapshot()["p50_ms"] == 600.0
+
+
+class TestRoutingProvider:
+    """Test cases for RoutingProvider."""
+
+    @pytest.mark.asyncio
+    async def test_routes_to_lowest_p95_latency(self, stub_provider, audio_file):
+        """Test that once both providers are measured, calls go to the faster one."""
+        slow_stub, slow = stub_provider(latency_seconds=0.02)
+        fast_stub, fast = stub_provider()
+        router = RoutingProvider({"slow": slow, "fast": fast}, min_samples=2)
+
+        for _ in range(10):
+            await router.transcribe_audio(audio_file)
+
+        assert router.ranked() == ["fast", "slow"]
+        assert slow_stub.requests == 2
+        assert fast_stub.requests == 8
+
+    @pytest.mark.asyncio
+    async def test_fails_over_and_demotes_failing_provider(self, stub_provider, audio_file):
+        """Test that a failed call is retried on the next provider, which then ranks first."""
+        broken_stub, broken = stub_provider(failure_rate=1.0)
+        healthy_stub, healthy = stub_provider()
+        router = RoutingProvider({"broken": broken, "healthy": healthy}, min_samples=1, max_error_rate=0.5)
+
+        assert (await router.transcribe_audio(audio_file)).startswith("Transcribed")
+        await router.transcribe_audio(audio_file)
+
+        assert router.ranked() == ["healthy", "broken"]
+        assert broken_stub.requests == 1
+        assert healthy_stub.requests == 2
+        assert router.snapshot()["providers"]["broken"]["error_rate"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_failure_on_every_provider_is_raised(self, stub_provider, audio_file):
+        """Test that the last provider error is raised when no provider succeeds."""
+        _, first = stub_provider(failure_rate=1.0)
+        _, second = stub_provider(failure_rate=1.0)
+        router = RoutingProvider({"first": first, "second": second})
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await router.transcribe_audio(audio_file)
+
+    @pytest.mark.asyncio
+    async def test_hedged_request_wins_over_slow_provider(self, stub_provider, audio_file):
+        """Test that a slow call is hedged to the next provider and the answer comes from the fast one."""
+        slow_stub, slow = stub_provider(latency_seconds=1.0)
+        fast_stub, fast = stub_provider()
+        router = RoutingProvider({"slow": slow, "fast": fast}, hedge_delay_seconds=0.02)
+
+        started_at = time.monotonic()
+        name, transcription = await router.transcribe_stream_routed(ChunkStream([audio_file], "audio.webm", 1024))
+        assert name == "fast"
+        assert transcription.startswith("Transcribed")
+
+        assert time.monotonic() - started_at < 0.5
+        assert (slow_stub.requests, fast_stub.requests) == (1, 1)
+        assert slow_stub.in_flight == 0
+        assert (router.hedges, router.hedge_wins) == (1, 1)
+        # The cancelled request says nothing about the slow provider
+        assert router.snapshot()["providers"]["slow"]["samples"] == 0
+
+
+class TestRoutedRegistry:
+    """Test cases for routing through ProviderRegistry."""
+
+    @pytest.mark.asyncio
+    async def test_default_provider_routes_across_configured_endpoints(self, monkeypatch):
+        """Test that LLM_ROUTING_PROVIDERS makes the default provider a router over the named endpoints."""
+        monkeypatch.setattr("app.llm.registry.settings.LLM_ROUTING_PROVIDERS", "requestyai, backup")
+        registry = ProviderRegistry()
+        registry.register("requestyai", RequestYaiProvider)
+        register_endpoints(
+            registry, {"backup": {"url": "https://backup.example.com/v1/transcribe", "api_key": "backup-key"}}
+        )
+
+        router = registry.get_provider()
+
+        assert isinstance(router, RoutingProvider)
+        assert registry.get_provider() is router
+        assert list(router.providers) == ["requestyai", "backup"]
+        assert router.providers["backup"].provider.api_url == "https://backup.example.com/v1/transcribe"
+        assert router.providers["backup"].provider.api_key == "backup-key"
+        assert registry.routing_metrics()["ranking"] == ["requestyai", "backup"]
+        await registry.shutdown()
+
+    def test_endpoint_without_url_is_rejected(self):
+        """Test that a misconfigured endpoint fails loudly."""
+        with pytest.raises(ValueError, match="has no url"):
+            register_endpoints(ProviderRegistry(), {"backup": {"api_key": "key"}})
+
+    def test_endpoint_without_api_key_is_rejected(self):
+        """Test that an endpoint never falls back to the primary provider's LLM_API_KEY."""
+        with pytest.raises(ValueError, match="has no api_key"):
+            register_endpoints(ProviderRegistry(), {"backup": {"url": "https://backup.example.com/v1/transcribe"}})
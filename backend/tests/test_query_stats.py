@@ -0,0 +1,18 @@
+"""Tests for per-request query statistics."""
+from app.core.query_stats import QueryStats
+
+
+class TestQueryStats:
+    """Test cases for QueryStats."""
+
+    def test_repeated_statements_are_reported(self):
+        """Test that a statement run more than once is flagged with its count."""
+        stats = QueryStats(slow_query_ms=100)
+        stats.record("SELECT * FROM recordings WHERE id = ?", 0.001)
+        stats.record("SELECT * FROM recordings WHERE id = ?", 0.001)
+        stats.record("UPDATE recordings SET status = ?", 0.2)
+
+        assert stats.count == 3
+        assert stats.repeated_queries(threshold=2) == [("SELECT * FROM recordings WHERE id = ?", 2)]
+        assert (b"x-db-repeated-queries", b"1") in stats.headers()
+        assert (b"x-db-slow-queries", b"1") in stats.headers()
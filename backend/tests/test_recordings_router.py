@@ -0,0 +1,511 @@
+"""Tests for the recording routes."""
+import hashlib
+import os
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from app.core import get_db
+from app.core.query_stats import QueryStatsMiddleware
+from app.repositories import MySQLUserRepository, MySQLRecordingRepository
+from app.routers import recordings
+from app.routers.dependencies import get_current_user, get_websocket_user
+from app.services import RecordingService
+from app.services.audio_service import WEBM_CLUSTER_ID, WEBM_MAGIC
+
+
+@pytest.fixture
+def user(session_factory):
+    """Create the authenticated user."""
+    db = session_factory()
+    user = MySQLUserRepository(db).create_user(google_id="router", email="router@example.com")
+    db.expunge(user)
+    db.close()
+    return user
+
+
+@pytest.fixture
+def client(session_factory, user, tmp_path, monkeypatch):
+    """Create a test client for the recordings router."""
+    monkeypatch.setattr("app.services.audio_service.settings.AUDIO_STORAGE_PATH", str(tmp_path))
+    app = FastAPI()
+    app.include_router(recordings.router)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_websocket_user] = lambda: user
+    return TestClient(app)
+
+
+@pytest.fixture
+def recording_id(session_factory, user):
+    """Create a recording owned by the authenticated user."""
+    db = session_factory()
+    recording = MySQLRecordingRepository(db).create_recording(user.id)
+    db.close()
+    return recording.id
+
+
+class TestRawChunkUpload:
+    """Test cases for the raw PUT chunk upload route."""
+
+    def test_put_chunk_streams_body_to_storage(self, client, session_factory, recording_id):
+        """Test that a raw body is stored with the duration from the header."""
+        response = client.put(
+            f"/recordings/{recording_id}/chunks/3",
+            content=b"raw audio bytes",
+            headers={"Content-Type": "application/octet-stream", "X-Chunk-Duration": "2.5"}
+        )
+
+        assert response.status_code == 201
+        assert response.json()["chunk_index"] == 3
+        chunk = MySQLRecordingRepository(session_factory()).get_chunks(recording_id)[0]
+        assert chunk.duration_seconds == 2.5
+        with open(chunk.audio_blob_path, "rb") as f:
+            assert f.read() == b"raw audio bytes"
+
+    def test_put_chunk_retry_is_idempotent(self, client, session_factory, recording_id):
+        """Test that re-sending a chunk is reported as unchanged and changed content replaces it."""
+        url = f"/recordings/{recording_id}/chunks/0"
+        headers = {"Content-Type": "application/octet-stream"}
+
+        created = client.put(url, content=b"audio", headers=headers)
+        chunk_path = MySQLRecordingRepository(session_factory()).get_chunks(recording_id)[0].audio_blob_path
+        stored_inode = os.stat(chunk_path).st_ino
+        retried = client.put(url, content=b"audio", headers=headers)
+        # The retry dropped its copy instead of renaming it over the stored chunk
+        assert os.stat(chunk_path).st_ino == stored_inode
+        assert os.listdir(os.path.dirname(chunk_path)) == [os.path.basename(chunk_path)]
+        replaced = client.put(url, content=b"other audio", headers=headers)
+
+        assert (created.status_code, created.json()["status"]) == (201, "created")
+        assert (retried.status_code, retried.json()["status"]) == (200, "unchanged")
+        assert (replaced.status_code, replaced.json()["status"]) == (200, "replaced")
+        db = session_factory()
+        chunks = MySQLRecordingRepository(db).get_chunks(recording_id)
+        assert len(chunks) == 1
+        with open(chunks[0].audio_blob_path, "rb") as f:
+            assert f.read() == b"other audio"
+        db.close()
+
+    def test_put_chunk_rejects_multipart_body(self, client, recording_id):
+        """Test that non-raw content types are rejected."""
+        response = client.put(
+            f"/recordings/{recording_id}/chunks/0",
+            files={"audio_chunk": ("chunk.webm", b"data")}
+        )
+
+        assert response.status_code == 415
+
+    def test_put_chunk_rejects_oversized_body(self, client, recording_id, monkeypatch):
+        """Test that a body above MAX_CHUNK_BYTES is rejected with 413."""
+        monkeypatch.setattr("app.routers.recordings.settings.MAX_CHUNK_BYTES", 4)
+
+        response = client.put(
+            f"/recordings/{recording_id}/chunks/0",
+            content=b"too large",
+            headers={"Content-Type": "application/octet-stream"}
+        )
+
+        assert response.status_code == 413
+
+    def test_multipart_upload_still_supported(self, client, recording_id):
+        """Test that the multipart route keeps working for older clients."""
+        response = client.post(
+            f"/recordings/{recording_id}/chunks",
+            data={"chunk_index": "0", "duration_seconds": "1.0"},
+            files={"audio_chunk": ("chunk.webm", b"data", "audio/webm")}
+        )
+
+        assert response.status_code == 201
+
+
+class TestBatchChunkUpload:
+    """Test cases for the batch chunk upload."""
+
+    def test_batch_reports_per_chunk_status(self, client, session_factory, recording_id):
+        """Test that a replayed batch stores new chunks and skips ones already uploaded."""
+        client.put(
+            f"/recordings/{recording_id}/chunks/0",
+            content=b"chunk zero",
+            headers={"Content-Type": "application/octet-stream"}
+        )
+
+        response = client.post(
+            f"/recordings/{recording_id}/chunks/batch",
+            data={"chunk_indexes": ["0", "1", "2"], "durations": ["1.0", "1.5", "2.0"]},
+            files=[
+                ("audio_chunks", ("chunk_0.webm", b"chunk zero", "audio/webm")),
+                ("audio_chunks", ("chunk_1.webm", b"chunk one", "audio/webm")),
+                ("audio_chunks", ("chunk_2.webm", b"chunk two", "audio/webm")),
+            ]
+        )
+
+        assert response.status_code == 200
+        assert [(c["chunk_index"], c["status"]) for c in response.json()["chunks"]] == [
+            (0, "unchanged"), (1, "created"), (2, "created")
+        ]
+        db = session_factory()
+        recording = MySQLRecordingRepository(db).get_recording(recording_id)
+        assert recording.chunk_count == 3
+        assert recording.total_duration_seconds == 3.5
+        db.close()
+
+    def test_batch_rejects_mismatched_fields(self, client, recording_id):
+        """Test that every chunk needs an index."""
+        response = client.post(
+            f"/recordings/{recording_id}/chunks/batch",
+            data={"chunk_indexes": ["0"]},
+            files=[
+                ("audio_chunks", ("chunk_0.webm", b"zero", "audio/webm")),
+                ("audio_chunks", ("chunk_1.webm", b"one", "audio/webm")),
+            ]
+        )
+
+        assert response.status_code == 400
+
+
+class TestResumableUpload:
+    """Test cases for the chunk manifest and resumed uploads."""
+
+    @staticmethod
+    def put_chunk(client, recording_id, chunk_index, content, **headers):
+        return client.put(
+            f"/recordings/{recording_id}/chunks/{chunk_index}",
+            content=content,
+            headers={"Content-Type": "application/octet-stream", **headers}
+        )
+
+    @staticmethod
+    async def interrupted_stream(data):
+        yield data
+        raise ConnectionError("client disconnected")
+
+    def test_manifest_lists_chunks_and_gaps(self, client, recording_id):
+        """Test that the manifest reports stored chunks and the indexes still missing."""
+        self.put_chunk(client, recording_id, 0, b"first")
+        self.put_chunk(client, recording_id, 2, b"third")
+
+        manifest = client.get(f"/recordings/{recording_id}/chunks").json()
+
+        assert manifest["chunks"] == [
+            {"chunk_index": 0, "size_bytes": 5, "content_hash": hashlib.sha256(b"first").hexdigest()},
+            {"chunk_index": 2, "size_bytes": 5, "content_hash": hashlib.sha256(b"third").hexdigest()},
+        ]
+        assert manifest["missing_chunk_indexes"] == [1]
+        assert manifest["next_chunk_index"] == 3
+
+    @pytest.mark.asyncio
+    async def test_interrupted_upload_resumes_at_offset(self, client, session_factory, recording_id):
+        """Test that the received bytes of a dropped upload are kept and completed by a resumed PUT."""
+        with pytest.raises(ConnectionError):
+            await RecordingService(session_factory()).upload_chunk(
+                recording_id, 0, self.interrupted_stream(b"partial ")
+            )
+
+        manifest = client.get(f"/recordings/{recording_id}/chunks").json()
+        assert manifest["partial_chunks"] == [{"chunk_index": 0, "received_bytes": 8}]
+        assert manifest["missing_chunk_indexes"] == [0]
+
+        response = self.put_chunk(client, recording_id, 0, b"audio", **{"Upload-Offset": "8"})
+
+        assert response.status_code == 201
+        db = session_factory()
+        chunk = MySQLRecordingRepository(db).get_chunks(recording_id)[0]
+        with open(chunk.audio_blob_path, "rb") as f:
+            assert f.read() == b"partial audio"
+        assert chunk.size_bytes == 13
+        assert chunk.content_hash == hashlib.sha256(b"partial audio").hexdigest()
+        db.close()
+        assert client.get(f"/recordings/{recording_id}/chunks").json()["partial_chunks"] == []
+
+    def test_wrong_offset_is_conflict(self, client, recording_id):
+        """Test that a resume at the wrong offset is rejected with the expected offset."""
+        response = self.put_chunk(client, recording_id, 0, b"audio", **{"Upload-Offset": "8"})
+
+        assert response.status_code == 409
+        assert response.headers["upload-offset"] == "0"
+
+    def test_finish_with_gap_is_conflict(self, client, session_factory, recording_id):
+        """Test that finishing is refused until every chunk index has arrived."""
+        self.put_chunk(client, recording_id, 0, b"first")
+        self.put_chunk(client, recording_id, 2, b"third")
+
+        response = client.post(f"/recordings/{recording_id}/finish")
+
+        assert response.status_code == 409
+        assert response.json()["detail"]["missing_chunk_indexes"] == [1]
+        db = session_factory()
+        assert MySQLRecordingRepository(db).get_recording(recording_id).status.value == "active"
+        db.close()
+
+
+class TestAudioStream:
+    """Test cases for the streaming WebSocket ingest."""
+
+    @pytest.fixture(autouse=True)
+    def small_chunks(self, monkeypatch):
+        """Cut streamed audio into 4-byte chunks."""
+        monkeypatch.setattr("app.services.recording_service.settings.STREAM_CHUNK_BYTES", 4)
+
+    def test_stream_is_cut_into_acknowledged_chunks(self, client, session_factory, recording_id):
+        """Test that frames are stored as fixed-size chunks, each acknowledged, with the tail stored at end."""
+        with client.websocket_connect(f"/recordings/{recording_id}/stream") as websocket:
+            ready = websocket.receive_json()
+            websocket.send_bytes(b"abcde")
+            websocket.send_bytes(b"fghij")
+            acks = [websocket.receive_json(), websocket.receive_json()]
+            websocket.send_json({"type": "end"})
+            acks.append(websocket.receive_json())
+            end = websocket.receive_json()
+
+        assert (ready["next_chunk_index"], ready["stored_bytes"]) == (0, 0)
+        assert [(ack["chunk_index"], ack["stored_bytes"]) for ack in acks] == [(0, 4), (1, 8), (2, 10)]
+        assert (end["next_chunk_index"], end["stored_bytes"]) == (3, 10)
+        db = session_factory()
+        audio = b""
+        for chunk in MySQLRecordingRepository(db).get_chunks(recording_id):
+            with open(chunk.audio_blob_path, "rb") as f:
+                audio += f.read()
+        assert audio == b"abcdefghij"
+        db.close()
+
+    def test_webm_stream_is_cut_on_cluster_boundaries(self, client, session_factory, recording_id, monkeypatch):
+        """Test that a WebM stream is cut just before a cluster, so later chunks start on one."""
+        monkeypatch.setattr("app.services.recording_service.settings.STREAM_CHUNK_BYTES", 24)
+        clusters = [WEBM_CLUSTER_ID + f"frame{index}".encode() for index in range(3)]
+        audio = WEBM_MAGIC + b"head" + b"".join(clusters)
+
+        with client.websocket_connect(f"/recordings/{recording_id}/stream") as websocket:
+            websocket.receive_json()
+            for offset in range(0, len(audio), 7):
+                websocket.send_bytes(audio[offset:offset + 7])
+            acks = [websocket.receive_json()]
+            websocket.send_json({"type": "end"})
+            acks.append(websocket.receive_json())
+
+        assert [(ack["chunk_index"], ack["stored_bytes"]) for ack in acks] == [(0, 18), (1, 38)]
+        db = session_factory()
+        stored = []
+        for chunk in MySQLRecordingRepository(db).get_chunks(recording_id):
+            with open(chunk.audio_blob_path, "rb") as f:
+                stored.append(f.read())
+        assert stored == [WEBM_MAGIC + b"head" + clusters[0], clusters[1] + clusters[2]]
+        db.close()
+
+    def test_stream_continues_after_uploaded_chunks(self, client, recording_id):
+        """Test that a stream resumes after the chunks and bytes already stored."""
+        client.put(
+            f"/recordings/{recording_id}/chunks/0",
+            content=b"abc",
+            headers={"Content-Type": "application/octet-stream"}
+        )
+
+        with client.websocket_connect(f"/recordings/{recording_id}/stream") as websocket:
+            ready = websocket.receive_json()
+            websocket.send_bytes(b"defg")
+            ack = websocket.receive_json()
+
+        assert (ready["next_chunk_index"], ready["stored_bytes"]) == (1, 3)
+        assert (ack["chunk_index"], ack["stored_bytes"]) == (1, 7)
+
+    def test_other_users_recording_is_refused(self, client, session_factory):
+        """Test that the handshake is refused for a recording the user does not own."""
+        db = session_factory()
+        other = MySQLUserRepository(db).create_user(google_id="other", email="other@example.com")
+        other_recording = MySQLRecordingRepository(db).create_recording(other.id)
+        db.close()
+
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with client.websocket_connect(f"/recordings/{other_recording.id}/stream") as websocket:
+                websocket.receive_json()
+
+        assert exc_info.value.code == 1008
+
+    def test_unauthenticated_handshake_is_refused(self, client, recording_id):
+        """Test that a handshake without a token is refused."""
+        del client.app.dependency_overrides[get_websocket_user]
+
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with client.websocket_connect(f"/recordings/{recording_id}/stream") as websocket:
+                websocket.receive_json()
+
+        assert exc_info.value.code == 1008
+
+
+class TestRecordingEvents:
+    """Test cases for the recording event stream."""
+
+    def test_event_stream_requires_a_token(self, client):
+        """Test that the stream is routed ahead of /{recording_id} and needs authentication."""
+        response = client.get("/recordings/events")
+
+        assert response.status_code == 401
+
+
+class TestListRecordings:
+    """Test cases for paginated recording lists."""
+
+    def test_pages_follow_next_cursor(self, client, session_factory, user):
+        """Test that following next_cursor returns every recording once."""
+        db = session_factory()
+        created = [MySQLRecordingRepository(db).create_recording(user.id).id for _ in range(5)]
+        db.close()
+
+        ids, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            page = client.get("/recordings/", params=params).json()
+            ids.extend(r["id"] for r in page["recordings"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        assert sorted(ids) == sorted(created)
+        assert len(ids) == 5
+
+    def test_items_are_summaries(self, client, session_factory, user):
+        """Test that list items carry a preview and counts instead of the full text."""
+        db = session_factory()
+        repo = MySQLRecordingRepository(db)
+        recording = repo.create_recording(user.id)
+        repo.add_chunk(recording.id, 0, "/tmp/chunk_0.webm", 1.0)
+        repo.add_notes(recording.id, "Follow up in two weeks")
+        repo.update_transcription(recording.id, "word " * 1000)
+        db.close()
+
+        item = client.get("/recordings/").json()["recordings"][0]
+
+        assert "transcription_text" not in item
+        assert "notes" not in item
+        assert len(item["transcription_preview"]) == 200
+        assert item["transcription_truncated"] is True
+        assert item["has_notes"] is True
+        assert item["chunk_count"] == 1
+
+    def test_invalid_cursor_is_rejected(self, client):
+        """Test that a malformed cursor returns 400."""
+        response = client.get("/recordings/", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
+
+
+class TestQueryBudgets:
+    """Round-trip budgets for the recording routes."""
+
+    def test_list_recordings_budget(self, client, engine, recording_id, query_budget):
+        """Test that listing recordings is a single query."""
+        with query_budget(engine, 1):
+            client.get("/recordings/")
+
+    def test_put_chunk_budget(self, client, engine, recording_id, query_budget):
+        """Test the queries for a raw chunk upload, including the aggregate update."""
+        with query_budget(engine, 4):
+            client.put(
+                f"/recordings/{recording_id}/chunks/0",
+                content=b"data",
+                headers={"Content-Type": "application/octet-stream"}
+            )
+
+    def test_batch_upload_budget(self, client, engine, recording_id, query_budget):
+        """Test that a batch costs the same queries as a single chunk upload."""
+        files = [("audio_chunks", (f"chunk_{i}.webm", b"data %d" % i, "audio/webm")) for i in range(10)]
+
+        with query_budget(engine, 4):
+            client.post(
+                f"/recordings/{recording_id}/chunks/batch",
+                data={"chunk_indexes": [str(i) for i in range(10)]},
+                files=files
+            )
+
+    def test_pause_recording_budget(self, client, engine, recording_id, query_budget):
+        """Test that pausing checks ownership and updates in one statement."""
+        with query_budget(engine, 1):
+            client.patch(f"/recordings/{recording_id}/pause")
+
+    def test_add_notes_budget(self, client, engine, recording_id, query_budget):
+        """Test that adding notes checks ownership and updates in one statement."""
+        with query_budget(engine, 1):
+            client.patch(f"/recordings/{recording_id}/notes", json={"notes": "Follow up"})
+
+    def test_finish_recording_budget(self, client, engine, recording_id, query_budget):
+        """Test the queries for finishing a recording."""
+        client.put(
+            f"/recordings/{recording_id}/chunks/0",
+            content=b"data",
+            headers={"Content-Type": "application/octet-stream"}
+        )
+
+        with query_budget(engine, 6):
+            client.post(f"/recordings/{recording_id}/finish")
+
+    def test_chunk_manifest_budget(self, client, engine, recording_id, query_budget):
+        """Test that the manifest costs the ownership check and one index-only query."""
+        with query_budget(engine, 2):
+            client.get(f"/recordings/{recording_id}/chunks")
+
+    def test_delete_recording_budget(self, client, engine, recording_id, query_budget):
+        """Test that deleting issues one owner-scoped DELETE per table and looks up the cached transcripts."""
+        with query_budget(engine, 4):
+            client.delete(f"/recordings/{recording_id}")
+
+    def test_debug_headers_report_query_stats(self, client, recording_id):
+        """Test that query statistics are returned as headers in debug mode."""
+        client.app.add_middleware(QueryStatsMiddleware, expose_headers=True)
+
+        response = client.patch(f"/recordings/{recording_id}/pause")
+
+        assert response.headers["x-db-query-count"] == "1"
+        assert float(response.headers["x-db-time-ms"]) >= 0
+        assert response.headers["x-db-repeated-queries"] == "0"
+
+
+class TestOwnership:
+    """Test cases for owner-scoped mutations."""
+
+    @pytest.fixture
+    def other_recording_id(self, session_factory):
+        """Create a recording owned by another user."""
+        db = session_factory()
+        other = MySQLUserRepository(db).create_user(google_id="other", email="other@example.com")
+        recording = MySQLRecordingRepository(db).create_recording(other.id)
+        db.close()
+        return recording.id
+
+    @pytest.mark.parametrize("method, path, body", [
+        ("PATCH", "/pause", None),
+        ("PATCH", "/notes", {"notes": "Not mine"}),
+        ("POST", "/finish", None),
+        ("GET", "/chunks", None),
+        ("DELETE", "", None),
+    ])
+    def test_other_users_recording_is_forbidden(self, client, session_factory, other_recording_id, method, path, body):
+        """Test that another user's recording is rejected with 403 and left unchanged."""
+        response = client.request(method, f"/recordings/{other_recording_id}{path}", json=body)
+
+        db = session_factory()
+        recording = MySQLRecordingRepository(db).get_recording(other_recording_id)
+        assert response.status_code == 403
+        assert recording.status.value == "active"
+        assert recording.notes is None
+        db.close()
+
+    @pytest.mark.parametrize("method, path, body", [
+        ("PATCH", "/pause", None),
+        ("PATCH", "/notes", {"notes": "Missing"}),
+        ("POST", "/finish", None),
+        ("GET", "/chunks", None),
+        ("DELETE", "", None),
+    ])
+    def test_missing_recording_is_not_found(self, client, method, path, body):
+        """Test that a missing recording is rejected with 404."""
+        response = client.request(method, f"/recordings/missing{path}", json=body)
+
+        assert response.status_code == 404
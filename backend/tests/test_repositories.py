@@ -1,10 +1,24 @@
 """Tests for repository implementations."""
+import time
+from datetime import datetime
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from app.core.database import Base
-from app.models import User, Recording, RecordingStatus
-from app.repositories import MySQLUserRepository, MySQLRecordingRepository
+from app.core.query_stats import capture_engine_queries
+from app.models import User, Recording, RecordingStatus, ChunkUpload, ChunkUploadResult, TranscriptionJobStatus
+from app.repositories import (
+    MySQLUserRepository,
+    MySQLRecordingRepository,
+    MySQLTranscriptionJobRepository,
+    AsyncMySQLUserRepository,
+    AsyncMySQLRecordingRepository,
+    AsyncMySQLTranscriptionJobRepository,
+    RecordingNotFoundError,
+    RecordingAccessDeniedError,
+)
 
 
 @pytest.fixture
@@ -18,6 +32,18 @@ def db_session():
     session.close()
 
 
+@pytest.fixture
+async def async_db_session():
+    """Create a test AsyncSession on aiosqlite."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session = async_sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    await session.close()
+    await engine.dispose()
+
+
 class TestUserRepository:
     """Test cases for UserRepository."""
 
@@ -97,7 +123,7 @@ class TestRecordingRepository:
         recording = rec_repo.create_recording(user.id)
 
         # Add chunk
-        chunk = rec_repo.add_chunk(
+        chunk, result = rec_repo.add_chunk(
             recording.id,
             chunk_index=0,
             audio_blob_path="/path/to/chunk_0.webm",
@@ -107,6 +133,121 @@ class TestRecordingRepository:
         assert chunk.id is not None
         assert chunk.recording_id == recording.id
         assert chunk.chunk_index == 0
+        assert result == ChunkUploadResult.CREATED
+
+    def test_add_chunk_is_idempotent(self, db_session):
+        """Test that a retried chunk is unchanged and new content replaces it."""
+        user = MySQLUserRepository(db_session).create_user(
+            google_id="test_idempotent",
+            email="idempotent@example.com"
+        )
+        rec_repo = MySQLRecordingRepository(db_session)
+        recording_id = rec_repo.create_recording(user.id).id
+        first, _ = rec_repo.add_chunk(recording_id, 0, "/path/0.webm", 10.0, 1000, "a" * 64)
+
+        retried, retry_result = rec_repo.add_chunk(recording_id, 0, "/path/0.webm", 10.0, 1000, "a" * 64)
+        replaced, replace_result = rec_repo.add_chunk(recording_id, 0, "/path/0.webm", 12.0, 1500, "b" * 64)
+
+        recording = rec_repo.get_recording(recording_id)
+        assert retry_result == ChunkUploadResult.UNCHANGED
+        assert replace_result == ChunkUploadResult.REPLACED
+        assert retried.id == replaced.id == first.id
+        assert replaced.content_hash == "b" * 64
+        assert len(rec_repo.get_chunks(recording_id)) == 1
+        assert recording.chunk_count == 1
+        assert recording.total_duration_seconds == 12.0
+        assert recording.total_bytes == 1500
+
+    def test_concurrent_insert_of_same_index_replaces(self, db_session, monkeypatch):
+        """Test that losing an insert race on the unique key falls back to a replacement."""
+        user = MySQLUserRepository(db_session).create_user(google_id="test_race", email="race@example.com")
+        rec_repo = MySQLRecordingRepository(db_session)
+        recording_id = rec_repo.create_recording(user.id).id
+        rec_repo.add_chunk(recording_id, 0, "/path/0.webm", 10.0, 1000, "a" * 64)
+        get_chunks_at = rec_repo._get_chunks_at
+        lookups = []
+
+        def get_chunks_at_after_race(*args):
+            # The first lookup runs before the other upload's insert commits
+            lookups.append(args)
+            return {} if len(lookups) == 1 else get_chunks_at(*args)
+
+        monkeypatch.setattr(rec_repo, "_get_chunks_at", get_chunks_at_after_race)
+
+        _, result = rec_repo.add_chunk(recording_id, 0, "/path/0.webm", 10.0, 1000, "b" * 64)
+
+        assert result == ChunkUploadResult.REPLACED
+        assert len(lookups) == 2
+        assert rec_repo.get_recording(recording_id).chunk_count == 1
+
+    def test_add_chunks_in_one_transaction(self, db_session):
+        """Test that a batch mixes new, unchanged and replaced chunks with one insert and one commit."""
+        user = MySQLUserRepository(db_session).create_user(google_id="test_batch", email="batch@example.com")
+        rec_repo = MySQLRecordingRepository(db_session)
+        recording_id = rec_repo.create_recording(user.id).id
+        rec_repo.add_chunk(recording_id, 0, "/path/0.webm", 10.0, 1000, "a" * 64)
+        rec_repo.add_chunk(recording_id, 1, "/path/1.webm", 10.0, 1000, "b" * 64)
+
+        with capture_engine_queries(db_session.get_bind()) as stats:
+            results = rec_repo.add_chunks(recording_id, [
+                ChunkUpload(0, "/path/0.webm", 10.0, 1000, "a" * 64),
+                ChunkUpload(1, "/path/1.webm", 8.0, 800, "c" * 64),
+                ChunkUpload(2, "/path/2.webm", 10.0, 1000, "d" * 64),
+                ChunkUpload(3, "/path/3.webm", 10.0, 1000, "e" * 64),
+            ])
+
+        recording = rec_repo.get_recording(recording_id)
+        assert [result for _, result in results] == [
+            ChunkUploadResult.UNCHANGED,
+            ChunkUploadResult.REPLACED,
+            ChunkUploadResult.CREATED,
+            ChunkUploadResult.CREATED,
+        ]
+        assert sum(statement.startswith("INSERT") for statement in stats.statements) == 1
+        assert recording.chunk_count == 4
+        assert recording.total_duration_seconds == 38.0
+        assert recording.total_bytes == 3800
+
+    def test_add_chunk_updates_aggregates(self, db_session):
+        """Test that each chunk bumps the recording's aggregates."""
+        user = MySQLUserRepository(db_session).create_user(
+            google_id="test_aggregates",
+            email="aggregates@example.com"
+        )
+        rec_repo = MySQLRecordingRepository(db_session)
+        recording = rec_repo.create_recording(user.id)
+
+        rec_repo.add_chunk(recording.id, 0, "/path/0.webm", duration_seconds=10.0, size_bytes=1000)
+        last, _ = rec_repo.add_chunk(recording.id, 1, "/path/1.webm", duration_seconds=5.5, size_bytes=500)
+
+        recording = rec_repo.get_recording(recording.id)
+        assert recording.chunk_count == 2
+        assert recording.total_duration_seconds == 15.5
+        assert recording.total_bytes == 1500
+        assert recording.last_chunk_at == last.uploaded_at
+
+    def test_recompute_aggregates(self, db_session):
+        """Test that aggregates are repaired from the chunks."""
+        user = MySQLUserRepository(db_session).create_user(
+            google_id="test_recompute",
+            email="recompute@example.com"
+        )
+        rec_repo = MySQLRecordingRepository(db_session)
+        recording = rec_repo.create_recording(user.id)
+        empty = rec_repo.create_recording(user.id)
+        rec_repo.add_chunk(recording.id, 0, "/path/0.webm", duration_seconds=10.0, size_bytes=1000)
+        db_session.query(Recording).update({Recording.chunk_count: 0, Recording.total_bytes: 0})
+        db_session.commit()
+        updated_at = rec_repo.get_recording(recording.id).updated_at
+
+        rec_repo.recompute_aggregates([recording.id, empty.id])
+
+        recording = rec_repo.get_recording(recording.id)
+        assert recording.chunk_count == 1
+        assert recording.total_duration_seconds == 10.0
+        assert recording.total_bytes == 1000
+        assert recording.updated_at == updated_at
+        assert rec_repo.get_recording(empty.id).last_chunk_at is None
 
     def test_mark_paused(self, db_session):
         """Test marking a recording as paused."""
@@ -125,6 +266,52 @@ class TestRecordingRepository:
 
         assert paused_recording.status == RecordingStatus.PAUSED
 
+    def test_owner_scoped_update(self, db_session):
+        """Test that owner-scoped updates tell a missing recording from another user's."""
+        user_repo = MySQLUserRepository(db_session)
+        owner = user_repo.create_user(google_id="test_owner", email="owner@example.com")
+        other = user_repo.create_user(google_id="test_other", email="other@example.com")
+        rec_repo = MySQLRecordingRepository(db_session)
+        recording = rec_repo.create_recording(owner.id)
+
+        assert rec_repo.mark_paused(recording.id, owner.id).status == RecordingStatus.PAUSED
+        with pytest.raises(RecordingAccessDeniedError):
+            rec_repo.add_notes(recording.id, "Not mine", other.id)
+        with pytest.raises(RecordingNotFoundError):
+            rec_repo.mark_paused("missing", owner.id)
+        assert rec_repo.get_recording(recording.id).notes is None
+
+    def test_owner_scoped_update_without_returning(self, db_session, monkeypatch):
+        """Test the read-back path used on databases without UPDATE ... RETURNING."""
+        monkeypatch.setattr(db_session.get_bind().dialect, "update_returning", False)
+        user_repo = MySQLUserRepository(db_session)
+        owner = user_repo.create_user(google_id="test_mysql_owner", email="mysql-owner@example.com")
+        other = user_repo.create_user(google_id="test_mysql_other", email="mysql-other@example.com")
+        rec_repo = MySQLRecordingRepository(db_session)
+        recording = rec_repo.create_recording(owner.id)
+
+        assert rec_repo.add_notes(recording.id, "Mine", owner.id).notes == "Mine"
+        with pytest.raises(RecordingAccessDeniedError):
+            rec_repo.mark_paused(recording.id, other.id)
+        assert rec_repo.get_recording(recording.id).status == RecordingStatus.ACTIVE
+
+    def test_delete_recording_is_owner_scoped(self, db_session):
+        """Test that deleting another user's recording leaves it and its chunks in place."""
+        user_repo = MySQLUserRepository(db_session)
+        owner = user_repo.create_user(google_id="test_delete_owner", email="delete-owner@example.com")
+        other = user_repo.create_user(google_id="test_delete_other", email="delete-other@example.com")
+        rec_repo = MySQLRecordingRepository(db_session)
+        recording_id = rec_repo.create_recording(owner.id).id
+        rec_repo.add_chunk(recording_id, 0, "/path/0.webm")
+
+        with pytest.raises(RecordingAccessDeniedError):
+            rec_repo.delete_recording(recording_id, other.id)
+        assert len(rec_repo.get_chunks(recording_id)) == 1
+
+        assert rec_repo.delete_recording(recording_id, owner.id) is True
+        assert rec_repo.get_recording(recording_id) is None
+        assert rec_repo.get_chunks(recording_id) == []
+
     def test_mark_ended(self, db_session):
         """Test marking a recording as ended."""
         # Setup
@@ -166,3 +353,184 @@ class TestRecordingRepository:
 
         assert len(recordings) == 2
         assert recordings[0].id in [rec1.id, rec2.id]
+
+    def test_list_recordings_keyset_pages(self, db_session):
+        """Test that keyset pages cover every recording once, ties broken by ID."""
+        user = MySQLUserRepository(db_session).create_user(
+            google_id="test_pages",
+            email="pages@example.com"
+        )
+        rec_repo = MySQLRecordingRepository(db_session)
+        created_at = datetime(2024, 1, 15, 9, 0, 0)
+        for _ in range(5):
+            recording = rec_repo.create_recording(user.id)
+            recording.created_at = created_at
+        db_session.commit()
+
+        first_page = rec_repo.list_recordings(user.id, limit=3)
+        last = first_page[-1]
+        second_page = rec_repo.list_recordings(user.id, limit=3, after=(last.created_at, last.id))
+
+        ids = [r.id for r in first_page + second_page]
+        assert len(second_page) == 2
+        assert ids == sorted(ids, reverse=True)
+        assert len(set(ids)) == 5
+
+
+    def test_list_recording_summaries(self, db_session):
+        """Test that summaries cut the transcript and count chunks."""
+        user = MySQLUserRepository(db_session).create_user(
+            google_id="test_summaries",
+            email="summaries@example.com"
+        )
+        rec_repo = MySQLRecordingRepository(db_session)
+        short = rec_repo.create_recording(user.id)
+        rec_repo.update_transcription(short.id, "Short note")
+        long = rec_repo.create_recording(user.id)
+        rec_repo.update_transcription(long.id, "x" * 50)
+        rec_repo.add_chunk(long.id, 0, "/path/0.webm")
+        rec_repo.add_chunk(long.id, 1, "/path/1.webm")
+
+        summaries = {s.id: s for s in rec_repo.list_recording_summaries(user.id, preview_length=10)}
+
+        assert summaries[short.id].transcription_preview == "Short note"
+        assert summaries[short.id].transcription_truncated is False
+        assert summaries[short.id].chunk_count == 0
+        assert summaries[long.id].transcription_preview == "x" * 10
+        assert summaries[long.id].transcription_truncated is True
+        assert summaries[long.id].chunk_count == 2
+        assert summaries[long.id].has_notes is False
+
+class TestTranscriptionJobRepository:
+    """Test cases for TranscriptionJobRepository."""
+
+    def _create_recording(self, db_session, google_id):
+        user = MySQLUserRepository(db_session).create_user(
+            google_id=google_id,
+            email=f"{google_id}@example.com"
+        )
+        return MySQLRecordingRepository(db_session).create_recording(user.id)
+
+    def test_claim_next_job(self, db_session):
+        """Test that jobs are claimed oldest first and only once."""
+        recording = self._create_recording(db_session, "test_claim")
+        job_repo = MySQLTranscriptionJobRepository(db_session)
+        job = job_repo.create_job(recording.id)
+
+        claimed = job_repo.claim_next_job()
+
+        assert claimed.id == job.id
+        assert claimed.status == TranscriptionJobStatus.RUNNING
+        assert claimed.attempts == 1
+        assert job_repo.claim_next_job() is None
+
+    def test_claim_next_job_shares_between_users(self, db_session):
+        """Test that users without running jobs go first, then smaller recordings, then older ones."""
+        rec_repo = MySQLRecordingRepository(db_session)
+        job_repo = MySQLTranscriptionJobRepository(db_session)
+        busy = self._create_recording(db_session, "test_claim_busy")
+        busy_jobs = []
+        for _ in range(3):
+            recording = rec_repo.create_recording(busy.user_id)
+            rec_repo.add_chunk(recording.id, 0, "/path/0.webm", size_bytes=1000)
+            busy_jobs.append(job_repo.create_job(recording.id))
+        long_note = self._create_recording(db_session, "test_claim_long")
+        rec_repo.add_chunk(long_note.id, 0, "/path/0.webm", size_bytes=5000)
+        long_job = job_repo.create_job(long_note.id)
+        short_note = self._create_recording(db_session, "test_claim_short")
+        rec_repo.add_chunk(short_note.id, 0, "/path/0.webm", size_bytes=100)
+        short_job = job_repo.create_job(short_note.id)
+
+        claimed = [job_repo.claim_next_job().id for _ in range(5)]
+
+        assert claimed == [short_job.id, busy_jobs[0].id, long_job.id, busy_jobs[1].id, busy_jobs[2].id]
+
+    def test_large_job_is_claimed_despite_a_stream_of_small_ones(self, db_session, monkeypatch):
+        """Test that a job waiting past TRANSCRIPTION_JOB_MAX_WAIT_SECONDS overtakes smaller, newer jobs."""
+        monkeypatch.setattr(
+            "app.repositories.transcription_job_repository.settings.TRANSCRIPTION_JOB_MAX_WAIT_SECONDS", 0.05
+        )
+        rec_repo = MySQLRecordingRepository(db_session)
+        job_repo = MySQLTranscriptionJobRepository(db_session)
+        large = self._create_recording(db_session, "test_aging_large")
+        rec_repo.add_chunk(large.id, 0, "/path/0.webm", size_bytes=10_000_000)
+        large_job = job_repo.create_job(large.id)
+        small = self._create_recording(db_session, "test_aging_small")
+
+        claimed = []
+        while large_job.id not in claimed and len(claimed) < 20:
+            recording = rec_repo.create_recording(small.user_id)
+            rec_repo.add_chunk(recording.id, 0, "/path/0.webm", size_bytes=100)
+            job_repo.create_job(recording.id)
+            job = job_repo.claim_next_job()
+            job_repo.mark_completed(job.id)
+            claimed.append(job.id)
+            time.sleep(0.02)
+
+        assert claimed[0] != large_job.id
+        assert large_job.id in claimed
+
+    def test_mark_failed_with_retry(self, db_session):
+        """Test that a retried job goes back to the queue."""
+        recording = self._create_recording(db_session, "test_retry")
+        job_repo = MySQLTranscriptionJobRepository(db_session)
+        job_repo.create_job(recording.id)
+        job = job_repo.claim_next_job()
+
+        failed = job_repo.mark_failed(job.id, "provider timeout", retry=True)
+
+        assert failed.status == TranscriptionJobStatus.QUEUED
+        assert failed.error == "provider timeout"
+        assert job_repo.get_active_job(recording.id).id == job.id
+
+
+class TestAsyncRepositories:
+    """Test cases for the async repositories."""
+
+    @pytest.mark.asyncio
+    async def test_recording_lifecycle_on_async_session(self, async_db_session):
+        """Test creating a recording, adding a chunk and ending it on an AsyncSession."""
+        user = await AsyncMySQLUserRepository(async_db_session).create_user(
+            google_id="test_async",
+            email="async@example.com"
+        )
+        repo = AsyncMySQLRecordingRepository(async_db_session)
+        recording = await repo.create_recording(user.id)
+        await repo.add_chunk(recording.id, 0, "/tmp/chunk_0.webm", 10.0)
+
+        ended = await repo.mark_ended(recording.id, transcription="Test transcription")
+
+        assert ended.status == RecordingStatus.ENDED
+        assert ended.transcription_text == "Test transcription"
+        assert [chunk.chunk_index for chunk in await repo.get_chunks(recording.id)] == [0]
+        assert [r.id for r in await repo.list_recordings(user.id)] == [recording.id]
+
+    @pytest.mark.asyncio
+    async def test_claim_next_job_on_async_session(self, async_db_session):
+        """Test that the job queue can be claimed through an AsyncSession."""
+        user = await AsyncMySQLUserRepository(async_db_session).create_user(
+            google_id="test_async_job",
+            email="async_job@example.com"
+        )
+        recording = await AsyncMySQLRecordingRepository(async_db_session).create_recording(user.id)
+        job_repo = AsyncMySQLTranscriptionJobRepository(async_db_session)
+        job = await job_repo.create_job(recording.id)
+
+        claimed = await job_repo.claim_next_job()
+
+        assert claimed.id == job.id
+        assert claimed.status == TranscriptionJobStatus.RUNNING
+        assert await job_repo.claim_next_job() is None
+
+    @pytest.mark.asyncio
+    async def test_sync_session_runs_on_thread_pool(self, session_factory):
+        """Test that the async repositories also accept a synchronous Session."""
+        db = session_factory()
+
+        user = await AsyncMySQLUserRepository(db).create_user(
+            google_id="test_threaded",
+            email="threaded@example.com"
+        )
+
+        assert (await AsyncMySQLUserRepository(db).get_user_by_google_id("test_threaded")).id == user.id
+        db.close()
@@ -0,0 +1,121 @@
+"""Tests for JWT token handling."""
+from datetime import timedelta
+import pytest
+from jose import jwt
+from app.core import security
+from app.core.cache import LocalCacheBackend
+from app.core.security import (
+    TokenCache,
+    TokenRevocations,
+    create_access_token,
+    decode_access_token,
+    revoke_access_token,
+)
+
+
+@pytest.fixture
+def token_cache(monkeypatch):
+    """Install an empty token cache."""
+    cache = TokenCache(max_size=10)
+    monkeypatch.setattr(security, "token_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def revocations(monkeypatch):
+    """Install an empty revocation store, standing in for the shared backend."""
+    backend = LocalCacheBackend(max_size=10)
+    monkeypatch.setattr(security, "token_revocations", TokenRevocations(backend))
+    return backend
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    """Count full python-jose decodes."""
+    calls = []
+    jwt_decode = security.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return jwt_decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    return calls
+
+
+class TestTokenCache:
+    """Test cases for the verified token payload cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_decode_is_verified_once(self, token_cache, decode_calls):
+        """Test that a token's signature is checked only on first use."""
+        token = create_access_token({"sub": "user-1"})
+
+        first = await decode_access_token(token)
+        second = await decode_access_token(token)
+
+        assert first == second
+        assert first["sub"] == "user-1"
+        assert len(decode_calls) == 1
+        assert token_cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_is_not_cached(self, token_cache, decode_calls):
+        """Test that tokens failing verification are checked every time."""
+        token = create_access_token({"sub": "user-1"}) + "tampered"
+
+        assert await decode_access_token(token) is None
+        assert await decode_access_token(token) is None
+        assert len(decode_calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_entry_expires_with_token(self, token_cache):
+        """Test that cached payloads are dropped at the token's exp."""
+        token = create_access_token({"sub": "user-1"}, expires_delta=timedelta(minutes=5))
+        payload = await decode_access_token(token)
+
+        token_cache.clock = lambda: payload["exp"]
+
+        assert token_cache.get(token) is None
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded(self, token_cache):
+        """Test that the least recently used payloads are evicted."""
+        tokens = [create_access_token({"sub": f"user-{i}"}) for i in range(11)]
+        for token in tokens:
+            await decode_access_token(token)
+
+        assert token_cache.get(tokens[0]) is None
+        assert token_cache.get(tokens[-1])["sub"] == "user-10"
+
+    @pytest.mark.asyncio
+    async def test_revoked_token_is_rejected(self, token_cache, decode_calls):
+        """Test that logout revocation evicts the token and rejects it."""
+        token = create_access_token({"sub": "user-1"})
+        await decode_access_token(token)
+
+        await revoke_access_token(token)
+
+        assert await decode_access_token(token) is None
+        assert len(decode_calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_forged_token_is_not_revoked(self, token_cache, revocations):
+        """Test that logging out with a token failing verification stores nothing."""
+        forged = jwt.encode({"sub": "user-1", "exp": 4102444800}, "not-the-secret", algorithm="HS256")
+
+        assert await revoke_access_token(forged) is False
+        assert len(revocations) == 0
+
+    @pytest.mark.asyncio
+    async def test_revocation_reaches_other_workers(self, token_cache, revocations):
+        """Test that a token revoked through the shared store is rejected despite a cached payload."""
+        token = create_access_token({"sub": "user-1"}, expires_delta=timedelta(minutes=5))
+        payload = await decode_access_token(token)
+
+        # Another worker revokes the token; this worker's payload cache still holds it
+        await TokenRevocations(revocations).revoke(token, payload["exp"])
+
+        assert token_cache.get(token) == payload
+        assert await decode_access_token(token) is None
+        assert 0 < revocations._entries.popitem()[1][0] - revocations.clock() <= 300
@@ -0,0 +1,59 @@
+"""Tests for the transcription cache."""
+import pytest
+from app.core.cache import LocalCacheBackend
+from app.repositories import AsyncMySQLTranscriptionCacheRepository
+from app.services.transcription_cache import TranscriptionCache
+
+
+class TestTranscriptionCache:
+    """Test cases for TranscriptionCache."""
+
+    def test_key_depends_on_provider_version_and_content(self):
+        """Test that a key changes with the provider version and with the audio."""
+        key = TranscriptionCache.key("requestyai", "1", ["a", "b"])
+
+        assert key == TranscriptionCache.key("requestyai", "1", ["a", "b"])
+        assert key != TranscriptionCache.key("requestyai", "2", ["a", "b"])
+        assert key != TranscriptionCache.key("requestyai", "1", ["b", "a"])
+        assert len(key) == 64
+
+    @pytest.mark.asyncio
+    async def test_misses_in_front_are_read_in_one_query(self, engine, session_factory, query_budget):
+        """Test that keys missing from the front are looked up together and then kept in the front."""
+        db = session_factory()
+        repo = AsyncMySQLTranscriptionCacheRepository(db)
+        cache = TranscriptionCache(LocalCacheBackend(max_size=10), ttl_seconds=60)
+        await repo.store_transcriptions("requestyai", {"key-1": "first", "key-2": "second"})
+
+        with query_budget(engine, 1):
+            assert await cache.get_many(repo, ["key-1", "key-2", "key-3"]) == ["first", "second", None]
+        with query_budget(engine, 0):
+            assert await cache.get_many(repo, ["key-2", "key-1"]) == ["second", "first"]
+        assert cache.stats()["misses"] == 1
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_storing_an_existing_key_keeps_the_first_transcript(self, session_factory):
+        """Test that caching the same audio twice neither fails nor replaces the entry."""
+        db = session_factory()
+        repo = AsyncMySQLTranscriptionCacheRepository(db)
+        cache = TranscriptionCache(None, ttl_seconds=60)
+
+        await cache.set_many(repo, "requestyai", {"key-1": "first"})
+        await cache.set_many(repo, "requestyai", {"key-1": "again", "key-2": "second"})
+
+        assert await cache.get_many(repo, ["key-1", "key-2"]) == ["first", "second"]
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_never_hits(self, session_factory):
+        """Test that a disabled cache neither stores nor returns transcripts."""
+        db = session_factory()
+        repo = AsyncMySQLTranscriptionCacheRepository(db)
+        cache = TranscriptionCache(LocalCacheBackend(max_size=10), ttl_seconds=60, enabled=False)
+
+        await cache.set_many(repo, "requestyai", {"key-1": "first"})
+
+        assert await cache.get_many(repo, ["key-1"]) == [None]
+        assert await repo.get_transcriptions(["key-1"]) == {}
+        db.close()
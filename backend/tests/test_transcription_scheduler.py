@@ -0,0 +1,119 @@
+"""Tests for the fair-share transcription scheduler."""
+import asyncio
+import pytest
+from app.services.transcription_scheduler import FairShareScheduler
+
+
+async def run_jobs(scheduler, jobs, held_by=None):
+    """
+    Queue jobs behind a call holding the only free slot, then release it.
+
+    Args:
+        scheduler: Scheduler under test
+        jobs: (user_id, cost) of each call, in the order they are queued
+        held_by: User holding the slot while the jobs are queued
+
+    Returns:
+        The (user_id, cost) of the queued calls, in the order they ran
+    """
+    order = []
+    release = asyncio.Event()
+
+    async def call(user_id, cost, gate=None):
+        async with scheduler.slot(user_id, cost):
+            order.append((user_id, cost))
+            if gate:
+                await gate.wait()
+            await asyncio.sleep(0)
+
+    holder = asyncio.create_task(call(held_by or "holder", 1, release))
+    await asyncio.sleep(0)
+    tasks = [asyncio.create_task(call(user_id, cost)) for user_id, cost in jobs]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(holder, *tasks)
+    return order[1:]
+
+
+class TestFairShareScheduler:
+    """Test cases for FairShareScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_short_note_overtakes_queued_long_recordings(self):
+        """Test that another user's small call runs before one user's backlog of large segments."""
+        scheduler = FairShareScheduler(max_concurrency=1, per_user_concurrency=1)
+
+        order = await run_jobs(
+            scheduler, [("busy", 1000), ("busy", 1000), ("busy", 1000), ("other", 100)], held_by="busy"
+        )
+
+        assert order == [("other", 100), ("busy", 1000), ("busy", 1000), ("busy", 1000)]
+
+    @pytest.mark.asyncio
+    async def test_users_own_calls_run_shortest_first(self):
+        """Test that one user's queued calls run in order of cost."""
+        scheduler = FairShareScheduler(max_concurrency=1, per_user_concurrency=1)
+
+        order = await run_jobs(scheduler, [("user", 300), ("user", 100), ("user", 200)])
+
+        assert [cost for _, cost in order] == [100, 200, 300]
+
+    @pytest.mark.asyncio
+    async def test_slots_are_shared_by_weight(self):
+        """Test that a user with twice the weight gets twice the calls while both are waiting."""
+        scheduler = FairShareScheduler(max_concurrency=1, per_user_concurrency=1, weights={"heavy": 2.0})
+
+        order = await run_jobs(scheduler, [("heavy", 100)] * 6 + [("light", 100)] * 6)
+
+        assert [user_id for user_id, _ in order[:6]].count("heavy") == 4
+
+    @pytest.mark.asyncio
+    async def test_global_and_per_user_caps(self):
+        """Test that calls in flight never exceed either cap."""
+        scheduler = FairShareScheduler(max_concurrency=3, per_user_concurrency=2)
+        in_flight = {"total": 0, "busy": 0, "peak": 0, "busy_peak": 0}
+
+        async def call(user_id):
+            async with scheduler.slot(user_id, 100):
+                in_flight["total"] += 1
+                in_flight[user_id] = in_flight.get(user_id, 0) + 1
+                in_flight["peak"] = max(in_flight["peak"], in_flight["total"])
+                in_flight["busy_peak"] = max(in_flight["busy_peak"], in_flight["busy"])
+                await asyncio.sleep(0.01)
+                in_flight["total"] -= 1
+                in_flight[user_id] -= 1
+
+        await asyncio.gather(*(call("busy") for _ in range(6)), *(call("other") for _ in range(3)))
+
+        assert in_flight["peak"] == 3
+        assert in_flight["busy_peak"] == 2
+        assert scheduler.snapshot()["dispatched"] == 9
+
+    @pytest.mark.asyncio
+    async def test_snapshot_reports_queue_and_cancelled_waits_leave_it(self):
+        """Test the queue depth and wait metrics, and that a cancelled call gives up its place."""
+        scheduler = FairShareScheduler(max_concurrency=1, per_user_concurrency=1)
+        release = asyncio.Event()
+
+        async def call(user_id):
+            async with scheduler.slot(user_id, 100):
+                await release.wait()
+
+        holder = asyncio.create_task(call("holder"))
+        waiting = [asyncio.create_task(call("busy")) for _ in range(2)] + [asyncio.create_task(call("other"))]
+        await asyncio.sleep(0.01)
+
+        snapshot = scheduler.snapshot()
+        assert (snapshot["queued"], snapshot["users_queued"], snapshot["max_user_queued"]) == (3, 2, 2)
+        assert snapshot["in_flight"] == 1
+        assert snapshot["oldest_wait_ms"] >= 10
+
+        waiting[2].cancel()
+        await asyncio.sleep(0)
+        assert scheduler.snapshot()["users_queued"] == 1
+
+        release.set()
+        await asyncio.gather(holder, *waiting[:2])
+        snapshot = scheduler.snapshot()
+        assert (snapshot["queued"], snapshot["in_flight"], snapshot["dispatched"]) == (0, 0, 3)
+        assert snapshot["wait_p95_ms"] >= 10
@@ -0,0 +1,449 @@
+"""Tests for the background transcription worker."""
+import asyncio
+import os
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.core.database import Base
+from app.llm import ProviderUnavailableError, RoutingProvider
+from app.models import Recording, RecordingStatus, TranscriptionCacheEntry, TranscriptionJobStatus
+from app.repositories import MySQLUserRepository, MySQLRecordingRepository, AsyncMySQLUserRepository
+from app.services import RecordingService
+from app.workers import TranscriptionWorker
+
+
+class FakeProvider:
+    """LLM provider stub that fails a configurable number of times."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = 0
+
+    async def transcribe_stream(self, audio) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("provider unavailable")
+        return "Patient reports mild headache"
+
+
+@pytest.fixture
+async def finished_recording(session_factory, tmp_path, monkeypatch):
+    """Create a recording with one chunk and finish it."""
+    monkeypatch.setattr("app.services.audio_service.settings.AUDIO_STORAGE_PATH", str(tmp_path))
+    db = session_factory()
+    user = MySQLUserRepository(db).create_user(google_id="worker", email="worker@example.com")
+    recording = MySQLRecordingRepository(db).create_recording(user.id)
+    chunk_path = tmp_path / "chunk_00000.webm"
+    chunk_path.write_bytes(b"fake audio data")
+    MySQLRecordingRepository(db).add_chunk(recording.id, 0, str(chunk_path), 10.0)
+
+    job = await RecordingService(db).finish_recording(recording.id)
+    ids = (recording.id, job.id)
+    db.close()
+    return ids
+
+
+class UnavailableProvider:
+    """LLM provider stub whose circuit breaker is open."""
+
+    async def transcribe_stream(self, audio) -> str:
+        raise ProviderUnavailableError("Transcription provider is unavailable, try again later")
+
+
+class EchoProvider:
+    """LLM provider stub that transcribes audio to its own bytes."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def transcribe_stream(self, audio) -> str:
+        self.calls += 1
+        return b"".join([part async for part in audio]).decode()
+
+
+class SegmentEchoProvider(EchoProvider):
+    """Echo provider recording what it transcribed."""
+
+    def __init__(self):
+        super().__init__()
+        self.transcribed = []
+
+    async def transcribe_stream(self, audio) -> str:
+        text = await super().transcribe_stream(audio)
+        self.transcribed.append(text)
+        return text
+
+
+class SegmentedProvider(EchoProvider):
+    """Echo provider failing segments that contain a marker once."""
+
+    def __init__(self, fail_marker):
+        super().__init__()
+        self.fail_marker = fail_marker
+        self.transcribed = []
+
+    async def transcribe_stream(self, audio) -> str:
+        text = await super().transcribe_stream(audio)
+        self.transcribed.append(text)
+        if self.fail_marker and self.fail_marker in text:
+            self.fail_marker = None
+            raise RuntimeError("provider unavailable")
+        return text
+
+
+async def _stream(data):
+    yield data
+
+
+def _install_provider(monkeypatch, provider):
+    monkeypatch.setattr("app.services.recording_service.get_llm_provider", lambda: provider)
+
+
+class TestTranscriptionWorker:
+    """Test cases for TranscriptionWorker."""
+
+    @pytest.mark.asyncio
+    async def test_run_once_completes_job(self, session_factory, finished_recording, monkeypatch):
+        """Test that a queued job is transcribed and the recording ended."""
+        recording_id, job_id = finished_recording
+        _install_provider(monkeypatch, FakeProvider())
+        worker = TranscriptionWorker(session_factory=session_factory)
+
+        assert await worker.run_once() is True
+        assert await worker.run_once() is False
+
+        db = session_factory()
+        service = RecordingService(db)
+        recording = await service.get_recording(recording_id)
+        assert recording.status == RecordingStatus.ENDED
+        assert recording.transcription_text == "Patient reports mild headache"
+        assert (await service.get_transcription_job(job_id)).status == TranscriptionJobStatus.COMPLETED
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_run_once_fails_after_max_attempts(self, session_factory, finished_recording, monkeypatch):
+        """Test that a job is retried and then marks the recording as failed."""
+        recording_id, job_id = finished_recording
+        _install_provider(monkeypatch, FakeProvider(failures=2))
+        worker = TranscriptionWorker(session_factory=session_factory, max_attempts=2)
+
+        assert await worker.run_once() is True
+        assert await worker.run_once() is True
+        assert await worker.run_once() is False
+
+        db = session_factory()
+        service = RecordingService(db)
+        job = await service.get_transcription_job(job_id)
+        assert job.status == TranscriptionJobStatus.FAILED
+        assert job.attempts == 2
+        assert job.error == "provider unavailable"
+        assert (await service.get_recording(recording_id)).status == RecordingStatus.FAILED
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_job_for_deleted_recording_fails_without_retry(
+        self, session_factory, finished_recording, monkeypatch
+    ):
+        """Test that a job whose recording disappeared while queued is failed cleanly."""
+        recording_id, job_id = finished_recording
+        provider = FakeProvider()
+        _install_provider(monkeypatch, provider)
+        db = session_factory()
+        db.query(Recording).filter(Recording.id == recording_id).delete()
+        db.commit()
+        db.close()
+        worker = TranscriptionWorker(session_factory=session_factory)
+
+        assert await worker.run_once() is True
+        assert await worker.run_once() is False
+
+        db = session_factory()
+        job = await RecordingService(db).get_transcription_job(job_id)
+        assert job.status == TranscriptionJobStatus.FAILED
+        assert job.error == f"Recording {recording_id} not found"
+        assert provider.calls == 0
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_requeues_job_without_spending_attempts(
+        self, session_factory, finished_recording, monkeypatch
+    ):
+        """Test that a job shed by the circuit breaker goes back to the queue with its attempts intact."""
+        recording_id, job_id = finished_recording
+        _install_provider(monkeypatch, UnavailableProvider())
+        worker = TranscriptionWorker(session_factory=session_factory, max_attempts=1)
+
+        assert await worker.run_once() is False
+        assert await worker.run_once() is False
+
+        db = session_factory()
+        service = RecordingService(db)
+        job = await service.get_transcription_job(job_id)
+        assert job.status == TranscriptionJobStatus.QUEUED
+        assert job.attempts == 0
+        assert (await service.get_recording(recording_id)).status == RecordingStatus.TRANSCRIBING
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_incremental_transcription_stitches_windows(
+        self, session_factory, tmp_path, monkeypatch
+    ):
+        """Test that chunk windows are transcribed early and stitched at finish."""
+        monkeypatch.setattr("app.services.audio_service.settings.AUDIO_STORAGE_PATH", str(tmp_path))
+        monkeypatch.setattr("app.services.recording_service.settings.INCREMENTAL_TRANSCRIPTION", True)
+        monkeypatch.setattr("app.services.recording_service.settings.INCREMENTAL_TRANSCRIPTION_WINDOW", 2)
+        provider = EchoProvider()
+        _install_provider(monkeypatch, provider)
+        worker = TranscriptionWorker(session_factory=session_factory)
+
+        db = session_factory()
+        user = MySQLUserRepository(db).create_user(google_id="incr", email="incr@example.com")
+        service = RecordingService(db)
+        recording = await service.create_recording(user.id)
+        recording_id = recording.id
+        for index, word in enumerate([b"alpha ", b"beta", b"gamma"]):
+            await service.upload_chunk(recording_id, index, _stream(word), 10.0)
+
+        # The first window [0, 1] is transcribed while recording is in progress
+        assert await worker.run_once() is True
+        assert await worker.run_once() is False
+        assert provider.calls == 1
+
+        await service.finish_recording(recording_id)
+        assert await worker.run_once() is True
+
+        db.expire_all()
+        recording = await service.get_recording(recording_id)
+        assert recording.status == RecordingStatus.ENDED
+        assert recording.transcription_text == "alpha beta gamma"
+        assert provider.calls == 2
+        assert os.listdir(tmp_path / recording_id) == ["chunks"]
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_window_with_a_gap_waits_for_its_late_chunk(self, session_factory, tmp_path, monkeypatch):
+        """Test that a window is only transcribed once all of its chunks are stored, in order."""
+        monkeypatch.setattr("app.services.audio_service.settings.AUDIO_STORAGE_PATH", str(tmp_path))
+        monkeypatch.setattr("app.services.recording_service.settings.INCREMENTAL_TRANSCRIPTION", True)
+        monkeypatch.setattr("app.services.recording_service.settings.INCREMENTAL_TRANSCRIPTION_WINDOW", 4)
+        provider = SegmentEchoProvider()
+        _install_provider(monkeypatch, provider)
+        worker = TranscriptionWorker(session_factory=session_factory)
+
+        db = session_factory()
+        user = MySQLUserRepository(db).create_user(google_id="gap", email="gap@example.com")
+        service = RecordingService(db)
+        recording_id = (await service.create_recording(user.id)).id
+        for index in (0, 1, 3):
+            await service.upload_chunk(recording_id, index, _stream(f"w{index} ".encode()), 10.0)
+        assert await worker.run_once() is False
+
+        await service.upload_chunk(recording_id, 2, _stream(b"w2 "), 10.0)
+        assert await worker.run_once() is True
+        await service.finish_recording(recording_id)
+        assert await worker.run_once() is True
+
+        db.expire_all()
+        recording = await service.get_recording(recording_id)
+        assert recording.transcription_text == "w0 w1 w2 w3"
+        assert provider.transcribed == ["w0 w1 w2 w3 "]
+        db.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("replaced_index, expected", [(0, "XXX BBB"), (1, "AAA YYY")])
+    async def test_replacing_chunk_retranscribes_its_window(
+        self, session_factory, tmp_path, monkeypatch, replaced_index, expected
+    ):
+        """Test that re-uploading any chunk of a transcribed window drops the whole window's transcript."""
+        monkeypatch.setattr("app.services.audio_service.settings.AUDIO_STORAGE_PATH", str(tmp_path))
+        monkeypatch.setattr("app.services.recording_service.settings.INCREMENTAL_TRANSCRIPTION", True)
+        monkeypatch.setattr("app.services.recording_service.settings.INCREMENTAL_TRANSCRIPTION_WINDOW", 2)
+        _install_provider(monkeypatch, EchoProvider())
+        worker = TranscriptionWorker(session_factory=session_factory)
+
+        db = session_factory()
+        user = MySQLUserRepository(db).create_user(google_id="replace", email="replace@example.com")
+        service = RecordingService(db)
+        recording_id = (await service.create_recording(user.id)).id
+        await service.upload_chunk(recording_id, 0, _stream(b"AAA "), 10.0)
+        await service.upload_chunk(recording_id, 1, _stream(b"BBB"), 10.0)
+        assert await worker.run_once() is True
+
+        replacement = [b"XXX ", b"YYY"][replaced_index]
+        await service.upload_chunk(recording_id, replaced_index, _stream(replacement), 10.0)
+        await service.finish_recording(recording_id)
+        while await worker.run_once():
+            pass
+
+        db.expire_all()
+        recording = await service.get_recording(recording_id)
+        assert recording.status == RecordingStatus.ENDED
+        assert recording.transcription_text == expected
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_long_recording_retries_only_failed_segments(self, session_factory, tmp_path, monkeypatch):
+        """Test that a long recording is split into segments and a retry skips the finished ones."""
+        monkeypatch.setattr("app.services.audio_service.settings.AUDIO_STORAGE_PATH", str(tmp_path))
+        monkeypatch.setattr("app.services.recording_service.settings.TRANSCRIPTION_SEGMENT_SECONDS", 20.0)
+        provider = SegmentedProvider(fail_marker="gamma")
+        _install_provider(monkeypatch, provider)
+        worker = TranscriptionWorker(session_factory=session_factory, max_attempts=2)
+
+        db = session_factory()
+        user = MySQLUserRepository(db).create_user(google_id="segments", email="segments@example.com")
+        service = RecordingService(db)
+        recording_id = (await service.create_recording(user.id)).id
+        for index, word in enumerate([b"alpha ", b"beta ", b"gamma ", b"delta ", b"epsilon"]):
+            await service.upload_chunk(recording_id, index, _stream(word), 10.0)
+        await service.finish_recording(recording_id)
+
+        assert await worker.run_once() is True
+        assert await worker.run_once() is True
+
+        db.expire_all()
+        recording = await service.get_recording(recording_id)
+        assert recording.status == RecordingStatus.ENDED
+        assert recording.transcription_text == "alpha beta gamma delta epsilon"
+        assert sorted(provider.transcribed) == ["alpha beta ", "epsilon", "gamma delta ", "gamma delta "]
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_identical_segments_are_served_from_cache(
+        self, session_factory, tmp_path, monkeypatch, transcription_cache_front
+    ):
+        """Test that audio already transcribed, in any recording, is not sent to the provider again."""
+        monkeypatch.setattr("app.services.audio_service.settings.AUDIO_STORAGE_PATH", str(tmp_path))
+        monkeypatch.setattr("app.services.recording_service.settings.TRANSCRIPTION_SEGMENT_SECONDS", 20.0)
+        provider = SegmentEchoProvider()
+        _install_provider(monkeypatch, provider)
+        worker = TranscriptionWorker(session_factory=session_factory)
+
+        db = session_factory()
+        user = MySQLUserRepository(db).create_user(google_id="cache", email="cache@example.com")
+        service = RecordingService(db)
+
+        async def record(words):
+            recording_id = (await service.create_recording(user.id)).id
+            for index, word in enumerate(words):
+                await service.upload_chunk(recording_id, index, _stream(word), 10.0)
+            await service.finish_recording(recording_id)
+            assert await worker.run_once() is True
+            db.expire_all()
+            return (await service.get_recording(recording_id)).transcription_text
+
+        assert await record([b"alpha ", b"beta ", b"gamma ", b"delta"]) == "alpha beta gamma delta"
+        assert sorted(provider.transcribed) == ["alpha beta ", "gamma delta"]
+
+        # Only the segment whose audio differs is transcribed
+        assert await record([b"alpha ", b"beta ", b"gamma ", b"omega"]) == "alpha beta gamma omega"
+        assert provider.transcribed[2:] == ["gamma omega"]
+
+        # Entries outlive the in-memory front in the database
+        transcription_cache_front._entries.clear()
+        assert await record([b"alpha ", b"beta ", b"gamma ", b"delta"]) == "alpha beta gamma delta"
+        assert len(provider.transcribed) == 3
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_deleting_a_recording_purges_its_cached_transcripts(
+        self, session_factory, tmp_path, monkeypatch, transcription_cache_front
+    ):
+        """Test that the transcripts cached from a recording's audio are deleted with it, and only those."""
+        monkeypatch.setattr("app.services.audio_service.settings.AUDIO_STORAGE_PATH", str(tmp_path))
+        provider = EchoProvider()
+        _install_provider(monkeypatch, provider)
+        worker = TranscriptionWorker(session_factory=session_factory)
+
+        db = session_factory()
+        user = MySQLUserRepository(db).create_user(google_id="purge", email="purge@example.com")
+        service = RecordingService(db)
+        recording_ids = []
+        for word in [b"private", b"kept"]:
+            recording_id = (await service.create_recording(user.id)).id
+            await service.upload_chunk(recording_id, 0, _stream(word), 10.0)
+            await service.finish_recording(recording_id)
+            assert await worker.run_once() is True
+            recording_ids.append(recording_id)
+        assert len(transcription_cache_front) == 2
+
+        assert await service.delete_recording(recording_ids[0], user.id) is True
+
+        entries = db.query(TranscriptionCacheEntry).all()
+        assert [(entry.recording_id, entry.transcription_text) for entry in entries] == [(recording_ids[1], "kept")]
+        assert len(transcription_cache_front) == 1
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_cache_is_pruned_while_the_pool_runs(self, session_factory):
+        """Test that expired cached transcripts are deleted periodically, not only when the pool starts."""
+        worker = TranscriptionWorker(
+            concurrency=1, poll_interval=0.01, prune_interval=0.01, session_factory=session_factory
+        )
+        await worker.start()
+
+        db = session_factory()
+        db.add(TranscriptionCacheEntry(
+            cache_key="expired", llm_provider="requestyai", transcription_text="old",
+            created_at=datetime.utcnow() - timedelta(days=settings.TRANSCRIPTION_CACHE_RETENTION_DAYS + 1)
+        ))
+        db.commit()
+        await asyncio.sleep(0.1)
+        await worker.stop()
+
+        assert db.query(TranscriptionCacheEntry).count() == 0
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_routed_transcripts_are_cached_under_the_answering_provider(
+        self, session_factory, tmp_path, monkeypatch
+    ):
+        """Test that a transcript from a failover provider is credited to it and reused by the router."""
+        monkeypatch.setattr("app.services.audio_service.settings.AUDIO_STORAGE_PATH", str(tmp_path))
+        backup = EchoProvider()
+        _install_provider(monkeypatch, RoutingProvider({"primary": FakeProvider(failures=100), "backup": backup}))
+        worker = TranscriptionWorker(session_factory=session_factory)
+
+        db = session_factory()
+        user = MySQLUserRepository(db).create_user(google_id="routed", email="routed@example.com")
+        service = RecordingService(db)
+        for _ in range(2):
+            recording_id = (await service.create_recording(user.id)).id
+            await service.upload_chunk(recording_id, 0, _stream(b"routed audio"), 10.0)
+            await service.finish_recording(recording_id)
+            assert await worker.run_once() is True
+
+        entries = db.query(TranscriptionCacheEntry).all()
+        assert [(entry.llm_provider, entry.transcription_text) for entry in entries] == [("backup", "routed audio")]
+        assert backup.calls == 1
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_run_once_on_async_session(self, tmp_path, monkeypatch):
+        """Test that the worker drains the queue through AsyncSessions."""
+        monkeypatch.setattr("app.services.audio_service.settings.AUDIO_STORAGE_PATH", str(tmp_path))
+        _install_provider(monkeypatch, FakeProvider())
+        engine = create_engine(f"sqlite:///{tmp_path}/worker.db")
+        Base.metadata.create_all(engine)
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/worker.db")
+        async_session_factory = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+        db = async_session_factory()
+        service = RecordingService(db)
+        user = await AsyncMySQLUserRepository(db).create_user(google_id="async", email="async@example.com")
+        recording = await service.create_recording(user.id)
+        await service.upload_chunk(recording.id, 0, _stream(b"fake audio data"), 10.0)
+        job = await service.finish_recording(recording.id)
+        await db.close()
+
+        worker = TranscriptionWorker(session_factory=async_session_factory)
+        assert await worker.run_once() is True
+
+        db = async_session_factory()
+        service = RecordingService(db)
+        assert (await service.get_transcription_job(job.id)).status == TranscriptionJobStatus.COMPLETED
+        assert (await service.get_recording(recording.id)).transcription_text == "Patient reports mild headache"
+        await db.close()
+        await async_engine.dispose()
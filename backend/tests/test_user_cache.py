@@ -0,0 +1,108 @@
+"""Tests for the authenticated user cache."""
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from app.core import create_access_token
+from app.core.cache import LocalCacheBackend
+from app.repositories import MySQLUserRepository
+from app.routers.dependencies import get_current_user
+from app.services import UserCache
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def db_session(session_factory):
+    """Create a test database session."""
+    session = session_factory()
+    yield session
+    session.close()
+
+
+class TestLocalCacheBackend:
+    """Test cases for LocalCacheBackend."""
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self):
+        """Test that the oldest unused entry is evicted when full."""
+        backend = LocalCacheBackend(max_size=2)
+        await backend.set("a", "1", 60)
+        await backend.set("b", "2", 60)
+        await backend.get("a")
+
+        await backend.set("c", "3", 60)
+
+        assert await backend.get("a") == "1"
+        assert await backend.get("b") is None
+        assert len(backend) == 2
+
+    @pytest.mark.asyncio
+    async def test_entries_expire(self):
+        """Test that entries are dropped after their TTL."""
+        clock = FakeClock()
+        backend = LocalCacheBackend(max_size=10, clock=clock)
+        await backend.set("a", "1", 30)
+
+        clock.now = 29
+        assert await backend.get("a") == "1"
+        clock.now = 30
+        assert await backend.get("a") is None
+
+
+class TestUserCache:
+    """Test cases for UserCache."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_counts_hits_and_misses(self, db_session):
+        """Test that a cached user comes back with the same columns."""
+        user = MySQLUserRepository(db_session).create_user(
+            google_id="cached",
+            email="cached@example.com",
+            display_name="Cached User"
+        )
+        cache = UserCache(LocalCacheBackend(max_size=10), ttl_seconds=60)
+
+        assert await cache.get(user.id) is None
+        await cache.set(user)
+        cached = await cache.get(user.id)
+
+        assert cached.id == user.id
+        assert cached.email == "cached@example.com"
+        assert cached.created_at == user.created_at
+        assert cache.stats() == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self, db_session):
+        """Test that an invalidated user is loaded again."""
+        user = MySQLUserRepository(db_session).create_user(google_id="stale", email="stale@example.com")
+        cache = UserCache(LocalCacheBackend(max_size=10), ttl_seconds=60)
+        await cache.set(user)
+
+        await cache.invalidate(user.id)
+
+        assert await cache.get(user.id) is None
+
+    @pytest.mark.asyncio
+    async def test_get_current_user_queries_once(self, engine, db_session, monkeypatch, query_budget):
+        """Test that repeated authentication is served from the cache."""
+        user = MySQLUserRepository(db_session).create_user(google_id="auth", email="auth@example.com")
+        cache = UserCache(LocalCacheBackend(max_size=10), ttl_seconds=60)
+        monkeypatch.setattr("app.routers.dependencies.user_cache", cache)
+        credentials = HTTPAuthorizationCredentials(
+            scheme="Bearer",
+            credentials=create_access_token({"sub": user.id})
+        )
+
+        with query_budget(engine, 1):
+            first = await get_current_user(credentials, db_session)
+            second = await get_current_user(credentials, db_session)
+
+        assert first.id == second.id == user.id
+        assert cache.hits == 1
@@ -34,13 +34,13 @@ const RecordingPanel = ({
 }) => {
   const [isRecording, setIsRecording] = useState(false);
   const [isPaused, setIsPaused] = useState(false);
-  const [chunkIndex, setChunkIndex] = useState(0);
   const [notesModalVisible, setNotesModalVisible] = useState(false);
   const [notes, setNotes] = useState('');
   const [finishing, setFinishing] = useState(false);
 
   const mediaRecorderRef = useRef(null);
-  const audioChunksRef = useRef([]);
+  const audioChunksRef = useRef(new Map());
+  const nextChunkIndexRef = useRef(0);
   const streamRef = useRef(null);
 
   useEffect(() => {
@@ -66,26 +66,24 @@ const RecordingPanel = ({
       });
       mediaRecorderRef.current = mediaRecorder;
 
-      audioChunksRef.current = [];
+      audioChunksRef.current = new Map();
+      nextChunkIndexRef.current = 0;
 
       // Send chunks every 10 seconds
       mediaRecorder.ondataavailable = async (event) => {
         if (event.data.size > 0) {
-          audioChunksRef.current.push(event.data);
+          const index = nextChunkIndexRef.current;
+          nextChunkIndexRef.current += 1;
+          const blob = new Blob([event.data], { type: 'audio/webm' });
+          // Kept until finish so chunks lost to a network failure can be re-sent
+          audioChunksRef.current.set(index, blob);
 
           // Upload chunk
           try {
-            const blob = new Blob([event.data], { type: 'audio/webm' });
-            await recordingApi.uploadChunk(
-              recording.id,
-              chunkIndex,
-              blob,
-              null
-            );
-            setChunkIndex((prev) => prev + 1);
+            await recordingApi.uploadChunk(recording.id, index, blob, null);
           } catch (error) {
             console.error('Failed to upload chunk:', error);
-            message.error('Failed to upload audio chunk');
+            message.warning('Audio chunk upload failed, it will be retried');
           }
         }
       };
@@ -139,14 +137,36 @@ const RecordingPanel = ({
     }
   };
 
+  /**
+   * Re-send the chunks the server has not stored, continuing interrupted
+   * uploads from the bytes it already received
+   */
+  const resendMissingChunks = async () => {
+    const manifest = await recordingApi.getChunkManifest(recording.id);
+    const stored = new Set(manifest.chunks.map((chunk) => chunk.chunk_index));
+    const received = new Map(
+      manifest.partial_chunks.map((chunk) => [chunk.chunk_index, chunk.received_bytes])
+    );
+
+    for (const [index, blob] of audioChunksRef.current) {
+      if (stored.has(index)) {
+        continue;
+      }
+      const offset = received.get(index) || 0;
+      await recordingApi.uploadChunk(recording.id, index, blob.slice(offset), null, offset);
+    }
+  };
+
   const finishRecording = async () => {
     stopRecording();
     setFinishing(true);
 
     try {
+      await resendMissingChunks();
       await recordingApi.finishRecording(recording.id);
       message.success('Recording finished and transcription started');
-      setChunkIndex(0);
+      audioChunksRef.current = new Map();
+      nextChunkIndexRef.current = 0;
       onRecordingFinished();
     } catch (error) {
       console.error('Failed to finish recording:', error);
@@ -205,7 +225,8 @@ const RecordingPanel = ({
     );
   }
 
-  const showControls = isActive && recording.status !== 'ended';
+  const showControls =
+    isActive && !['transcribing', 'ended', 'failed'].includes(recording.status);
 
   return (
     <div className="recording-panel">
@@ -267,7 +288,7 @@ const RecordingPanel = ({
             >
               Notes
             </Button>
-            {recording.status === 'ended' && (
+            {['ended', 'failed'].includes(recording.status) && (
               <Button
                 danger
                 icon={<DeleteOutlined />}
@@ -285,8 +306,12 @@ const RecordingPanel = ({
           </Paragraph>
         ) : (
           <Text type="secondary">
-            {recording.status === 'ended'
+            {recording.status === 'transcribing'
               ? 'Transcription in progress...'
+              : recording.status === 'failed'
+              ? 'Transcription failed'
+              : recording.status === 'ended'
+              ? 'No transcription available'
               : 'Transcription will appear after recording ends'}
           </Text>
         )}
@@ -14,6 +14,9 @@ const RecordingsList = ({
   onSelect,
   onNewRecording,
   loading,
+  hasMore,
+  loadingMore,
+  onLoadMore,
 }) => {
   const getStatusColor = (status) => {
     switch (status) {
@@ -21,8 +24,12 @@ const RecordingsList = ({
         return 'processing';
       case 'paused':
         return 'warning';
+      case 'transcribing':
+        return 'processing';
       case 'ended':
         return 'success';
+      case 'failed':
+        return 'error';
       default:
         return 'default';
     }
@@ -60,6 +67,15 @@ const RecordingsList = ({
         <List
           className="recordings-list-items"
           dataSource={recordings}
+          loadMore={
+            hasMore ? (
+              <div className="recordings-load-more">
+                <Button onClick={onLoadMore} loading={loadingMore}>
+                  Load more
+                </Button>
+              </div>
+            ) : null
+          }
           renderItem={(recording) => (
             <List.Item
               className={`recording-item ${
@@ -80,8 +96,8 @@ const RecordingsList = ({
                   </div>
                 }
                 description={
-                  recording.transcription_text
-                    ? recording.transcription_text.substring(0, 60) + '...'
+                  recording.transcription_preview
+                    ? recording.transcription_preview.substring(0, 60) + '...'
                     : 'No transcription yet'
                 }
               />
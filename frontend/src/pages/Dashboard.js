@@ -18,16 +18,49 @@ const Dashboard = () => {
   const [selectedRecording, setSelectedRecording] = useState(null);
   const [activeRecording, setActiveRecording] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     loadRecordings();
   }, []);
 
+  // Status changes and transcripts are pushed by the server instead of polled
+  useEffect(() => {
+    return recordingApi.subscribeToEvents(handleRecordingEvent);
+  }, []);
+
+  const handleRecordingEvent = (type, data) => {
+    if (type === 'deleted') {
+      setRecordings((prev) => prev.filter((item) => item.id !== data.recording_id));
+      return;
+    }
+    if (type !== 'status' && type !== 'transcript') {
+      return;
+    }
+
+    const changes = { status: data.status, updated_at: data.updated_at };
+    const listChanges = { ...changes };
+    const detailChanges = { ...changes };
+    if (type === 'transcript') {
+      listChanges.transcription_preview = data.transcription_text;
+      detailChanges.transcription_text = data.transcription_text;
+    }
+
+    setRecordings((prev) =>
+      prev.map((item) => (item.id === data.recording_id ? { ...item, ...listChanges } : item))
+    );
+    setSelectedRecording((prev) =>
+      prev && prev.id === data.recording_id ? { ...prev, ...detailChanges } : prev
+    );
+  };
+
   const loadRecordings = async () => {
     try {
       setLoading(true);
       const data = await recordingApi.listRecordings();
-      setRecordings(data);
+      setRecordings(data.recordings);
+      setNextCursor(data.next_cursor);
     } catch (error) {
       message.error('Failed to load recordings');
       console.error('Load recordings error:', error);
@@ -36,6 +69,20 @@ const Dashboard = () => {
     }
   };
 
+  const loadMoreRecordings = async () => {
+    try {
+      setLoadingMore(true);
+      const data = await recordingApi.listRecordings(nextCursor);
+      setRecordings([...recordings, ...data.recordings]);
+      setNextCursor(data.next_cursor);
+    } catch (error) {
+      message.error('Failed to load recordings');
+      console.error('Load more recordings error:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleLogout = async () => {
     try {
       await logout();
@@ -45,11 +92,18 @@ const Dashboard = () => {
     }
   };
 
-  const handleSelectRecording = (recording) => {
-    if (!activeRecording) {
-      setSelectedRecording(recording);
-    } else {
+  const handleSelectRecording = async (recording) => {
+    if (activeRecording) {
       message.warning('Please finish or pause the current recording first');
+      return;
+    }
+
+    // List items are summaries; load the full transcript and notes
+    try {
+      setSelectedRecording(await recordingApi.getRecording(recording.id));
+    } catch (error) {
+      message.error('Failed to load recording');
+      console.error('Load recording error:', error);
     }
   };
 
@@ -92,6 +146,9 @@ const Dashboard = () => {
             onSelect={handleSelectRecording}
             onNewRecording={handleNewRecording}
             loading={loading}
+            hasMore={!!nextCursor}
+            loadingMore={loadingMore}
+            onLoadMore={loadMoreRecordings}
           />
         </Sider>
         <Content className="recording-content">
@@ -75,11 +75,12 @@ export const recordingApi = {
   },
 
   /**
-   * List all recordings for the current user
+   * List a page of recordings for the current user, newest first
    */
-  listRecordings: async () => {
-    const response = await api.get('/recordings/');
-    return response.data.recordings;
+  listRecordings: async (cursor = null) => {
+    const params = cursor ? { cursor } : {};
+    const response = await api.get('/recordings/', { params });
+    return response.data;
   },
 
   /**
@@ -91,28 +92,34 @@ export const recordingApi = {
   },
 
   /**
-   * Upload an audio chunk
+   * Upload an audio chunk as a raw request body, or the rest of an
+   * interrupted upload when uploadOffset is given
    */
-  uploadChunk: async (recordingId, chunkIndex, audioBlob, durationSeconds) => {
-    const formData = new FormData();
-    formData.append('chunk_index', chunkIndex);
-    formData.append('audio_chunk', audioBlob, `chunk_${chunkIndex}.webm`);
+  uploadChunk: async (recordingId, chunkIndex, audioBlob, durationSeconds, uploadOffset = 0) => {
+    const headers = { 'Content-Type': 'application/octet-stream' };
     if (durationSeconds !== null) {
-      formData.append('duration_seconds', durationSeconds);
+      headers['X-Chunk-Duration'] = durationSeconds;
+    }
+    if (uploadOffset > 0) {
+      headers['Upload-Offset'] = uploadOffset;
     }
 
-    const response = await api.post(
-      `/recordings/${recordingId}/chunks`,
-      formData,
-      {
-        headers: {
-          'Content-Type': 'multipart/form-data',
-        },
-      }
+    const response = await api.put(
+      `/recordings/${recordingId}/chunks/${chunkIndex}`,
+      audioBlob,
+      { headers }
     );
     return response.data;
   },
 
+  /**
+   * Get the chunks the server holds for a recording
+   */
+  getChunkManifest: async (recordingId) => {
+    const response = await api.get(`/recordings/${recordingId}/chunks`);
+    return response.data;
+  },
+
   /**
    * Pause a recording
    */
@@ -143,6 +150,20 @@ export const recordingApi = {
   deleteRecording: async (recordingId) => {
     await api.delete(`/recordings/${recordingId}`);
   },
+
+  /**
+   * Subscribe to the user's recording events (status changes and
+   * transcripts); returns a function that closes the stream
+   */
+  subscribeToEvents: (onEvent) => {
+    // EventSource cannot send headers, so the token goes in the query string
+    const token = encodeURIComponent(localStorage.getItem('auth_token') || '');
+    const source = new EventSource(`${API_BASE_URL}/recordings/events?token=${token}`);
+    ['status', 'partial_transcript', 'transcript', 'deleted'].forEach((type) => {
+      source.addEventListener(type, (event) => onEvent(type, JSON.parse(event.data)));
+    });
+    return () => source.close();
+  },
 };
 
 export default api;